@@ -5,10 +5,17 @@ from django.contrib.auth import get_user_model
 from django.shortcuts import render, redirect
 from django.urls import path, reverse
 from django.contrib.auth.admin import UserAdmin as DefaultUserAdmin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
 
-from .models import Reunion, Intervencion, Comentario, GrupoTrabajo, Etiqueta, Documento, IntervencionDocumento, Proyecto, Frente, GraphMailConfig
+from .models import (
+    ArchivoCompartido, Reunion, Intervencion, Comentario, GrupoTrabajo, Etiqueta, Documento, IntervencionDocumento,
+    Proyecto, Frente, GraphMailConfig,
+)
 
 from .forms import UploadCSVForm
+from .paginacion import ConteoEstimadoPaginator
 User = get_user_model()
 
 # Desregistramos el UserAdmin original
@@ -18,28 +25,137 @@ admin.site.unregister(User)
 @admin.register(GrupoTrabajo)
 class GrupoTrabajoAdmin(admin.ModelAdmin):
     list_display = ('nombre',)
+    search_fields = ('nombre',)
     filter_horizontal = ('usuarios',)
 
+class ActividadAutocompleteSelect(AutocompleteSelect):
+    """Select2 del admin para Reunion.parent contra ReunionAdmin.autocompletar_actividades."""
+
+    def get_url(self):
+        return reverse("admin:mi_aplicacion_reunion_actividades", current_app=self.admin_site.name)
+
+
 @admin.register(Reunion)
 class ReunionAdmin(admin.ModelAdmin):
     list_display = ('titulo', 'proyecto', 'frente', 'estado')
+    list_select_related = ('proyecto', 'frente')
     search_fields = ('titulo',)
     list_filter = ('estado', 'frente__tipo')
+    autocomplete_fields = ('parent', 'responsables', 'grupo_trabajo')
+    date_hierarchy = 'fecha'  # índice reunion_fecha_idx
+    ordering = ('-fecha', '-id')
+    # Sin COUNT(*) de la tabla completa en cada página del listado
+    show_full_result_count = False
+    paginator = ConteoEstimadoPaginator
+
+    def get_queryset(self, request):
+        # __str__ incluye el proyecto, también en los autocompletados
+        # (el changelist ignora list_select_related si ya hay select_related)
+        return super().get_queryset(request).select_related(*self.list_select_related)
+
+    # Resultados por página del autocompletado de actividades
+    ACTIVIDADES_POR_PAGINA = 20
+
+    class Media:
+        js = ('js/admin_reunion_parent.js',)
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         if db_field.name == "parent":
-            qs = Reunion.objects.filter(frente__tipo='actividad')
-            proyecto_id = request.GET.get('proyecto')
-            if proyecto_id:
-                qs = qs.filter(proyecto_id=proyecto_id)
-            kwargs["queryset"] = qs
+            # El queryset solo valida el valor enviado; las opciones se buscan
+            # con autocompletar_actividades, acotadas al proyecto del formulario
+            kwargs["queryset"] = Reunion.objects.filter(frente__tipo='actividad').select_related('proyecto')
+            kwargs["widget"] = ActividadAutocompleteSelect(db_field, self.admin_site)
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
-admin.site.register(Intervencion)
-admin.site.register(Comentario)
+    def get_urls(self):
+        urls = [
+            path(
+                "actividades/",
+                self.admin_site.admin_view(self.autocompletar_actividades),
+                name="mi_aplicacion_reunion_actividades",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def autocompletar_actividades(self, request):
+        """
+        Posibles padres en formato select2: ?term=texto&page=N&proyecto=ID.
+        Una sola consulta de pares id/etiqueta (se pide una fila de más para
+        saber si hay otra página, sin COUNT).
+        """
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+        actividades = Reunion.objects.filter(frente__tipo='actividad')
+        try:
+            actividades = actividades.filter(proyecto_id=int(request.GET["proyecto"]))
+        except (KeyError, ValueError):
+            pass
+        termino = request.GET.get("term", "").strip()
+        if termino:
+            actividades = actividades.filter(titulo__icontains=termino)
+        try:
+            pagina = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            pagina = 1
+
+        inicio = (pagina - 1) * self.ACTIVIDADES_POR_PAGINA
+        filas = list(
+            actividades.order_by("titulo", "pk")
+            .values_list("pk", "titulo", "proyecto__nombre")[inicio:inicio + self.ACTIVIDADES_POR_PAGINA + 1]
+        )
+        return JsonResponse({
+            "results": [
+                {"id": str(pk), "text": f"{titulo} — {proyecto or 'Sin proyecto'}"}
+                for pk, titulo, proyecto in filas[:self.ACTIVIDADES_POR_PAGINA]
+            ],
+            "pagination": {"more": len(filas) > self.ACTIVIDADES_POR_PAGINA},
+        })
+
+@admin.register(Intervencion)
+class IntervencionAdmin(admin.ModelAdmin):
+    list_display = ('reunion', 'autor', 'fecha_creacion')
+    # Reunion.__str__ incluye el nombre del proyecto
+    list_select_related = ('reunion__proyecto', 'autor')
+    search_fields = ('reunion__titulo', 'autor__username')
+    autocomplete_fields = ('reunion', 'autor')
+    date_hierarchy = 'fecha_creacion'
+    ordering = ('-fecha_creacion', '-id')
+    show_full_result_count = False
+    paginator = ConteoEstimadoPaginator
+
+    def get_queryset(self, request):
+        # El autocompletado de Comentario.intervencion también muestra __str__
+        # (el changelist ignora list_select_related si ya hay select_related)
+        return super().get_queryset(request).select_related(*self.list_select_related)
+
+
+@admin.register(Comentario)
+class ComentarioAdmin(admin.ModelAdmin):
+    # __str__ recorre autor → intervención → (autor, reunión)
+    list_display = ('__str__', 'fecha_creacion')
+    list_select_related = ('autor', 'intervencion__autor', 'intervencion__reunion')
+    search_fields = ('intervencion__reunion__titulo', 'autor__username')
+    autocomplete_fields = ('intervencion', 'autor')
+    date_hierarchy = 'fecha_creacion'
+    ordering = ('-fecha_creacion', '-id')
+    show_full_result_count = False
+    paginator = ConteoEstimadoPaginator
+
 admin.site.register(Etiqueta)
 admin.site.register(Documento)
 admin.site.register(IntervencionDocumento)
+
+
+@admin.register(ArchivoCompartido)
+class ArchivoCompartidoAdmin(admin.ModelAdmin):
+    # Lo mantienen las señales y deduplicar_documentos: solo consulta
+    list_display = ('nombre', 'tamano', 'referencias', 'creado', 'liberado')
+    search_fields = ('nombre',)
+    readonly_fields = ('nombre', 'tamano', 'referencias', 'creado', 'liberado')
+
+    def has_add_permission(self, request):
+        return False
+
 @admin.register(Proyecto)
 class ProyectoAdmin(admin.ModelAdmin):
     list_display = ('nombre','intervencion_total', 'intervencion_rmbc', 'ejecucion_proyecto', 'ejecucion_financiera')
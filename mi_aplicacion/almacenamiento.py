@@ -0,0 +1,73 @@
+# mi_aplicacion/almacenamiento.py
+# Almacenamiento direccionado por contenido para los documentos subidos
+# (Documento.archivo, IntervencionDocumento.archivo). El nombre de cada
+# archivo sale del SHA-256 de su contenido, calculado mientras se escribe
+# en disco: subir dos veces lo mismo guarda un solo archivo ("blob").
+#
+# Varias filas pueden apuntar al mismo blob; ArchivoCompartido lleva la
+# cuenta (ver signals.py). Los blobs sin referencias no se borran al
+# instante (otra subida simultánea podría estar reutilizándolos): los purga
+# el comando deduplicar_documentos --purgar tras un margen.
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+PREFIJO = "blobs"
+
+
+def es_blob(nombre):
+    return bool(nombre) and nombre.startswith(PREFIJO + "/")
+
+
+class AlmacenamientoDeduplicado(FileSystemStorage):
+    """FileSystemStorage (bajo MEDIA_ROOT) con nombres blobs/ab/cd/<sha256><ext>."""
+
+    def get_available_name(self, name, max_length=None):
+        # El nombre definitivo lo decide _save() a partir del contenido
+        return name
+
+    def _save(self, name, content):
+        extension = os.path.splitext(name)[1].lower()
+        temporales = self.path(os.path.join(PREFIJO, "tmp"))
+        os.makedirs(temporales, exist_ok=True)
+
+        # Se escribe en un temporal del mismo sistema de archivos y se
+        # calcula el hash al vuelo, sin leer el contenido dos veces
+        resumen = hashlib.sha256()
+        descriptor, temporal = tempfile.mkstemp(dir=temporales)
+        try:
+            with os.fdopen(descriptor, "wb") as destino:
+                if hasattr(content, "seek"):
+                    content.seek(0)
+                for bloque in content.chunks():
+                    resumen.update(bloque)
+                    destino.write(bloque)
+
+            digest = resumen.hexdigest()
+            nombre = f"{PREFIJO}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+            ruta = self.path(nombre)
+            if os.path.exists(ruta):
+                os.unlink(temporal)
+                # Reutilizado: la purga de blobs sin referencias respeta el margen
+                os.utime(ruta)
+            else:
+                os.makedirs(os.path.dirname(ruta), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temporal, self.file_permissions_mode)
+                # Atómico: una subida simultánea del mismo contenido deja el mismo archivo
+                os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.unlink(temporal)
+            raise
+        return nombre
+
+
+_almacenamiento = AlmacenamientoDeduplicado()
+
+
+def almacenamiento_documentos():
+    # Callable para FileField(storage=...): no queda la clase en las migraciones
+    return _almacenamiento
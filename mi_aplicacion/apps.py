@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MiAplicacionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mi_aplicacion'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,207 @@
+# mi_aplicacion/biblioteca.py
+# Biblioteca de documentos (DocumentosView): una sola consulta sobre
+# DocumentoBiblioteca, que reúne los documentos de reuniones
+# (Reunion.documentos) y los de intervenciones con proyecto, frente, fecha y
+# categoría copiados en la misma fila. Cada filtro tiene su índice
+# (proyecto|frente|categoria, -fecha, -id) y se pagina por cursor, así que
+# una página cuesta lo mismo con cien documentos que con cien mil.
+#
+# Las señales (signals.py) llaman a las funciones de aquí al guardar
+# documentos, adjuntarlos o quitarlos de una reunión y al cambiar una
+# reunión de proyecto o frente.
+import os
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Documento, DocumentoBiblioteca, Intervencion, IntervencionDocumento, Reunion
+
+_EXTENSIONES = {
+    "pdf": ("pdf",),
+    "imagen": ("png", "jpg", "jpeg", "gif", "webp", "bmp", "tif", "tiff", "svg"),
+    "hoja": ("xls", "xlsx", "ods", "csv"),
+    "texto": ("doc", "docx", "odt", "rtf", "txt", "md"),
+    "presentacion": ("ppt", "pptx", "odp"),
+    "multimedia": ("mp3", "wav", "ogg", "m4a", "mp4", "mov", "avi", "mkv", "webm"),
+    "comprimido": ("zip", "rar", "7z", "gz", "tar"),
+}
+_CATEGORIA_POR_EXTENSION = {ext: categoria for categoria, exts in _EXTENSIONES.items() for ext in exts}
+
+TAMANO_LOTE = 1000
+
+
+def categoria_de(nombre):
+    """Categoría por la extensión del archivo (el blob conserva la de la subida)."""
+    extension = os.path.splitext(nombre or "")[1].lstrip(".").lower()
+    return _CATEGORIA_POR_EXTENSION.get(extension, "otro")
+
+
+def _nombre(nombre, nombre_archivo, archivo):
+    return (nombre or nombre_archivo or os.path.basename(archivo or ""))[:255]
+
+
+# --- Mantenimiento del índice ---
+
+def actualizar_documento(documento):
+    """Nombre y categoría de las entradas de un Documento ya adjunto."""
+    DocumentoBiblioteca.objects.filter(documento=documento).update(
+        nombre=_nombre(documento.nombre, documento.nombre_archivo, documento.archivo.name),
+        categoria=categoria_de(documento.archivo.name),
+    )
+
+
+def adjuntar_documentos(reunion_ids, documento_ids):
+    """Entradas para cada par (reunión, documento) recién adjuntado."""
+    reuniones = list(Reunion.objects.filter(pk__in=reunion_ids).values("pk", "proyecto_id", "frente_id"))
+    documentos = list(
+        Documento.objects.filter(pk__in=documento_ids)
+        .values("pk", "nombre", "nombre_archivo", "archivo", "fecha_subida")
+    )
+    DocumentoBiblioteca.objects.bulk_create(
+        [
+            DocumentoBiblioteca(
+                origen="reunion",
+                documento_id=d["pk"],
+                reunion_id=r["pk"],
+                proyecto_id=r["proyecto_id"],
+                frente_id=r["frente_id"],
+                nombre=_nombre(d["nombre"], d["nombre_archivo"], d["archivo"]),
+                categoria=categoria_de(d["archivo"]),
+                fecha=d["fecha_subida"],
+            )
+            for r in reuniones for d in documentos
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def quitar_documentos(reunion_ids=None, documento_ids=None):
+    entradas = DocumentoBiblioteca.objects.filter(origen="reunion")
+    if reunion_ids is not None:
+        entradas = entradas.filter(reunion_id__in=reunion_ids)
+    if documento_ids is not None:
+        entradas = entradas.filter(documento_id__in=documento_ids)
+    entradas.delete()
+
+
+def indexar_documento_intervencion(documento):
+    intervencion = (
+        Intervencion.objects.filter(pk=documento.intervencion_id)
+        .values("reunion_id", "reunion__proyecto_id", "reunion__frente_id", "fecha_creacion")
+        .first()
+    )
+    if intervencion is None:
+        return
+    DocumentoBiblioteca.objects.update_or_create(
+        documento_intervencion=documento,
+        defaults={
+            "origen": "intervencion",
+            "reunion_id": intervencion["reunion_id"],
+            "intervencion_id": documento.intervencion_id,
+            "proyecto_id": intervencion["reunion__proyecto_id"],
+            "frente_id": intervencion["reunion__frente_id"],
+            "nombre": _nombre(documento.nombre, documento.nombre_archivo, documento.archivo.name),
+            "categoria": categoria_de(documento.archivo.name),
+            "fecha": intervencion["fecha_creacion"],
+        },
+    )
+
+
+def actualizar_reunion(reunion):
+    """Copia el proyecto y el frente de la reunión en sus entradas."""
+    DocumentoBiblioteca.objects.filter(reunion=reunion).exclude(
+        proyecto_id=reunion.proyecto_id, frente_id=reunion.frente_id
+    ).update(proyecto_id=reunion.proyecto_id, frente_id=reunion.frente_id)
+
+
+@transaction.atomic
+def reconstruir():
+    """Regenera el índice completo por lotes. Devuelve el número de entradas."""
+    DocumentoBiblioteca.objects.all().delete()
+    total = 0
+
+    Adjuntos = Reunion.documentos.through
+    filas = Adjuntos.objects.values(
+        "reunion_id", "reunion__proyecto_id", "reunion__frente_id",
+        "documento_id", "documento__nombre", "documento__nombre_archivo", "documento__archivo",
+        "documento__fecha_subida",
+    ).order_by("pk")
+    total += _insertar(
+        DocumentoBiblioteca(
+            origen="reunion",
+            documento_id=f["documento_id"],
+            reunion_id=f["reunion_id"],
+            proyecto_id=f["reunion__proyecto_id"],
+            frente_id=f["reunion__frente_id"],
+            nombre=_nombre(f["documento__nombre"], f["documento__nombre_archivo"], f["documento__archivo"]),
+            categoria=categoria_de(f["documento__archivo"]),
+            fecha=f["documento__fecha_subida"],
+        )
+        for f in filas.iterator(chunk_size=TAMANO_LOTE)
+    )
+
+    filas = IntervencionDocumento.objects.values(
+        "pk", "intervencion_id", "intervencion__reunion_id", "intervencion__reunion__proyecto_id",
+        "intervencion__reunion__frente_id", "intervencion__fecha_creacion", "nombre", "nombre_archivo", "archivo",
+    ).order_by("pk")
+    total += _insertar(
+        DocumentoBiblioteca(
+            origen="intervencion",
+            documento_intervencion_id=f["pk"],
+            reunion_id=f["intervencion__reunion_id"],
+            intervencion_id=f["intervencion_id"],
+            proyecto_id=f["intervencion__reunion__proyecto_id"],
+            frente_id=f["intervencion__reunion__frente_id"],
+            nombre=_nombre(f["nombre"], f["nombre_archivo"], f["archivo"]),
+            categoria=categoria_de(f["archivo"]),
+            fecha=f["intervencion__fecha_creacion"],
+        )
+        for f in filas.iterator(chunk_size=TAMANO_LOTE)
+    )
+    return total
+
+
+def _insertar(entradas):
+    total = 0
+    lote = []
+    for entrada in entradas:
+        lote.append(entrada)
+        if len(lote) >= TAMANO_LOTE:
+            total += len(DocumentoBiblioteca.objects.bulk_create(lote, ignore_conflicts=True))
+            lote = []
+    if lote:
+        total += len(DocumentoBiblioteca.objects.bulk_create(lote, ignore_conflicts=True))
+    return total
+
+
+# --- Consulta ---
+
+def consulta(usuario, proyecto=None, frente=None, categoria=None, origen=None, desde=None, hasta=None):
+    """
+    Entradas visibles para `usuario` (las de reuniones cuyos documentos puede
+    descargar) con los filtros dados. `desde` y `hasta` son fechas (date).
+    """
+    entradas = DocumentoBiblioteca.objects.select_related(
+        "reunion", "proyecto", "frente", "documento", "documento_intervencion",
+    )
+    if not usuario.is_staff:
+        reuniones = Reunion.objects.accesibles_para(usuario).filter(pk=OuterRef("reunion_id"))
+        entradas = entradas.filter(Exists(reuniones))
+    if proyecto:
+        entradas = entradas.filter(proyecto_id=proyecto)
+    if frente:
+        entradas = entradas.filter(frente_id=frente)
+    if categoria:
+        entradas = entradas.filter(categoria=categoria)
+    if origen:
+        entradas = entradas.filter(origen=origen)
+    # Sobre el DateTimeField, sin __date, para usar los índices
+    if desde:
+        entradas = entradas.filter(fecha__gte=timezone.make_aware(datetime.combine(desde, datetime.min.time())))
+    if hasta:
+        entradas = entradas.filter(
+            fecha__lt=timezone.make_aware(datetime.combine(hasta + timedelta(days=1), datetime.min.time()))
+        )
+    return entradas
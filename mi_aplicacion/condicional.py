@@ -0,0 +1,59 @@
+# mi_aplicacion/condicional.py
+# GET condicional (ETag / Last-Modified) para descargas y exportaciones que se
+# construyen a partir de registros con updated_at. Una consulta barata (la
+# fecha de modificación del recurso) decide si el cliente ya tiene la versión
+# actual; en ese caso se responde 304 sin consultar ni renderizar nada más.
+#
+# No es para páginas con formularios: llevan el token CSRF de la sesión y,
+# tras volver a iniciar sesión, una copia revalidada enviaría uno caducado.
+import hashlib
+from datetime import datetime
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from . import filtros
+
+
+class GetCondicionalMixin:
+    """
+    Para vistas basadas en clases. version_recurso() devuelve una tupla cuyo
+    primer elemento es la última modificación del recurso; el resto (p. ej.
+    el número de filas de una exportación) también entra en el ETag. Si
+    devuelve None, o la fecha es None, la vista responde como siempre.
+
+    La respuesta depende además del usuario, del día (días restantes, avance
+    planificado) y de los frentes, que no tienen updated_at (se toman de la
+    caché de filtros, que se invalida al cambiarlos): todo ello forma parte
+    del ETag y Last-Modified nunca es anterior al comienzo del día.
+    """
+
+    def version_recurso(self):
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+
+        version = self.version_recurso()
+        if not version or version[0] is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        hoy = timezone.localdate()
+        inicio_hoy = timezone.make_aware(datetime.combine(hoy, datetime.min.time()))
+        ultima = int(max(version[0], inicio_hoy).timestamp())
+        firma = repr((request.user.pk, hoy.isoformat(), filtros.frentes(), version)).encode("utf-8")
+        etag = quote_etag(hashlib.sha1(firma).hexdigest())
+
+        respuesta = get_conditional_response(request, etag=etag, last_modified=ultima)
+        if respuesta is None:
+            respuesta = super().dispatch(request, *args, **kwargs)
+            if respuesta.status_code != 200:
+                return respuesta
+
+        respuesta["ETag"] = etag
+        respuesta["Last-Modified"] = http_date(ultima)
+        # El navegador la guarda pero revalida siempre; los proxies no
+        patch_cache_control(respuesta, private=True, no_cache=True)
+        return respuesta
@@ -0,0 +1,157 @@
+# mi_aplicacion/descargas.py
+# Envío de los archivos subidos (Documento, IntervencionDocumento) una vez
+# que la vista comprobó el acceso. MEDIA_ROOT no se publica: el proxy sirve
+# los bytes desde una ubicación interna indicada por cabecera
+# (DESCARGAS_SERVIDOR):
+#   - "nginx":    X-Accel-Redirect a DESCARGAS_PREFIJO_INTERNO, p. ej.
+#                     location /protegido/ { internal; alias /code/media/; }
+#   - "sendfile": X-Sendfile con la ruta absoluta (Apache mod_xsendfile, lighttpd).
+#   - "" (por defecto, desarrollo): FileResponse desde Django, con Range,
+#     ETag y Last-Modified para reanudar descargas y revalidar.
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+
+from .reportes.flujos import en_hilo
+
+TAMANO_BLOQUE = 64 * 1024
+
+_RANGO = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def responder_archivo(request, archivo, nombre=None, adjunto=False):
+    """Respuesta para el FieldFile `archivo`, descargado como `nombre`."""
+    nombre = nombre or os.path.basename(archivo.name)
+    content_type = mimetypes.guess_type(nombre)[0] or "application/octet-stream"
+    servidor = getattr(settings, "DESCARGAS_SERVIDOR", "")
+
+    if servidor == "nginx":
+        respuesta = HttpResponse(content_type=content_type)
+        prefijo = getattr(settings, "DESCARGAS_PREFIJO_INTERNO", "/protegido/")
+        respuesta["X-Accel-Redirect"] = prefijo.rstrip("/") + "/" + quote(archivo.name)
+    elif servidor == "sendfile":
+        respuesta = HttpResponse(content_type=content_type)
+        respuesta["X-Sendfile"] = archivo.path
+    else:
+        try:
+            ruta = archivo.path
+        except NotImplementedError:
+            raise Http404("Archivo no disponible")
+        return _respuesta_directa(request, ruta, nombre, content_type, adjunto)
+
+    respuesta["Content-Disposition"] = content_disposition_header(adjunto, nombre)
+    patch_cache_control(respuesta, private=True)
+    return respuesta
+
+
+class _Tramo:
+    """Lectura limitada a `restante` bytes de un archivo ya posicionado."""
+
+    def __init__(self, archivo, restante):
+        self.archivo = archivo
+        self.restante = restante
+
+    def read(self, tamano=-1):
+        if self.restante <= 0:
+            return b""
+        if tamano < 0 or tamano > self.restante:
+            tamano = self.restante
+        datos = self.archivo.read(tamano)
+        self.restante -= len(datos)
+        return datos
+
+    def close(self):
+        self.archivo.close()
+
+
+def _rango(request, tamano, etag, modificado):
+    """
+    (inicio, fin) pedido en la cabecera Range, o None para enviar el archivo
+    completo (sin Range, If-Range que no coincide, varios rangos o formato
+    no válido). inicio puede ser >= tamano: rango no satisfacible.
+    """
+    cabecera = request.headers.get("Range", "")
+    coincidencia = _RANGO.match(cabecera.strip())
+    if not coincidencia:
+        return None
+
+    condicion = request.headers.get("If-Range")
+    if condicion:
+        fecha = parse_http_date_safe(condicion)
+        if condicion != etag and (fecha is None or fecha < modificado):
+            return None
+
+    inicio, fin = coincidencia.groups()
+    if not inicio and not fin:
+        return None
+    if not inicio:
+        # bytes=-N: los últimos N bytes
+        return max(tamano - int(fin), 0), tamano - 1
+    inicio = int(inicio)
+    if inicio >= tamano:
+        return inicio, tamano - 1
+    fin = min(int(fin), tamano - 1) if fin else tamano - 1
+    if fin < inicio:
+        return None
+    return inicio, fin
+
+
+def responder_cache(request, ruta, nombre):
+    """
+    Respuesta para un archivo de una caché direccionada por contenido (p. ej.
+    las miniaturas de vistas_previas.py): nunca cambia, el navegador la
+    guarda sin revalidar. Son archivos pequeños y los envía Django.
+    """
+    content_type = mimetypes.guess_type(nombre)[0] or "application/octet-stream"
+    respuesta = _respuesta_directa(request, ruta, nombre, content_type, False)
+    patch_cache_control(respuesta, max_age=365 * 24 * 3600, immutable=True)
+    return respuesta
+
+
+def _respuesta_directa(request, ruta, nombre, content_type, adjunto):
+    try:
+        estado = os.stat(ruta)
+    except FileNotFoundError:
+        raise Http404("Archivo no disponible")
+
+    etag = quote_etag(f"{estado.st_size:x}-{estado.st_mtime_ns:x}")
+    modificado = int(estado.st_mtime)
+
+    respuesta = get_conditional_response(request, etag=etag, last_modified=modificado)
+    if respuesta is None:
+        rango = _rango(request, estado.st_size, etag, modificado)
+        if rango and rango[0] >= estado.st_size:
+            respuesta = HttpResponse(status=416)
+            respuesta["Content-Range"] = f"bytes */{estado.st_size}"
+            return respuesta
+
+        fichero = open(ruta, "rb")
+        if rango is None:
+            respuesta = FileResponse(fichero, content_type=content_type, as_attachment=adjunto, filename=nombre)
+        else:
+            inicio, fin = rango
+            fichero.seek(inicio)
+            respuesta = FileResponse(
+                _Tramo(fichero, fin - inicio + 1), status=206,
+                content_type=content_type, as_attachment=adjunto, filename=nombre,
+            )
+            respuesta["Content-Range"] = f"bytes {inicio}-{fin}/{estado.st_size}"
+            respuesta["Content-Length"] = str(fin - inicio + 1)
+
+        if isinstance(request, ASGIRequest):
+            # Bajo ASGI, Django 4.2 leería el archivo entero antes de enviarlo
+            lector = respuesta.file_to_stream
+            respuesta.streaming_content = en_hilo(iter(lambda: lector.read(TAMANO_BLOQUE), b""))
+
+    respuesta["Accept-Ranges"] = "bytes"
+    respuesta["ETag"] = etag
+    respuesta["Last-Modified"] = http_date(modificado)
+    patch_cache_control(respuesta, private=True)
+    return respuesta
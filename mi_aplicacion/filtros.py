@@ -0,0 +1,132 @@
+# mi_aplicacion/filtros.py
+# Opciones de los filtros (proyectos, frentes, responsables) de los listados
+# e informes. Se guardan en la caché de Django y se invalidan con señales
+# (ver signals.py) cuando cambian los modelos de origen.
+#
+# Con la caché por defecto (LocMemCache) cada proceso tiene su copia y la
+# invalidación solo alcanza al proceso que hizo el cambio; FILTROS_CACHE_TIMEOUT
+# acota cuánto puede quedar desactualizado el resto. Con una caché compartida
+# (Redis/Memcached en CACHES) la invalidación es inmediata en todos.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from .models import Frente, Proyecto, Reunion
+
+CLAVE_PROYECTOS = "filtros:proyectos"
+CLAVE_FRENTES = "filtros:frentes"
+CLAVE_RESPONSABLES = "filtros:responsables"
+CLAVE_ACTIVIDADES = "filtros:actividades:{}"
+
+RESULTADOS_POR_PAGINA = 20
+
+
+def _timeout():
+    return getattr(settings, "FILTROS_CACHE_TIMEOUT", 300)
+
+
+def proyectos():
+    """[{'id', 'nombre'}] de todos los proyectos, por nombre."""
+    return cache.get_or_set(
+        CLAVE_PROYECTOS,
+        lambda: list(Proyecto.objects.order_by("nombre").values("id", "nombre")),
+        _timeout(),
+    )
+
+
+def frentes():
+    """[{'id', 'nombre', 'tipo'}] de todos los frentes, por nombre."""
+    return cache.get_or_set(
+        CLAVE_FRENTES,
+        lambda: list(Frente.objects.order_by("nombre").values("id", "nombre", "tipo")),
+        _timeout(),
+    )
+
+
+def _nombre_usuario(first_name, last_name, username):
+    return f"{first_name} {last_name}".strip() or username
+
+
+def _cargar_responsables():
+    User = get_user_model()
+    filas = (
+        User.objects
+        .filter(reuniones_responsables__isnull=False)
+        .distinct()
+        .order_by("first_name", "last_name", "username")
+        .values_list("id", "first_name", "last_name", "username")
+    )
+    return [{"id": pk, "texto": _nombre_usuario(*nombre)} for pk, *nombre in filas]
+
+
+def responsables():
+    """[{'id', 'texto'}] de los usuarios que son responsables de alguna reunión."""
+    return cache.get_or_set(CLAVE_RESPONSABLES, _cargar_responsables, _timeout())
+
+
+def actividades(proyecto_id):
+    """[{'id', 'texto'}] de las actividades de un proyecto (posibles padres de una tarea)."""
+    return cache.get_or_set(
+        CLAVE_ACTIVIDADES.format(proyecto_id),
+        lambda: [
+            {"id": pk, "texto": titulo}
+            for pk, titulo in (
+                Reunion.objects
+                .filter(proyecto_id=proyecto_id, frente__tipo="actividad")
+                .order_by("titulo", "pk")
+                .values_list("id", "titulo")
+            )
+        ],
+        _timeout(),
+    )
+
+
+def paginar(opciones, q="", pagina=1, texto="texto"):
+    """
+    Página de `opciones` (lista de dicts en caché) cuyo `texto` contiene `q`
+    sin distinguir mayúsculas. Devuelve (resultados, hay_mas).
+    """
+    q = (q or "").strip().lower()
+    coincidencias = [o for o in opciones if q in o[texto].lower()] if q else opciones
+    inicio = (max(pagina, 1) - 1) * RESULTADOS_POR_PAGINA
+    fin = inicio + RESULTADOS_POR_PAGINA
+    return coincidencias[inicio:fin], len(coincidencias) > fin
+
+
+def buscar_en_bd(queryset, campo, q="", pagina=1):
+    """
+    Como paginar() pero consultando la base de datos (tablas que no conviene
+    tener enteras en caché): `campo__icontains=q`, una página por consulta.
+    """
+    q = (q or "").strip()
+    if q:
+        queryset = queryset.filter(**{f"{campo}__icontains": q})
+    inicio = (max(pagina, 1) - 1) * RESULTADOS_POR_PAGINA
+    filas = list(queryset.order_by(campo, "pk").values_list("pk", campo)[inicio:inicio + RESULTADOS_POR_PAGINA + 1])
+    return [{"id": pk, "texto": str(valor)} for pk, valor in filas[:RESULTADOS_POR_PAGINA]], len(filas) > RESULTADOS_POR_PAGINA
+
+
+def buscar_responsables(q="", pagina=1):
+    """
+    Página de responsables cuyo nombre contiene `q` (sin distinguir
+    mayúsculas). Devuelve (resultados, hay_mas).
+    """
+    return paginar(responsables(), q, pagina)
+
+
+def nombre_responsable(pk):
+    """Texto a mostrar para el responsable seleccionado en un filtro."""
+    if not pk:
+        return ""
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return ""
+    for responsable in responsables():
+        if responsable["id"] == pk:
+            return responsable["texto"]
+    return ""
+
+
+def invalidar(*claves):
+    cache.delete_many(claves or [CLAVE_PROYECTOS, CLAVE_FRENTES, CLAVE_RESPONSABLES])
@@ -1,7 +1,8 @@
 # mi_aplicacion/forms.py
 
 from django import forms
-from .models import Intervencion, Comentario, IntervencionDocumento, Reunion, Proyecto, Frente
+from .models import Intervencion, Comentario, IntervencionDocumento, Reunion
+from .widgets import Autocompletar
 
 class IntervencionForm(forms.ModelForm):
     class Meta:
@@ -33,53 +34,50 @@ class ComentarioForm(forms.ModelForm):
         }
 
 class ReunionForm(forms.ModelForm):
+    # Los campos relacionados se buscan con autocompletado (widgets.Autocompletar):
+    # el HTML solo lleva los valores elegidos, no las tablas completas.
     class Meta:
         model = Reunion
         fields = [
             'proyecto',
             'frente',
+            'parent',
             'titulo',
             'descripcion',
+            'fecha',
+            'fecha_finalizacion',
             'estado',
             'grupo_trabajo',
             'etiquetas',
             'documentos',
+            'responsables',
         ]
         widgets = {
+            'proyecto': Autocompletar('mi_aplicacion:buscar_proyectos'),
+            'frente': Autocompletar('mi_aplicacion:buscar_frentes'),
+            'parent': Autocompletar('mi_aplicacion:buscar_actividades', depende='proyecto'),
             'titulo': forms.TextInput(attrs={'class': 'form-control'}),
             'descripcion': forms.Textarea(attrs={'rows': 3, 'class': 'form-control'}),
+            'fecha': forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}),
+            'fecha_finalizacion': forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}),
             'estado': forms.Select(attrs={'class': 'form-select'}),
-            'grupo_trabajo': forms.Select(attrs={'class': 'form-select'}),
-            'etiquetas': forms.SelectMultiple(attrs={'class': 'form-select'}),
+            'grupo_trabajo': Autocompletar('mi_aplicacion:buscar_grupos'),
+            'etiquetas': Autocompletar('mi_aplicacion:buscar_etiquetas', multiple=True),
+            'documentos': Autocompletar('mi_aplicacion:buscar_documentos', multiple=True),
+            'responsables': Autocompletar('mi_aplicacion:buscar_usuarios', multiple=True),
         }
 
     def __init__(self, *args, **kwargs):
         proyecto = kwargs.pop('proyecto', None)
         super().__init__(*args, **kwargs)
 
-        if self.instance and getattr(self.instance, 'proyecto', None):
-            proyecto = self.instance.proyecto
-
+        if self.instance and getattr(self.instance, 'proyecto_id', None):
+            proyecto = self.instance.proyecto_id
         if proyecto:
-            try:
-                proyecto_id = proyecto.pk if hasattr(proyecto, 'pk') else int(proyecto)
-                self.fields['frente'].queryset = Frente.objects.filter(proyecto_id=proyecto_id).order_by('nombre')
-                self.fields['frente'].disabled = False
-            except Exception:
-                self.fields['frente'].queryset = Frente.objects.none()
-        else:
-            self.fields['frente'].queryset = Frente.objects.none()
-            self.fields['frente'].disabled = True
+            self.initial.setdefault('proyecto', proyecto.pk if hasattr(proyecto, 'pk') else proyecto)
+
+        # Solo actividades como padre (clean() del modelo valida además el proyecto)
+        self.fields['parent'].queryset = Reunion.objects.filter(frente__tipo='actividad')
 
 class UploadCSVForm(forms.Form):
     csv_file = forms.FileField(label="Seleccionar archivo CSV")
-
-class ReunionForm(forms.ModelForm):
-    class Meta:
-        model = Reunion
-        fields = "__all__"
-        widgets = {
-            "fecha": forms.DateTimeInput(attrs={"type": "datetime-local", "class": "form-control"}),
-            "fecha_finalizacion": forms.DateTimeInput(attrs={"type": "datetime-local", "class": "form-control"}),
-            "descripcion": forms.Textarea(attrs={"rows": 3, "class": "form-control"}),
-        }
\ No newline at end of file
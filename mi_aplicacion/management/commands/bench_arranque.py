@@ -0,0 +1,97 @@
+# mi_aplicacion/management/commands/bench_arranque.py
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Módulos que solo deben cargarse al exportar (ver mi_aplicacion/reportes/)
+MODULOS_PESADOS = ("openpyxl", "reportlab")
+
+# Se ejecuta en un intérprete nuevo para medir un arranque en frío real
+SCRIPT_MEDICION = r"""
+import json, os, sys, time
+
+def rss_kb():
+    try:
+        with open("/proc/self/status") as fh:
+            for linea in fh:
+                if linea.startswith("VmRSS:"):
+                    return int(linea.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+inicio = time.perf_counter()
+import django
+django.setup()
+t_setup = time.perf_counter()
+rss_setup = rss_kb()
+
+from django.urls import get_resolver
+get_resolver().url_patterns
+t_urls = time.perf_counter()
+rss_urls = rss_kb()
+
+print(json.dumps({
+    "setup_ms": (t_setup - inicio) * 1000,
+    "urls_ms": (t_urls - inicio) * 1000,
+    "rss_setup_kb": rss_setup,
+    "rss_urls_kb": rss_urls,
+    "pesados": [m for m in sys.argv[1:] if m in sys.modules],
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el tiempo de importación y la memoria (RSS) de un worker después de "
+        "django.setup() y después de resolver las URLs. Falla si se cargan "
+        "openpyxl/reportlab al arrancar o si se superan los umbrales indicados."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeticiones", type=int, default=5)
+        parser.add_argument("--max-ms", type=float, default=None,
+                            help="Umbral (mediana) en ms hasta tener las URLs cargadas.")
+        parser.add_argument("--max-rss-kb", type=int, default=None,
+                            help="Umbral (mediana) de RSS en KB tras cargar las URLs.")
+
+    def handle(self, *args, **options):
+        env = os.environ.copy()
+        env.setdefault("DJANGO_SETTINGS_MODULE", "mi_proyecto.settings")
+
+        muestras = []
+        for _ in range(options["repeticiones"]):
+            proc = subprocess.run(
+                [sys.executable, "-c", SCRIPT_MEDICION, *MODULOS_PESADOS],
+                capture_output=True, text=True, env=env,
+            )
+            if proc.returncode != 0:
+                raise CommandError(f"Falló la medición:\n{proc.stderr}")
+            muestras.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+        def mediana(clave):
+            return statistics.median(m[clave] for m in muestras)
+
+        resultado = {
+            "setup_ms": round(mediana("setup_ms"), 1),
+            "urls_ms": round(mediana("urls_ms"), 1),
+            "rss_setup_kb": int(mediana("rss_setup_kb")),
+            "rss_urls_kb": int(mediana("rss_urls_kb")),
+        }
+        for clave, valor in resultado.items():
+            self.stdout.write(f"{clave}: {valor}")
+
+        pesados = sorted({m for muestra in muestras for m in muestra["pesados"]})
+        if pesados:
+            raise CommandError(f"Se cargaron al arrancar: {', '.join(pesados)}")
+        if options["max_ms"] is not None and resultado["urls_ms"] > options["max_ms"]:
+            raise CommandError(f"Arranque lento: {resultado['urls_ms']} ms > {options['max_ms']} ms")
+        if options["max_rss_kb"] is not None and resultado["rss_urls_kb"] > options["max_rss_kb"]:
+            raise CommandError(f"Memoria excesiva: {resultado['rss_urls_kb']} KB > {options['max_rss_kb']} KB")
+
+        self.stdout.write(self.style.SUCCESS("Arranque dentro de los límites."))
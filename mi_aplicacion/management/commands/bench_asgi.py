@@ -0,0 +1,91 @@
+# mi_aplicacion/management/commands/bench_asgi.py
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+# Vistas de solo lectura que dependen sobre todo de la base de datos
+RUTAS = (
+    "/reuniones/",
+    "/reuniones/grafico/",
+    "/exportar/reuniones.csv",
+)
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Lanza la misma carga (peticiones concurrentes a las vistas de solo "
+        "lectura) contra el despliegue WSGI y el ASGI y compara el rendimiento "
+        "y la latencia. Ver los perfiles web-wsgi y web-asgi de docker-compose.yml."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--wsgi", default="http://localhost:8085", help="URL base del despliegue WSGI.")
+        parser.add_argument("--asgi", default="http://localhost:8084", help="URL base del despliegue ASGI.")
+        parser.add_argument("--ruta", action="append", dest="rutas",
+                            help=f"Ruta a pedir (repetible). Por defecto: {', '.join(RUTAS)}.")
+        parser.add_argument("--concurrencia", type=int, action="append", dest="concurrencias",
+                            help="Clientes simultáneos (repetible, ej. --concurrencia 10 --concurrencia 100).")
+        parser.add_argument("--peticiones", type=int, default=500, help="Peticiones por medición (500).")
+        parser.add_argument("--sesion", default="",
+                            help="Cookie sessionid de un usuario, para las vistas con login.")
+
+    def handle(self, *args, **options):
+        rutas = options["rutas"] or list(RUTAS)
+        concurrencias = options["concurrencias"] or [10, 50, 200]
+        if options["peticiones"] < 1 or min(concurrencias) < 1:
+            raise CommandError("--peticiones y --concurrencia deben ser positivos.")
+
+        self.stdout.write(f"{'servidor':8} {'conc.':>5} {'pet/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errores':>8}")
+        for concurrencia in concurrencias:
+            for nombre in ("wsgi", "asgi"):
+                r = self._medir(options[nombre], rutas, concurrencia, options["peticiones"], options["sesion"])
+                self.stdout.write(
+                    f"{nombre:8} {concurrencia:5} {r['por_segundo']:8.1f} {r['p50']:8.0f} "
+                    f"{r['p95']:8.0f} {r['p99']:8.0f} {r['errores']:8}"
+                )
+
+    def _medir(self, base, rutas, concurrencia, total, sesion):
+        sesiones = threading.local()
+
+        def pedir(i):
+            # Una sesión HTTP (conexiones reutilizables) por cliente
+            if not hasattr(sesiones, "http"):
+                sesiones.http = requests.Session()
+                if sesion:
+                    sesiones.http.cookies.set("sessionid", sesion)
+            url = base.rstrip("/") + rutas[i % len(rutas)]
+            inicio = time.perf_counter()
+            try:
+                respuesta = sesiones.http.get(url, timeout=120)
+                # Se lee el cuerpo completo: incluye el tiempo de las descargas por bloques
+                for _ in respuesta.iter_content(64 * 1024):
+                    pass
+                correcto = respuesta.status_code == 200
+            except requests.RequestException:
+                correcto = False
+            return time.perf_counter() - inicio, correcto
+
+        # Calentar conexiones y cachés antes de medir
+        with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+            list(pool.map(pedir, range(min(total, concurrencia))))
+            inicio = time.perf_counter()
+            resultados = list(pool.map(pedir, range(total)))
+            duracion = time.perf_counter() - inicio
+
+        latencias = [t * 1000 for t, correcto in resultados if correcto] or [0]
+        return {
+            "por_segundo": total / duracion,
+            "p50": statistics.median(latencias),
+            "p95": _percentil(latencias, 95),
+            "p99": _percentil(latencias, 99),
+            "errores": sum(1 for _, correcto in resultados if not correcto),
+        }
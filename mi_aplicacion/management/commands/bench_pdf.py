@@ -0,0 +1,81 @@
+# mi_aplicacion/management/commands/bench_pdf.py
+import io
+import statistics
+import time
+
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+
+
+def _flowables(secciones, styles):
+    from reportlab.platypus import Paragraph, Spacer
+
+    texto = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 6
+    for i in range(secciones):
+        yield Paragraph(f"Actividad {i}", styles["Actividad"])
+        for j in range(4):
+            yield Paragraph(f'<font color="red">Autor {j}</font>: {texto}', styles["Intervencion"])
+            yield Paragraph(f"Comentario {j}: {texto}", styles["Comentario"])
+        yield Spacer(1, 6)
+
+
+def _render_anterior(secciones):
+    """Réplica del camino previo: estilos por petición e imágenes por página."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate
+
+    from mi_aplicacion.reportes.motor_pdf import estilos
+
+    styles = estilos.__wrapped__()  # sin caché, como antes en cada petición
+
+    def header_footer(canvas, doc):
+        banner_path = finders.find('img/banner.png')
+        if banner_path:
+            canvas.drawImage(banner_path, x=0, y=A4[1] - 4 * cm, width=A4[0], height=3 * cm)
+        footer_path = finders.find('img/footer.png')
+        if footer_path:
+            canvas.drawImage(footer_path, x=0, y=0, width=A4[0], height=2 * cm)
+
+    destino = io.BytesIO()
+    doc = SimpleDocTemplate(destino, pagesize=A4, rightMargin=2 * cm, leftMargin=2 * cm, topMargin=5 * cm, bottomMargin=3 * cm)
+    doc.build(list(_flowables(secciones, styles)), onFirstPage=header_footer, onLaterPages=header_footer)
+    return doc.page, destino.tell()
+
+
+def _render_motor(secciones):
+    from mi_aplicacion.reportes.motor_pdf import crear_documento, estilos
+
+    destino = io.BytesIO()
+    doc = crear_documento(destino)
+    doc.build(list(_flowables(secciones, estilos())))
+    return doc.page, destino.tell()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el tiempo de render de un informe PDF sintético de cientos de "
+        "páginas con el motor común (reportes/motor_pdf.py) frente al camino anterior."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--secciones", type=int, default=300)
+        parser.add_argument("--repeticiones", type=int, default=3)
+
+    def handle(self, *args, **options):
+        secciones = options["secciones"]
+
+        # Calentar caches del motor e imports de reportlab antes de medir
+        _render_motor(1)
+        _render_anterior(1)
+
+        for nombre, funcion in (("anterior", _render_anterior), ("motor", _render_motor)):
+            tiempos = []
+            for _ in range(options["repeticiones"]):
+                inicio = time.perf_counter()
+                paginas, tamano = funcion(secciones)
+                tiempos.append(time.perf_counter() - inicio)
+            self.stdout.write(
+                f"{nombre}: {statistics.median(tiempos) * 1000:.0f} ms "
+                f"({paginas} páginas, {tamano // 1024} KB)"
+            )
@@ -0,0 +1,177 @@
+# mi_aplicacion/management/commands/deduplicar_documentos.py
+import hashlib
+import os
+import shutil
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from mi_aplicacion.almacenamiento import PREFIJO, almacenamiento_documentos, es_blob
+from mi_aplicacion.models import ArchivoCompartido, Documento, IntervencionDocumento
+
+MODELOS = (Documento, IntervencionDocumento)
+TAMANO_BLOQUE = 1024 * 1024
+
+
+def _hash(ruta):
+    resumen = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE), b""):
+            resumen.update(bloque)
+    return resumen.hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        "Pasa los archivos de Documento e IntervencionDocumento al almacenamiento "
+        "deduplicado (blobs/ por SHA-256): cada contenido queda una sola vez en "
+        "disco y las filas que lo repetían apuntan al mismo blob. Recalcula las "
+        "referencias de ArchivoCompartido y, con --purgar, borra los blobs que "
+        "ya no usa nadie."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--simular", action="store_true",
+                            help="Solo informa de los duplicados y del espacio a ahorrar; no cambia nada.")
+        parser.add_argument("--recontar", action="store_true",
+                            help="Solo recalcula ArchivoCompartido.referencias a partir de las filas.")
+        parser.add_argument("--purgar", action="store_true",
+                            help="Borra los blobs sin referencias liberados hace más de --horas.")
+        parser.add_argument("--horas", type=int, default=24,
+                            help="Margen antes de purgar un blob sin referencias (24).")
+
+    def handle(self, *args, **options):
+        if options["horas"] < 0:
+            raise CommandError("--horas no puede ser negativo.")
+        self.almacenamiento = almacenamiento_documentos()
+
+        if not options["recontar"] and not options["purgar"]:
+            self.migrar(options["simular"])
+            if options["simular"]:
+                return
+        if not options["purgar"] or options["recontar"]:
+            self.recontar()
+        if options["purgar"]:
+            self.purgar(options["horas"])
+
+    def migrar(self, simular):
+        # Un mismo archivo antiguo puede estar en varias filas: se trata una vez
+        antiguos = set()
+        for modelo in MODELOS:
+            nombres = (
+                modelo.objects.exclude(archivo="").exclude(archivo__startswith=PREFIJO + "/")
+                .values_list("archivo", flat=True).distinct()
+            )
+            antiguos.update(nombres.iterator())
+
+        blobs = {}
+        faltan = 0
+        antes = despues = 0
+        for antiguo in sorted(antiguos):
+            ruta = self.almacenamiento.path(antiguo)
+            try:
+                tamano = os.path.getsize(ruta)
+            except OSError:
+                faltan += 1
+                self.stderr.write(f"No existe: {antiguo}")
+                continue
+            digest = _hash(ruta)
+            extension = os.path.splitext(antiguo)[1].lower()
+            blob = f"{PREFIJO}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+            antes += tamano
+            if blob not in blobs and not self.almacenamiento.exists(blob):
+                despues += tamano
+            blobs.setdefault(blob, []).append(antiguo)
+
+            if simular:
+                continue
+            self._mover(antiguo, blob)
+
+        repetidos = sum(len(v) - 1 for v in blobs.values())
+        accion = "Se ahorrarían" if simular else "Ahorrados"
+        self.stdout.write(
+            f"Archivos: {len(antiguos) - faltan} en {len(blobs)} blobs ({repetidos} repetidos). "
+            f"{accion}: {antes - despues} bytes de {antes}."
+        )
+        if faltan:
+            self.stdout.write(self.style.WARNING(f"Archivos que no están en disco: {faltan}"))
+
+    def _mover(self, antiguo, blob):
+        origen = self.almacenamiento.path(antiguo)
+        destino = self.almacenamiento.path(blob)
+        if not os.path.exists(destino):
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            # Primero el blob (enlace duro, sin copiar datos si se puede),
+            # luego las filas y por último se quita el archivo antiguo: si se
+            # interrumpe, ninguna fila apunta a un archivo que no existe
+            try:
+                os.link(origen, destino)
+            except OSError:
+                shutil.copy2(origen, destino)
+
+        nombre_original = os.path.basename(antiguo)[:255]
+        with transaction.atomic():
+            for modelo in MODELOS:
+                filas = modelo.objects.filter(archivo=antiguo)
+                filas.filter(nombre_archivo="").update(nombre_archivo=nombre_original)
+                filas.update(archivo=blob)
+        os.unlink(origen)
+
+    def recontar(self):
+        cuentas = Counter()
+        for modelo in MODELOS:
+            filas = (
+                modelo.objects.filter(archivo__startswith=PREFIJO + "/")
+                .values("archivo").annotate(n=Count("pk")).order_by()
+            )
+            for fila in filas.iterator():
+                cuentas[fila["archivo"]] += fila["n"]
+
+        ahora = timezone.now()
+        existentes = dict(ArchivoCompartido.objects.values_list("nombre", "referencias"))
+        cambios = 0
+        for nombre, n in cuentas.items():
+            if nombre not in existentes:
+                try:
+                    tamano = self.almacenamiento.size(nombre)
+                except OSError:
+                    self.stderr.write(f"Blob referenciado que no está en disco: {nombre}")
+                    tamano = 0
+                ArchivoCompartido.objects.create(nombre=nombre, tamano=tamano, referencias=n)
+                cambios += 1
+            elif existentes[nombre] != n:
+                ArchivoCompartido.objects.filter(nombre=nombre).update(referencias=n, liberado=None)
+                cambios += 1
+        sueltos = (
+            ArchivoCompartido.objects.exclude(nombre__in=list(cuentas)).exclude(referencias=0)
+            .update(referencias=0, liberado=ahora)
+        )
+        self.stdout.write(self.style.SUCCESS(f"Referencias corregidas: {cambios + sueltos}"))
+
+    def purgar(self, horas):
+        limite = timezone.now() - timedelta(hours=horas)
+        candidatos = ArchivoCompartido.objects.filter(referencias__lte=0).filter(
+            Q(liberado__lt=limite) | Q(liberado__isnull=True, creado__lt=limite)
+        )
+        borrados = liberados = 0
+        for archivo in candidatos.iterator():
+            nombre = archivo.nombre
+            if not es_blob(nombre) or any(m.objects.filter(archivo=nombre).exists() for m in MODELOS):
+                continue
+            ruta = self.almacenamiento.path(nombre)
+            try:
+                # Una subida reciente del mismo contenido lo reutiliza (y le cambia la fecha)
+                if os.path.getmtime(ruta) > limite.timestamp():
+                    continue
+                liberados += os.path.getsize(ruta)
+                os.unlink(ruta)
+            except FileNotFoundError:
+                pass
+            ArchivoCompartido.objects.filter(pk=archivo.pk, referencias__lte=0).delete()
+            borrados += 1
+        self.stdout.write(self.style.SUCCESS(f"Blobs purgados: {borrados} ({liberados} bytes)"))
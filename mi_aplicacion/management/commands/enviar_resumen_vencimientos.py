@@ -0,0 +1,226 @@
+# mi_aplicacion/management/commands/enviar_resumen_vencimientos.py
+# Resumen diario, por responsable, de las reuniones vencidas y de las que
+# vencen pronto, enviado con Microsoft Graph.
+#
+# Pensado para ejecutarse desde cron. Es seguro repetirlo: cada usuario
+# recibe como mucho un resumen por día (EnvioResumenVencimientos).
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from itertools import groupby
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Exists, OuterRef, Q
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from mi_aplicacion.models import EnvioResumenVencimientos, Reunion
+from mi_aplicacion.utils.graph_mail import (
+    MAX_LOTE,
+    GraphError,
+    build_message,
+    get_active_config,
+    get_graph_token,
+    send_mail_batch_graph,
+)
+
+# Filas leídas por lote del cursor del servidor
+TAMANO_LOTE = 2000
+
+# Tras este tiempo se considera abandonado el reclamo de una ejecución
+# interrumpida y el resumen se puede volver a enviar
+RECLAMO_CADUCA = timedelta(minutes=30)
+
+
+@dataclass
+class Resumen:
+    usuario_id: int
+    email: str
+    asunto: str
+    cuerpo: str
+
+
+def _filas(hoy, limite):
+    """
+    Una sola consulta, ordenada por usuario: (usuario, reunión) de cada
+    reunión no cerrada que vence antes de `limite`, para los responsables
+    activos con correo que aún no recibieron el resumen de hoy.
+    """
+    Responsables = Reunion.responsables.through
+    ya_enviado = EnvioResumenVencimientos.objects.filter(
+        usuario=OuterRef("user_id"), fecha=hoy, enviado__isnull=False
+    )
+    return (
+        Responsables.objects
+        .filter(reunion__fecha_finalizacion__lt=limite, user__is_active=True)
+        .exclude(reunion__estado="cerrada")
+        .exclude(user__email="")
+        .filter(~Exists(ya_enviado))
+        .order_by("user_id", "reunion__fecha_finalizacion", "reunion_id")
+        .values_list(
+            "user_id", "user__email", "user__first_name", "user__last_name", "user__username",
+            "reunion_id", "reunion__titulo", "reunion__proyecto__nombre", "reunion__fecha_finalizacion",
+        )
+        .iterator(chunk_size=TAMANO_LOTE)
+    )
+
+
+def resumenes(hoy, dias, url_base=""):
+    """Genera un Resumen por usuario a partir de _filas()."""
+    inicio_hoy = timezone.make_aware(datetime.combine(hoy, time.min))
+    limite = inicio_hoy + timedelta(days=dias + 1)
+
+    for usuario_id, filas in groupby(_filas(hoy, limite), key=lambda fila: fila[0]):
+        vencidas, proximas = [], []
+        for _, email, nombre, apellido, username, reunion_id, titulo, proyecto, fin in filas:
+            reunion = {
+                "titulo": titulo,
+                "proyecto": proyecto,
+                "fecha_finalizacion": fin,
+                "url": reverse("mi_aplicacion:reunion_detail", args=[reunion_id]),
+            }
+            (vencidas if fin < inicio_hoy else proximas).append(reunion)
+
+        cuerpo = render_to_string("mi_aplicacion/correo/resumen_vencimientos.html", {
+            "nombre": f"{nombre} {apellido}".strip() or username,
+            "vencidas": vencidas,
+            "proximas": proximas,
+            "dias": dias,
+            "hoy": hoy,
+            "url_base": url_base.rstrip("/"),
+        })
+        asunto = f"Resumen de vencimientos: {len(vencidas)} vencidas, {len(proximas)} próximas"
+        yield Resumen(usuario_id, email, asunto, cuerpo)
+
+
+def _lotes(iterable, tamano):
+    lote = []
+    for elemento in iterable:
+        lote.append(elemento)
+        if len(lote) == tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+class Command(BaseCommand):
+    help = (
+        "Envía a cada responsable un resumen de sus reuniones vencidas y de las "
+        "que vencen en los próximos días. Idempotente por usuario y día."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dias", type=int, default=3,
+                            help="Incluir las que vencen en los próximos N días (3).")
+        parser.add_argument("--lote", type=int, default=MAX_LOTE,
+                            help=f"Correos por llamada a $batch de Graph (máx. {MAX_LOTE}).")
+        parser.add_argument("--concurrencia", type=int, default=4,
+                            help="Llamadas a Graph en paralelo (4, el límite por buzón).")
+        parser.add_argument("--url-base", default="",
+                            help="URL del sitio para enlazar las reuniones (ej. https://reuniones.example.org).")
+        parser.add_argument("--simular", action="store_true",
+                            help="Solo cuenta los resúmenes; no envía ni marca nada.")
+
+    def handle(self, *args, **options):
+        if not 1 <= options["lote"] <= MAX_LOTE:
+            raise CommandError(f"--lote debe estar entre 1 y {MAX_LOTE}.")
+        if options["concurrencia"] < 1:
+            raise CommandError("--concurrencia debe ser al menos 1.")
+
+        hoy = timezone.localdate()
+        pendientes = resumenes(hoy, options["dias"], options["url_base"])
+
+        if options["simular"]:
+            total = sum(1 for _ in pendientes)
+            self.stdout.write(f"Resúmenes por enviar: {total}")
+            return
+
+        try:
+            config = get_active_config()
+            token = get_graph_token(config)
+        except GraphError as e:
+            raise CommandError(str(e))
+
+        self.hoy = hoy
+        self.enviados = self.fallidos = 0
+        sesiones = threading.local()
+
+        def enviar(mensajes):
+            # Una sesión HTTP (conexiones reutilizables) por hilo
+            if not hasattr(sesiones, "http"):
+                sesiones.http = requests.Session()
+            return send_mail_batch_graph(mensajes, config, token, session=sesiones.http)
+
+        concurrencia = options["concurrencia"]
+        with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+            en_curso = {}
+            for lote in _lotes(pendientes, options["lote"]):
+                lote = self._reclamar(lote)
+                if not lote:
+                    continue
+                mensajes = [build_message(r.asunto, r.cuerpo, [r.email], "HTML") for r in lote]
+                en_curso[pool.submit(enviar, mensajes)] = lote
+
+                # Acota la memoria: no se generan más resúmenes de los que
+                # caben en los lotes en curso
+                if len(en_curso) >= concurrencia * 2:
+                    hechos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                    for futuro in hechos:
+                        self._registrar(futuro, en_curso.pop(futuro))
+
+            for futuro in list(en_curso):
+                futuro.exception()  # espera a que termine
+                self._registrar(futuro, en_curso.pop(futuro))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Resúmenes enviados: {self.enviados}. Fallidos (se reintentarán): {self.fallidos}."
+        ))
+
+    def _reclamar(self, lote):
+        """
+        Marca el lote como en envío por esta ejecución y devuelve los
+        resúmenes que consiguió reclamar (otra ejecución simultánea, o un
+        envío ya hecho, se los lleva a ella).
+        """
+        ids = [r.usuario_id for r in lote]
+        EnvioResumenVencimientos.objects.bulk_create(
+            [EnvioResumenVencimientos(usuario_id=pk, fecha=self.hoy) for pk in ids],
+            ignore_conflicts=True,
+        )
+        ahora = timezone.now()
+        marca = uuid.uuid4()
+        (
+            EnvioResumenVencimientos.objects
+            .filter(usuario_id__in=ids, fecha=self.hoy, enviado__isnull=True)
+            .filter(Q(reclamado__isnull=True) | Q(reclamado__lt=ahora - RECLAMO_CADUCA))
+            .update(lote=marca, reclamado=ahora)
+        )
+        reclamados = set(
+            EnvioResumenVencimientos.objects
+            .filter(lote=marca)
+            .values_list("usuario_id", flat=True)
+        )
+        return [r for r in lote if r.usuario_id in reclamados]
+
+    def _registrar(self, futuro, lote):
+        """Marca como enviados los aceptados por Graph y libera el resto."""
+        try:
+            codigos = futuro.result()
+        except (GraphError, requests.RequestException) as e:
+            self.stderr.write(f"Lote de {len(lote)} fallido: {e}")
+            codigos = [0] * len(lote)
+
+        aceptados = [r.usuario_id for r, codigo in zip(lote, codigos) if codigo in (200, 202)]
+        rechazados = [r.usuario_id for r, codigo in zip(lote, codigos) if codigo not in (200, 202)]
+        marcas = EnvioResumenVencimientos.objects.filter(fecha=self.hoy)
+        if aceptados:
+            marcas.filter(usuario_id__in=aceptados).update(enviado=timezone.now(), lote=None)
+        if rechazados:
+            marcas.filter(usuario_id__in=rechazados).update(lote=None, reclamado=None)
+        self.enviados += len(aceptados)
+        self.fallidos += len(rechazados)
@@ -0,0 +1,86 @@
+# mi_aplicacion/management/commands/generar_vistas_previas.py
+# Worker de metadatos y miniaturas de los documentos subidos (ver
+# vistas_previas.py). Procesa las filas con metadatos_pendientes: las
+# subidas nuevas de PDF e imágenes y los archivos anteriores a estas columnas.
+#
+# Con --continuo se queda esperando trabajo (servicio "worker" de
+# docker-compose.yml); sin él, procesa lo pendiente y termina (cron).
+import time
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from mi_aplicacion import vistas_previas
+from mi_aplicacion.models import Documento, IntervencionDocumento
+
+MODELOS = (Documento, IntervencionDocumento)
+
+
+class Command(BaseCommand):
+    help = (
+        "Completa tamaño, tipo, checksum y páginas de los documentos subidos y "
+        "genera sus miniaturas en VISTAS_PREVIAS_CACHE_DIR."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--continuo", action="store_true",
+                            help="No termina: vuelve a mirar cada --intervalo segundos.")
+        parser.add_argument("--intervalo", type=float, default=5, help="Segundos entre rondas (5).")
+        parser.add_argument("--lote", type=int, default=100, help="Documentos por consulta (100).")
+        parser.add_argument("--regenerar", action="store_true",
+                            help="Vuelve a calcular los metadatos de todos los documentos.")
+
+    def handle(self, *args, **options):
+        if options["lote"] < 1 or options["intervalo"] <= 0:
+            raise CommandError("--lote e --intervalo deben ser positivos.")
+        if options["regenerar"]:
+            for modelo in MODELOS:
+                modelo.objects.update(metadatos_pendientes=True)
+
+        try:
+            while True:
+                procesados = sum(self.procesar(modelo, options["lote"]) for modelo in MODELOS)
+                if procesados:
+                    self.stdout.write(f"Documentos procesados: {procesados}")
+                if not options["continuo"]:
+                    break
+                # Conexión fresca tras cada espera (CONN_MAX_AGE, reinicios de la base)
+                close_old_connections()
+                time.sleep(options["intervalo"])
+        except KeyboardInterrupt:
+            pass
+
+    def procesar(self, modelo, lote):
+        total = 0
+        ultimo = 0
+        while True:
+            filas = list(
+                modelo.objects.filter(metadatos_pendientes=True, pk__gt=ultimo)
+                .order_by("pk").values("pk", "archivo", "nombre_archivo", "checksum")[:lote]
+            )
+            if not filas:
+                return total
+            ultimo = filas[-1]["pk"]
+
+            for fila in filas:
+                datos = self._metadatos(modelo, fila)
+                # Si mientras tanto se cambió el archivo, la fila queda pendiente
+                modelo.objects.filter(pk=fila["pk"], archivo=fila["archivo"]).update(**datos)
+                total += 1
+
+    def _metadatos(self, modelo, fila):
+        if not fila["archivo"]:
+            return {"metadatos_pendientes": False}
+        almacenamiento = modelo._meta.get_field("archivo").storage
+        try:
+            return vistas_previas.metadatos_completos(
+                almacenamiento.path(fila["archivo"]), fila["nombre_archivo"], fila["checksum"],
+            )
+        except FileNotFoundError:
+            self.stderr.write(f"No existe: {fila['archivo']} ({modelo.__name__} {fila['pk']})")
+        except (OSError, SuspiciousFileOperation) as error:
+            # Permisos, disco, ruta inválida...: se anota y se sigue con el
+            # resto (--regenerar la vuelve a intentar) para no tumbar el worker
+            self.stderr.write(f"No se pudo leer {fila['archivo']} ({modelo.__name__} {fila['pk']}): {error}")
+        return {"metadatos_pendientes": False}
@@ -0,0 +1,20 @@
+# mi_aplicacion/management/commands/limpiar_subidas.py
+from django.core.management.base import BaseCommand, CommandError
+
+from mi_aplicacion.subidas import borrar_caducadas
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra las subidas por partes abandonadas (sin bloques nuevos en --horas) "
+        "y sus archivos temporales en SUBIDAS_TEMP_DIR. Pensado para cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--horas", type=int, default=48, help="Horas sin actividad (48).")
+
+    def handle(self, *args, **options):
+        if options["horas"] < 1:
+            raise CommandError("--horas debe ser positivo.")
+        borradas = borrar_caducadas(options["horas"])
+        self.stdout.write(self.style.SUCCESS(f"Temporales borrados: {borradas}"))
@@ -0,0 +1,136 @@
+# mi_aplicacion/management/commands/reconciliar_media.py
+# Archivos de MEDIA_ROOT que ya no referencia ningún Documento ni
+# IntervencionDocumento (p. ej. tras borrar reuniones o proyectos en
+# cascada, que no borra los archivos).
+#
+# Se recorre un directorio cada vez con os.scandir, sin listar el árbol
+# entero, y los nombres se comprueban contra la base de datos por lotes
+# (archivo__in, con el índice de `archivo`): la memoria no depende del
+# tamaño del volumen. Con --estado, los directorios terminados se apuntan en
+# un archivo y una ejecución interrumpida continúa donde quedó.
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from mi_aplicacion.models import ArchivoCompartido, Documento, IntervencionDocumento
+
+MODELOS = (Documento, IntervencionDocumento)
+
+
+class Command(BaseCommand):
+    help = (
+        "Informa de los archivos de MEDIA_ROOT sin Documento ni IntervencionDocumento "
+        "que los use y, con --cuarentena, los mueve fuera. Se puede limitar a "
+        "algunos directorios y reanudar (--estado)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--directorio", action="append", dest="directorios",
+                            help="Subdirectorio de MEDIA_ROOT a revisar (repetible). Por defecto, todo.")
+        parser.add_argument("--cuarentena",
+                            help="Mueve ahí los huérfanos (misma ruta relativa) en vez de solo informar.")
+        parser.add_argument("--horas", type=int, default=24,
+                            help="Ignora los archivos modificados hace menos de estas horas (24): subidas en curso.")
+        parser.add_argument("--lote", type=int, default=1000, help="Nombres por consulta (1000).")
+        parser.add_argument("--estado",
+                            help="Archivo con los directorios ya revisados; se borra al terminar todo.")
+
+    def handle(self, *args, **options):
+        if options["lote"] < 1 or options["horas"] < 0:
+            raise CommandError("--lote debe ser positivo y --horas no negativo.")
+        self.raiz = os.path.realpath(settings.MEDIA_ROOT)
+        self.lote = options["lote"]
+        self.limite = time.time() - options["horas"] * 3600
+        self.cuarentena = os.path.realpath(options["cuarentena"]) if options["cuarentena"] else None
+
+        iniciales = []
+        for directorio in options["directorios"] or [""]:
+            ruta = os.path.realpath(os.path.join(self.raiz, directorio))
+            if os.path.commonpath([ruta, self.raiz]) != self.raiz or not os.path.isdir(ruta):
+                raise CommandError(f"No es un directorio de MEDIA_ROOT: {directorio}")
+            iniciales.append(ruta)
+
+        hechos = set()
+        if options["estado"] and os.path.exists(options["estado"]):
+            with open(options["estado"], encoding="utf-8") as f:
+                hechos = {linea.rstrip("\n") for linea in f}
+        estado = open(options["estado"], "a", encoding="utf-8") if options["estado"] else None
+
+        self.huerfanos = self.bytes = self.revisados = 0
+        try:
+            pendientes = list(reversed(iniciales))
+            while pendientes:
+                directorio = pendientes.pop()
+                relativo = os.path.relpath(directorio, self.raiz)
+                subdirectorios = self.revisar_directorio(directorio, saltar_archivos=relativo in hechos)
+                pendientes.extend(sorted(subdirectorios, reverse=True))
+                if estado and relativo not in hechos:
+                    estado.write(relativo + "\n")
+                    estado.flush()
+        finally:
+            if estado:
+                estado.close()
+        if options["estado"]:
+            os.unlink(options["estado"])
+
+        accion = "movidos a cuarentena" if self.cuarentena else "sin referencias"
+        self.stdout.write(self.style.SUCCESS(
+            f"Archivos revisados: {self.revisados}; {accion}: {self.huerfanos} ({self.bytes} bytes)"
+        ))
+
+    def revisar_directorio(self, directorio, saltar_archivos=False):
+        """Revisa los archivos de `directorio` y devuelve sus subdirectorios."""
+        subdirectorios = []
+        lote = []
+        with os.scandir(directorio) as entradas:
+            for entrada in entradas:
+                if entrada.is_dir(follow_symlinks=False):
+                    if entrada.path != self.cuarentena:
+                        subdirectorios.append(entrada.path)
+                elif not saltar_archivos and entrada.is_file(follow_symlinks=False):
+                    lote.append(entrada)
+                    if len(lote) >= self.lote:
+                        self.revisar_lote(lote)
+                        lote = []
+        if lote:
+            self.revisar_lote(lote)
+        return subdirectorios
+
+    def revisar_lote(self, entradas):
+        self.revisados += len(entradas)
+        # Nombres tal como se guardan en los FileField: relativos y con "/"
+        nombres = {
+            os.path.relpath(entrada.path, self.raiz).replace(os.sep, "/"): entrada for entrada in entradas
+        }
+        referenciados = set()
+        for modelo in MODELOS:
+            referenciados.update(
+                modelo.objects.filter(archivo__in=list(nombres)).values_list("archivo", flat=True).distinct()
+            )
+
+        huerfanos = []
+        for nombre, entrada in nombres.items():
+            if nombre in referenciados:
+                continue
+            try:
+                estado = entrada.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            if estado.st_mtime > self.limite:
+                continue
+            self.huerfanos += 1
+            self.bytes += estado.st_size
+            huerfanos.append(nombre)
+            if self.cuarentena:
+                destino = os.path.join(self.cuarentena, nombre)
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                shutil.move(entrada.path, destino)
+            else:
+                self.stdout.write(f"{nombre}\t{estado.st_size}")
+
+        if self.cuarentena and huerfanos:
+            # Blobs del almacenamiento deduplicado que ya no están en disco
+            ArchivoCompartido.objects.filter(nombre__in=huerfanos, referencias__lte=0).delete()
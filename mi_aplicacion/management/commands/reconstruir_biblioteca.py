@@ -0,0 +1,16 @@
+# mi_aplicacion/management/commands/reconstruir_biblioteca.py
+from django.core.management.base import BaseCommand
+
+from mi_aplicacion.biblioteca import reconstruir
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenera DocumentoBiblioteca (índice de la biblioteca de documentos) "
+        "a partir de Reunion.documentos e IntervencionDocumento. Necesario una "
+        "vez tras crear la tabla y después de cargas con bulk_create/update()."
+    )
+
+    def handle(self, *args, **options):
+        total = reconstruir()
+        self.stdout.write(self.style.SUCCESS(f"Entradas de la biblioteca: {total}"))
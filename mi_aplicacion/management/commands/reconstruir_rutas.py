@@ -0,0 +1,15 @@
+# mi_aplicacion/management/commands/reconstruir_rutas.py
+from django.core.management.base import BaseCommand
+
+from mi_aplicacion.models import Reunion
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula Reunion.ruta (árbol actividad → tarea). Necesario una vez "
+        "tras añadir la columna y después de cargas con bulk_create/update()."
+    )
+
+    def handle(self, *args, **options):
+        actualizadas = Reunion.objects.reconstruir_rutas()
+        self.stdout.write(self.style.SUCCESS(f"Rutas actualizadas: {actualizadas}"))
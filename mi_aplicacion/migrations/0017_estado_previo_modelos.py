@@ -0,0 +1,105 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import mi_aplicacion.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('mi_aplicacion', '0016_rename_fecha_creacion_reunion_fecha'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GraphMailConfig',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(default='Configuración Principal', help_text='Identificador de la configuración.', max_length=100)),
+                ('tenant_id', models.CharField(max_length=200)),
+                ('client_id', models.CharField(max_length=200)),
+                ('client_secret', models.CharField(max_length=500)),
+                ('scope', models.CharField(default='https://graph.microsoft.com/.default', max_length=300)),
+                ('grant_type', models.CharField(default='client_credentials', max_length=100)),
+                ('email_send', models.EmailField(help_text='Correo desde el que se envía (ej: respuesta@regionmetropolitana.gov.co)', max_length=254)),
+                ('email_receive', models.EmailField(help_text='Correo de destino (ej: ortegaarrieta@gmail.com)', max_length=254)),
+                ('activo', models.BooleanField(default=True, help_text='Si está activo se usará esta configuración.')),
+            ],
+            options={
+                'verbose_name': 'Configuración Graph Mail',
+                'verbose_name_plural': 'Configuraciones Graph Mail',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='frente',
+            options={'ordering': ('nombre',)},
+        ),
+        migrations.AlterModelOptions(
+            name='proyecto',
+            options={'ordering': ['nombre']},
+        ),
+        migrations.AlterUniqueTogether(
+            name='frente',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='frente',
+            name='tipo',
+            field=models.CharField(choices=[('actividad', 'Actividad'), ('tarea', 'Tarea'), ('otro', 'Otro')], default='actividad', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='proyecto',
+            name='ejecucion_financiera',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Monto de ejecución financiera en millones', max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='proyecto',
+            name='ejecucion_proyecto',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Porcentaje de ejecución del proyecto', max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='proyecto',
+            name='intervencion_rmbc',
+            field=models.PositiveIntegerField(default=0, help_text='Número de intervenciones realizadas por RMBC'),
+        ),
+        migrations.AddField(
+            model_name='proyecto',
+            name='intervencion_total',
+            field=models.PositiveIntegerField(default=0, help_text='Número total de intervenciones en el proyecto'),
+        ),
+        migrations.AddField(
+            model_name='reunion',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='tareas', to='mi_aplicacion.reunion'),
+        ),
+        migrations.AlterField(
+            model_name='reunion',
+            name='fecha',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='reunion',
+            name='frente',
+            field=models.ForeignKey(blank=True, default=mi_aplicacion.models.get_default_frente, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reuniones', to='mi_aplicacion.frente'),
+        ),
+        migrations.CreateModel(
+            name='KeycloakProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keycloak_id', models.CharField(db_index=True, max_length=255, unique=True, verbose_name='Keycloak ID (sub)')),
+                ('id_token', models.TextField(blank=True, null=True)),
+                ('access_token', models.TextField(blank=True, null=True)),
+                ('refresh_token', models.TextField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='kc_profile', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RemoveField(
+            model_name='frente',
+            name='proyecto',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mi_aplicacion', '0017_estado_previo_modelos'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reunion',
+            index=models.Index(fields=['proyecto', '-fecha', '-id'], name='reunion_proyecto_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reunion',
+            index=models.Index(fields=['-fecha', '-id'], name='reunion_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:14
+
+from django.db import migrations, models
+
+
+def rellenar_rutas(apps, schema_editor):
+    # Mismo cálculo que ReunionQuerySet.reconstruir_rutas, con el modelo
+    # histórico (manage.py reconstruir_rutas lo repite si hiciera falta)
+    Reunion = apps.get_model('mi_aplicacion', 'Reunion')
+    padres = dict(Reunion.objects.values_list('pk', 'parent_id'))
+    rutas = {}
+
+    def ruta(pk):
+        if pk not in rutas:
+            cadena, actual = [], pk
+            while actual is not None and actual not in rutas and actual not in cadena:
+                cadena.append(actual)
+                actual = padres.get(actual)
+            base = rutas.get(actual, '/')
+            for nodo in reversed(cadena):
+                base = rutas[nodo] = f'{base}{nodo}/'
+        return rutas[pk]
+
+    Reunion.objects.bulk_update(
+        [Reunion(pk=pk, ruta=ruta(pk)) for pk in padres], ['ruta'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mi_aplicacion', '0018_reunion_indices_fecha'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reunion',
+            name='ruta',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(rellenar_rutas, migrations.RunPython.noop),
+    ]
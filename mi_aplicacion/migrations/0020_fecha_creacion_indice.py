@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mi_aplicacion', '0019_reunion_ruta'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comentario',
+            name='fecha_creacion',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='intervencion',
+            name='fecha_creacion',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
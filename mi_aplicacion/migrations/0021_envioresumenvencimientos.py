@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('mi_aplicacion', '0020_fecha_creacion_indice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnvioResumenVencimientos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('lote', models.UUIDField(blank=True, null=True)),
+                ('reclamado', models.DateTimeField(blank=True, null=True)),
+                ('enviado', models.DateTimeField(blank=True, null=True)),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes_vencimientos', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='envioresumenvencimientos',
+            constraint=models.UniqueConstraint(fields=('usuario', 'fecha'), name='resumen_vencimientos_unico'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mi_aplicacion', '0021_envioresumenvencimientos'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='intervencion',
+            index=models.Index(fields=['reunion', '-fecha_creacion', '-id'], name='intervencion_reunion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comentario',
+            index=models.Index(fields=['intervencion', '-fecha_creacion', '-id'], name='comentario_intervencion_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:30
+
+from django.db import migrations, models
+import mi_aplicacion.almacenamiento
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mi_aplicacion', '0023_updated_at'),
+    ]
+
+    # Solo esquema: los archivos ya subidos siguen en su ruta de siempre hasta
+    # que se ejecute `manage.py deduplicar_documentos`, que los pasa a blobs/,
+    # rellena nombre_archivo y cuenta las referencias de ArchivoCompartido
+    operations = [
+        migrations.CreateModel(
+            name='ArchivoCompartido',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=255, unique=True)),
+                ('tamano', models.BigIntegerField(default=0)),
+                ('referencias', models.IntegerField(default=0)),
+                ('creado', models.DateTimeField(auto_now_add=True)),
+                ('liberado', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='nombre_archivo',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='intervenciondocumento',
+            name='nombre_archivo',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='documento',
+            name='archivo',
+            field=models.FileField(storage=mi_aplicacion.almacenamiento.almacenamiento_documentos, upload_to='reuniones/documentos/'),
+        ),
+        migrations.AlterField(
+            model_name='intervenciondocumento',
+            name='archivo',
+            field=models.FileField(blank=True, storage=mi_aplicacion.almacenamiento.almacenamiento_documentos, upload_to='documentos/intervenciones/'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mi_aplicacion', '0024_archivocompartido'),
+    ]
+
+    # Las filas existentes quedan con metadatos_pendientes=True: las completa
+    # el worker (`manage.py generar_vistas_previas`)
+    operations = [
+        migrations.AddField(
+            model_name='documento',
+            name='checksum',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='metadatos_pendientes',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='paginas',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='tamano',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='tipo_mime',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='documento',
+            name='vista_previa',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='intervenciondocumento',
+            name='checksum',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='intervenciondocumento',
+            name='metadatos_pendientes',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+        migrations.AddField(
+            model_name='intervenciondocumento',
+            name='paginas',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='intervenciondocumento',
+            name='tamano',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='intervenciondocumento',
+            name='tipo_mime',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='intervenciondocumento',
+            name='vista_previa',
+            field=models.BooleanField(default=False),
+        ),
+    ]
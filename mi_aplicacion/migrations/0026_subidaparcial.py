@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('mi_aplicacion', '0025_metadatos_documentos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubidaParcial',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('contenido', models.TextField()),
+                ('nombre_archivo', models.CharField(max_length=255)),
+                ('nombre', models.CharField(blank=True, max_length=255)),
+                ('tamano', models.BigIntegerField()),
+                ('recibido', models.BigIntegerField(default=0)),
+                ('creada', models.DateTimeField(auto_now_add=True)),
+                ('actualizada', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('reunion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subidas', to='mi_aplicacion.reunion')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subidas', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,98 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:42
+
+import os
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from mi_aplicacion.biblioteca import TAMANO_LOTE, categoria_de
+
+
+def rellenar_biblioteca(apps, schema_editor):
+    # Carga inicial: lo mismo que biblioteca.reconstruir (manage.py
+    # reconstruir_biblioteca), con los modelos históricos
+    Reunion = apps.get_model('mi_aplicacion', 'Reunion')
+    IntervencionDocumento = apps.get_model('mi_aplicacion', 'IntervencionDocumento')
+    DocumentoBiblioteca = apps.get_model('mi_aplicacion', 'DocumentoBiblioteca')
+
+    def nombre(*candidatos):
+        *nombres, archivo = candidatos
+        return next((n for n in nombres if n), os.path.basename(archivo or ''))[:255]
+
+    adjuntos = Reunion.documentos.through.objects.values(
+        'reunion_id', 'reunion__proyecto_id', 'reunion__frente_id',
+        'documento_id', 'documento__nombre', 'documento__nombre_archivo', 'documento__archivo',
+        'documento__fecha_subida',
+    ).order_by('pk')
+    DocumentoBiblioteca.objects.bulk_create(
+        (
+            DocumentoBiblioteca(
+                origen='reunion',
+                documento_id=f['documento_id'],
+                reunion_id=f['reunion_id'],
+                proyecto_id=f['reunion__proyecto_id'],
+                frente_id=f['reunion__frente_id'],
+                nombre=nombre(f['documento__nombre'], f['documento__nombre_archivo'], f['documento__archivo']),
+                categoria=categoria_de(f['documento__archivo']),
+                fecha=f['documento__fecha_subida'],
+            )
+            for f in adjuntos.iterator(chunk_size=TAMANO_LOTE)
+        ),
+        batch_size=TAMANO_LOTE,
+    )
+
+    documentos = IntervencionDocumento.objects.values(
+        'pk', 'intervencion_id', 'intervencion__reunion_id', 'intervencion__reunion__proyecto_id',
+        'intervencion__reunion__frente_id', 'intervencion__fecha_creacion', 'nombre', 'nombre_archivo', 'archivo',
+    ).order_by('pk')
+    DocumentoBiblioteca.objects.bulk_create(
+        (
+            DocumentoBiblioteca(
+                origen='intervencion',
+                documento_intervencion_id=f['pk'],
+                reunion_id=f['intervencion__reunion_id'],
+                intervencion_id=f['intervencion_id'],
+                proyecto_id=f['intervencion__reunion__proyecto_id'],
+                frente_id=f['intervencion__reunion__frente_id'],
+                nombre=nombre(f['nombre'], f['nombre_archivo'], f['archivo']),
+                categoria=categoria_de(f['archivo']),
+                fecha=f['intervencion__fecha_creacion'],
+            )
+            for f in documentos.iterator(chunk_size=TAMANO_LOTE)
+        ),
+        batch_size=TAMANO_LOTE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mi_aplicacion', '0026_subidaparcial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentoBiblioteca',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('origen', models.CharField(choices=[('reunion', 'Documento de reunión'), ('intervencion', 'Documento de intervención')], max_length=20)),
+                ('nombre', models.CharField(blank=True, max_length=255)),
+                ('categoria', models.CharField(choices=[('pdf', 'PDF'), ('imagen', 'Imagen'), ('hoja', 'Hoja de cálculo'), ('texto', 'Texto'), ('presentacion', 'Presentación'), ('multimedia', 'Audio y video'), ('comprimido', 'Comprimido'), ('otro', 'Otro')], max_length=20)),
+                ('fecha', models.DateTimeField()),
+                ('documento', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='entradas_biblioteca', to='mi_aplicacion.documento')),
+                ('documento_intervencion', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='entrada_biblioteca', to='mi_aplicacion.intervenciondocumento')),
+                ('frente', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='mi_aplicacion.frente')),
+                ('intervencion', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='mi_aplicacion.intervencion')),
+                ('proyecto', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='mi_aplicacion.proyecto')),
+                ('reunion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='mi_aplicacion.reunion')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-fecha', '-id'], name='biblioteca_fecha_idx'), models.Index(fields=['proyecto', '-fecha', '-id'], name='biblioteca_proyecto_idx'), models.Index(fields=['frente', '-fecha', '-id'], name='biblioteca_frente_idx'), models.Index(fields=['categoria', '-fecha', '-id'], name='biblioteca_categoria_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='documentobiblioteca',
+            constraint=models.UniqueConstraint(fields=('documento', 'reunion'), name='biblioteca_documento_reunion'),
+        ),
+        migrations.RunPython(rellenar_biblioteca, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:46
+
+from django.db import migrations, models
+import mi_aplicacion.almacenamiento
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mi_aplicacion', '0027_documentobiblioteca'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='documento',
+            name='archivo',
+            field=models.FileField(db_index=True, storage=mi_aplicacion.almacenamiento.almacenamiento_documentos, upload_to='reuniones/documentos/'),
+        ),
+        migrations.AlterField(
+            model_name='intervenciondocumento',
+            name='archivo',
+            field=models.FileField(blank=True, db_index=True, storage=mi_aplicacion.almacenamiento.almacenamiento_documentos, upload_to='documentos/intervenciones/'),
+        ),
+    ]
@@ -1,11 +1,20 @@
 from django.db import models
+from django.db.models import (
+    Case, Count, Exists, F, FloatField, Func, IntegerField, OuterRef, Q, Subquery, Value, When,
+)
+from django.db.models.functions import Coalesce, Concat, Greatest, Least, Round, Substr
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 
+import uuid
 from decimal import Decimal, ROUND_HALF_UP
 from datetime import date
 
+from .almacenamiento import almacenamiento_documentos
+
 User.add_to_class("__str__", lambda self: f"{self.first_name} {self.last_name}".strip() or self.username)
 
 class GrupoTrabajo(models.Model):
@@ -22,15 +31,144 @@ class Etiqueta(models.Model):
     def __str__(self):
         return self.nombre
 
-class Documento(models.Model):
-    archivo = models.FileField(upload_to='reuniones/documentos/')
+class ArchivoCompartido(models.Model):
+    """
+    Blob del almacenamiento deduplicado (almacenamiento.py) y cuántos
+    Documento / IntervencionDocumento lo usan. Lo mantienen las señales; los
+    blobs sin referencias los borra `deduplicar_documentos --purgar`.
+    """
+    nombre = models.CharField(max_length=255, unique=True)
+    tamano = models.BigIntegerField(default=0)
+    referencias = models.IntegerField(default=0)
+    creado = models.DateTimeField(auto_now_add=True)
+    liberado = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.nombre} ({self.referencias})"
+
+    @classmethod
+    def sumar(cls, nombre, tamano=0):
+        cls.objects.get_or_create(nombre=nombre, defaults={"tamano": tamano})
+        cls.objects.filter(nombre=nombre).update(referencias=F("referencias") + 1, liberado=None)
+
+    @classmethod
+    def liberar(cls, nombre):
+        cls.objects.filter(nombre=nombre).update(referencias=F("referencias") - 1, liberado=timezone.now())
+
+class MetadatosArchivo(models.Model):
+    """
+    Datos del archivo subido para los listados, sin abrirlo al renderizar.
+    Tamaño, tipo y checksum se guardan al subirlo; páginas y miniatura las
+    completa `generar_vistas_previas` (ver vistas_previas.py).
+    """
+    tamano = models.BigIntegerField(null=True, blank=True)
+    tipo_mime = models.CharField(max_length=100, blank=True)
+    paginas = models.PositiveIntegerField(null=True, blank=True)
+    checksum = models.CharField(max_length=64, blank=True, db_index=True)
+    vista_previa = models.BooleanField(default=False)
+    metadatos_pendientes = models.BooleanField(default=True, db_index=True)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def es_imagen(self):
+        return self.tipo_mime.startswith("image/")
+
+class Documento(MetadatosArchivo):
+    archivo = models.FileField(upload_to='reuniones/documentos/', storage=almacenamiento_documentos, db_index=True)
     nombre = models.CharField(max_length=255, blank=True)
+    # Nombre del archivo subido (en disco se guarda por su hash)
+    nombre_archivo = models.CharField(max_length=255, blank=True)
     fecha_subida = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return self.nombre or self.archivo.name
+        return self.nombre or self.nombre_archivo or self.archivo.name
     
+class DiasEntre(Func):
+    """Días enteros entre dos fechas (DateField): DiasEntre(fin, inicio)."""
+    arity = 2
+    output_field = IntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # PostgreSQL: date - date devuelve días
+        return super().as_sql(compiler, connection, template="(%(expressions)s)", arg_joiner=" - ", **extra_context)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template="CAST(julianday(%(expressions)s) AS INTEGER)", arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function="DATEDIFF", **extra_context)
+
+
+class ProyectoQuerySet(models.QuerySet):
+
+    def con_avance(self, real=False, hoy=None):
+        """
+        Anota avance_plan, el mismo cálculo que Proyecto.avance_calculado
+        hecho en SQL (se puede ordenar, filtrar y paginar en la base de
+        datos). Con `real` anota también avance_real: % de tareas cerradas.
+        """
+        hoy = Value(hoy or date.today(), output_field=models.DateField())
+        qs = self.annotate(
+            avance_plan=Case(
+                When(Q(fecha_inicio__isnull=True) | Q(fecha_fin__isnull=True), then=Value(0.0)),
+                When(
+                    fecha_fin__lte=F("fecha_inicio"),
+                    then=Case(When(fecha_fin__lte=hoy, then=Value(100.0)), default=Value(0.0)),
+                ),
+                default=Greatest(
+                    Value(0.0),
+                    Least(
+                        Value(100.0),
+                        Round(
+                            DiasEntre(hoy, F("fecha_inicio")) * 100.0 / DiasEntre(F("fecha_fin"), F("fecha_inicio")),
+                            2,
+                        ),
+                    ),
+                ),
+                output_field=FloatField(),
+            )
+        )
+        if not real:
+            return qs
+
+        def conteo(**filtros):
+            tareas = (
+                Reunion.objects
+                .filter(proyecto=OuterRef("pk"), frente__tipo="tarea", **filtros)
+                .order_by()
+                .values("proyecto")
+                .annotate(n=Count("pk"))
+                .values("n")
+            )
+            return Coalesce(Subquery(tareas, output_field=IntegerField()), 0)
+
+        return qs.annotate(
+            tareas_total=conteo(), tareas_cerradas=conteo(estado="cerrada")
+        ).annotate(
+            avance_real=Case(
+                When(tareas_total=0, then=Value(0.0)),
+                default=Round(F("tareas_cerradas") * 100.0 / F("tareas_total"), 2),
+                output_field=FloatField(),
+            )
+        )
+
+    def atrasados(self):
+        """Proyectos cuyo avance real (tareas cerradas) va por detrás del programado."""
+        if "avance_real" not in self.query.annotations:
+            return self.con_avance(real=True).atrasados()
+        # Sin tareas no hay avance real con el que comparar
+        return self.filter(tareas_total__gt=0, avance_real__lt=F("avance_plan"))
+
+
 class Proyecto(models.Model):
+    objects = ProyectoQuerySet.as_manager()
+
     nombre = models.CharField(max_length=200)
     descripcion = models.TextField(blank=True)
     fecha_inicio = models.DateField(null=True, blank=True)
@@ -56,6 +194,8 @@ class Proyecto(models.Model):
         max_digits=10, decimal_places=2, default=0,
         help_text="Monto de ejecución financiera en millones"
     )
+    # También cambia al modificarse sus reuniones (ver marcar_modificados)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.nombre
@@ -65,6 +205,10 @@ class Proyecto(models.Model):
 
     @property
     def avance_calculado(self):
+        # Ya calculado en la consulta (ProyectoQuerySet.con_avance)
+        anotado = self.__dict__.get("avance_plan")
+        if anotado is not None:
+            return anotado
 
         if not self.fecha_inicio or not self.fecha_fin:
             return 0
@@ -82,6 +226,10 @@ class Proyecto(models.Model):
 
         return max(0, min(100, round(porcentaje, 2)))   
 
+    def avance_tareas(self):
+        """Resumen de avance de todas las tareas del proyecto (ver ReunionQuerySet.resumen_avance)."""
+        return self.reuniones.resumen_avance()
+
 class Frente(models.Model):
     TIPOS = [
         ('actividad', 'Actividad'),
@@ -100,10 +248,202 @@ class Frente(models.Model):
         return self.nombre
 
 
+def _ids_de_parametro(params, nombre):
+    """Ids de un parámetro GET repetido (?x=1&x=2) o separado por comas (?x=1,2)."""
+    valores = params.getlist(nombre) if hasattr(params, "getlist") else [params.get(nombre)]
+    ids = []
+    for valor in valores:
+        for parte in str(valor or "").split(","):
+            try:
+                ids.append(int(parte))
+            except ValueError:
+                continue
+    return ids
+
+
+class ReunionQuerySet(models.QuerySet):
+    """
+    Filtros multivalor con subconsultas EXISTS correlacionadas: no hacen JOIN
+    contra las tablas M2M, así que nunca duplican filas ni rompen los conteos
+    de la paginación.
+    """
+
+    def _exists_m2m(self, relacion, campo, ids, todos):
+        through = Reunion._meta.get_field(relacion).remote_field.through
+        if todos:
+            # Una subconsulta por id: la reunión debe tenerlos todos
+            qs = self
+            for pk in set(ids):
+                qs = qs.filter(Exists(through.objects.filter(reunion_id=OuterRef("pk"), **{campo: pk})))
+            return qs
+        return self.filter(Exists(through.objects.filter(reunion_id=OuterRef("pk"), **{f"{campo}__in": ids})))
+
+    def con_responsables(self, ids, todos=False):
+        """Reuniones con alguno (o todos, si `todos`) de los responsables."""
+        return self._exists_m2m("responsables", "user_id", ids, todos) if ids else self
+
+    def con_etiquetas(self, ids, todos=False):
+        """Reuniones con alguna (o todas, si `todos`) de las etiquetas."""
+        return self._exists_m2m("etiquetas", "etiqueta_id", ids, todos) if ids else self
+
+    def en_grupos(self, ids):
+        """Reuniones de alguno de los grupos de trabajo (FK: basta con IN)."""
+        return self.filter(grupo_trabajo_id__in=ids) if ids else self
+
+    def accesibles_para(self, usuario):
+        """
+        Reuniones cuyos documentos puede descargar `usuario`: miembros del
+        grupo de trabajo, responsables y personal (is_staff).
+        """
+        if usuario.is_staff:
+            return self
+        miembros = GrupoTrabajo.usuarios.through.objects.filter(
+            grupotrabajo_id=OuterRef("grupo_trabajo_id"), user_id=usuario.pk
+        )
+        responsables = Reunion.responsables.through.objects.filter(
+            reunion_id=OuterRef("pk"), user_id=usuario.pk
+        )
+        return self.filter(Exists(miembros) | Exists(responsables))
+
+    def filtrar(self, params):
+        """
+        Aplica los filtros comunes de listados, exportaciones y gráficas:
+        estado, proyecto, frente, responsable, etiqueta y grupo. Los tres
+        últimos admiten varios valores; con responsables_modo=todos o
+        etiquetas_modo=todos se exigen todos en vez de alguno.
+        """
+        qs = self
+        estado = params.get("estado")
+        if estado:
+            qs = qs.filter(estado=estado)
+        proyectos = _ids_de_parametro(params, "proyecto")
+        if proyectos:
+            qs = qs.filter(proyecto_id__in=proyectos)
+        frentes = _ids_de_parametro(params, "frente")
+        if frentes:
+            qs = qs.filter(frente_id__in=frentes)
+        qs = qs.con_responsables(
+            _ids_de_parametro(params, "responsable"),
+            todos=params.get("responsables_modo") == "todos",
+        )
+        qs = qs.con_etiquetas(
+            _ids_de_parametro(params, "etiqueta"),
+            todos=params.get("etiquetas_modo") == "todos",
+        )
+        return qs.en_grupos(_ids_de_parametro(params, "grupo"))
+
+    # --- Árbol actividad → tarea (ver Reunion.ruta) ---
+
+    def descendientes(self, reunion):
+        """Reuniones que cuelgan de `reunion` a cualquier profundidad."""
+        return self.filter(ruta__startswith=reunion.ruta).exclude(pk=reunion.pk)
+
+    def resumen_avance(self):
+        """
+        Avance de las tareas del queryset en una sola consulta: total, conteo
+        por estado, vencidas (no cerradas con fecha de finalización pasada) y
+        porcentaje de tareas cerradas.
+        """
+        vencida = Q(fecha_finalizacion__lt=timezone.now()) & ~Q(estado="cerrada")
+        conteos = self.filter(frente__tipo="tarea").aggregate(
+            total=Count("pk"),
+            vencidas=Count("pk", filter=vencida),
+            **{estado: Count("pk", filter=Q(estado=estado)) for estado, _ in Reunion.ESTADOS},
+        )
+        total = conteos.pop("total")
+        vencidas = conteos.pop("vencidas")
+        return {
+            "total": total,
+            "por_estado": conteos,
+            "vencidas": vencidas,
+            "porcentaje": round(conteos["cerrada"] * 100 / total, 2) if total else 0,
+        }
+
+    def con_avance(self):
+        """
+        Anota en cada reunión el avance de las tareas de su subárbol
+        (tareas_total, tareas_<estado>, tareas_vencidas y avance_tareas en %),
+        con subconsultas por prefijo de ruta: una sola consulta para toda la
+        lista, sin importar la profundidad.
+        """
+        def conteo(*condiciones):
+            tareas = (
+                Reunion.objects
+                .filter(ruta__startswith=OuterRef("ruta"), frente__tipo="tarea", *condiciones)
+                .exclude(pk=OuterRef("pk"))
+                .order_by()
+                # Agrupa por la reunión de fuera: una fila con el total
+                .annotate(raiz=OuterRef("ruta"))
+                .values("raiz")
+                .annotate(n=Count("pk"))
+                .values("n")
+            )
+            return Coalesce(Subquery(tareas, output_field=IntegerField()), 0)
+
+        qs = self.annotate(
+            tareas_total=conteo(),
+            tareas_vencidas=conteo(Q(fecha_finalizacion__lt=timezone.now()) & ~Q(estado="cerrada")),
+            **{f"tareas_{estado}": conteo(Q(estado=estado)) for estado, _ in Reunion.ESTADOS},
+        )
+        return qs.annotate(
+            avance_tareas=Case(
+                When(tareas_total=0, then=Value(0.0)),
+                default=F("tareas_cerrada") * 100.0 / F("tareas_total"),
+                output_field=FloatField(),
+            )
+        )
+
+    def reconstruir_rutas(self):
+        """
+        Recalcula Reunion.ruta de todas las reuniones (datos previos a la
+        columna o modificados con update()/bulk_create, que no pasan por save).
+        Devuelve el número de reuniones actualizadas.
+        """
+        padres = dict(Reunion.objects.values_list("pk", "parent_id"))
+        rutas = {}
+
+        def ruta(pk):
+            if pk not in rutas:
+                cadena, actual = [], pk
+                # Se sube hasta la raíz o hasta un ancestro ya resuelto
+                while actual is not None and actual not in rutas and actual not in cadena:
+                    cadena.append(actual)
+                    actual = padres.get(actual)
+                base = rutas.get(actual, "/")
+                for nodo in reversed(cadena):
+                    base = rutas[nodo] = f"{base}{nodo}/"
+            return rutas[pk]
+
+        cambios = [
+            Reunion(pk=pk, ruta=ruta(pk))
+            for pk, actual in Reunion.objects.values_list("pk", "ruta").iterator()
+            if actual != ruta(pk)
+        ]
+        Reunion.objects.bulk_update(cambios, ["ruta"], batch_size=1000)
+        return len(cambios)
+
+
+# Frente por defecto de Reunion en la caché de Django. Las señales de Frente
+# la borran; con la caché local de cada proceso (LocMemCache) los demás la
+# conservan como mucho FRENTE_DEFECTO_TTL segundos, y si entretanto se borró
+# ese frente Reunion.save() lo detecta y toma el nuevo.
+CLAVE_FRENTE_DEFECTO = "reunion:frente_defecto"
+FRENTE_DEFECTO_TTL = 60
+
+
 def get_default_frente():
-    # Devuelve el Frente con id=1, o crea uno si no existe
-    return Frente.objects.first().id if Frente.objects.exists() else None
+    # Primer Frente (por nombre) o None si no hay ninguno. Se llama por cada
+    # Reunion creada sin frente (formularios, bulk_create...): una consulta
+    # como mucho cada FRENTE_DEFECTO_TTL segundos.
+    return cache.get_or_set(
+        CLAVE_FRENTE_DEFECTO,
+        lambda: Frente.objects.values_list("id", flat=True).first(),
+        FRENTE_DEFECTO_TTL,
+    )
+
 class Reunion(models.Model):
+    objects = ReunionQuerySet.as_manager()
+
     ESTADOS = [
         ('sin_iniciar', 'Sin iniciar'),
         ('en_proceso', 'En proceso'),
@@ -155,6 +495,21 @@ class Reunion(models.Model):
         related_name="reuniones_responsables"
     )
 
+    # Camino materializado "/<raíz>/.../<id>/" mantenido en save(): los
+    # descendientes de una actividad son las reuniones cuya ruta empieza por
+    # la suya (ver ReunionQuerySet.descendientes y con_avance).
+    ruta = models.CharField(max_length=255, blank=True, default="", editable=False, db_index=True)
+
+    # También cambia al modificarse sus intervenciones y comentarios
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Listado de actas por proyecto, más recientes primero (paginación por cursor)
+            models.Index(fields=["proyecto", "-fecha", "-id"], name="reunion_proyecto_fecha_idx"),
+            models.Index(fields=["-fecha", "-id"], name="reunion_fecha_idx"),
+        ]
+
     def clean(self):
         super().clean()
 
@@ -173,10 +528,61 @@ class Reunion(models.Model):
             if self.proyecto and self.parent.proyecto and self.proyecto != self.parent.proyecto:
                 raise ValidationError({"parent": "La actividad padre debe pertenecer al mismo proyecto que la tarea."})
 
+            # el padre no puede colgar de esta misma reunión (ciclo)
+            if self.ruta and self.parent.ruta.startswith(self.ruta):
+                raise ValidationError({"parent": "La actividad padre no puede ser una tarea de esta reunión."})
+
     def save(self, *args, **kwargs):
         # Ejecutar validaciones antes de guardar
-        self.full_clean()
+        try:
+            self.full_clean()
+        except ValidationError as error:
+            if not self._reemplazar_frente_defecto(error):
+                raise
+            self.full_clean()
         super().save(*args, **kwargs)
+        self._actualizar_ruta()
+
+    def _reemplazar_frente_defecto(self, error):
+        """
+        Si la validación falló porque el frente por defecto en caché ya no
+        existe (se borró desde otro proceso), lo cambia por el actual.
+        """
+        if "frente" not in getattr(error, "error_dict", {}) or self.frente_id is None:
+            return False
+        if self.frente_id != cache.get(CLAVE_FRENTE_DEFECTO):
+            return False
+        if Frente.objects.filter(pk=self.frente_id).exists():
+            return False
+        cache.delete(CLAVE_FRENTE_DEFECTO)
+        self.frente_id = get_default_frente()
+        return True
+
+    def _actualizar_ruta(self):
+        """Recalcula la ruta tras guardar y, si cambió de padre, la de su subárbol."""
+        if self.parent_id:
+            base = Reunion.objects.filter(pk=self.parent_id).values_list("ruta", flat=True).first()
+            if not base:
+                # Padre anterior a la columna ruta
+                self.parent._actualizar_ruta()
+                base = self.parent.ruta
+        else:
+            base = "/"
+        nueva = f"{base}{self.pk}/"
+        if nueva == self.ruta:
+            return
+
+        anterior = self.ruta
+        Reunion.objects.filter(pk=self.pk).update(ruta=nueva)
+        if anterior:
+            Reunion.objects.filter(ruta__startswith=anterior).exclude(pk=self.pk).update(
+                ruta=Concat(Value(nueva), Substr("ruta", len(anterior) + 1))
+            )
+        self.ruta = nueva
+
+    def avance(self):
+        """Resumen de avance de las tareas que cuelgan de esta actividad."""
+        return Reunion.objects.descendientes(self).resumen_avance()
 
     def __str__(self):
         proyecto_nombre = getattr(self.proyecto, 'nombre', 'Sin proyecto')
@@ -186,19 +592,51 @@ class Reunion(models.Model):
         proyecto_nombre = getattr(self.proyecto, 'nombre', 'Sin proyecto')
         return f"{self.titulo} — {proyecto_nombre}"
 
-class IntervencionDocumento(models.Model):
+class IntervencionDocumento(MetadatosArchivo):
     intervencion = models.ForeignKey('Intervencion', on_delete=models.CASCADE, related_name='documentos')
-    archivo = models.FileField(upload_to='documentos/intervenciones/', blank=True)
+    archivo = models.FileField(
+        upload_to='documentos/intervenciones/', blank=True, storage=almacenamiento_documentos, db_index=True
+    )
+    nombre = models.CharField(max_length=255, blank=True)
+    nombre_archivo = models.CharField(max_length=255, blank=True)
+
+    def __str__(self):
+        return self.nombre or self.nombre_archivo or self.archivo.name
+
+class SubidaParcial(models.Model):
+    """
+    Subida por partes del documento de una intervención nueva (ver
+    subidas.py). Los bytes se van escribiendo en un archivo temporal;
+    `recibido` es el desplazamiento desde el que el cliente debe continuar.
+    La intervención (`contenido`, de `usuario`) se crea al completarse, así
+    una subida abandonada no deja intervenciones sin su documento.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    reunion = models.ForeignKey('Reunion', on_delete=models.CASCADE, related_name='subidas')
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='subidas')
+    contenido = models.TextField()
+    nombre_archivo = models.CharField(max_length=255)
     nombre = models.CharField(max_length=255, blank=True)
+    tamano = models.BigIntegerField()
+    recibido = models.BigIntegerField(default=0)
+    creada = models.DateTimeField(auto_now_add=True)
+    actualizada = models.DateTimeField(default=timezone.now, db_index=True)
 
     def __str__(self):
-        return self.nombre or self.archivo.name
+        return f"{self.nombre_archivo} ({self.recibido}/{self.tamano})"
 
 class Intervencion(models.Model):
     reunion = models.ForeignKey('Reunion', on_delete=models.CASCADE, related_name='intervenciones')
     autor = models.ForeignKey(User, on_delete=models.CASCADE)
     contenido = models.TextField()
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Hilo de la reunión por páginas, más recientes primero (cursor)
+            models.Index(fields=["reunion", "-fecha_creacion", "-id"], name="intervencion_reunion_idx"),
+        ]
 
     def __str__(self):
         return f"{self.autor.username} en {self.reunion.titulo}"
@@ -207,12 +645,88 @@ class Comentario(models.Model):
     intervencion = models.ForeignKey(Intervencion, related_name='comentarios', on_delete=models.CASCADE)
     autor = models.ForeignKey(User, on_delete=models.CASCADE)
     contenido = models.TextField()
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["intervencion", "-fecha_creacion", "-id"], name="comentario_intervencion_idx"),
+        ]
 
     def __str__(self):
         return f'Comentario de {self.autor} en {self.intervencion}'
 
 
+class DocumentoBiblioteca(models.Model):
+    """
+    Índice de la biblioteca de documentos (DocumentosView): una fila por
+    documento de reunión (y por reunión a la que está adjunto) y por
+    documento de intervención, con copia de proyecto, frente, fecha y
+    categoría para filtrar y paginar sin unir las tablas de origen. Lo
+    mantienen las señales (biblioteca.py); `reconstruir_biblioteca` lo
+    regenera entero.
+    """
+    ORIGENES = [
+        ('reunion', 'Documento de reunión'),
+        ('intervencion', 'Documento de intervención'),
+    ]
+    CATEGORIAS = [
+        ("pdf", "PDF"),
+        ("imagen", "Imagen"),
+        ("hoja", "Hoja de cálculo"),
+        ("texto", "Texto"),
+        ("presentacion", "Presentación"),
+        ("multimedia", "Audio y video"),
+        ("comprimido", "Comprimido"),
+        ("otro", "Otro"),
+    ]
+
+    origen = models.CharField(max_length=20, choices=ORIGENES)
+    documento = models.ForeignKey(
+        Documento, on_delete=models.CASCADE, null=True, blank=True, related_name='entradas_biblioteca'
+    )
+    documento_intervencion = models.OneToOneField(
+        IntervencionDocumento, on_delete=models.CASCADE, null=True, blank=True, related_name='entrada_biblioteca'
+    )
+    reunion = models.ForeignKey('Reunion', on_delete=models.CASCADE, related_name='+')
+    intervencion = models.ForeignKey('Intervencion', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    proyecto = models.ForeignKey('Proyecto', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    frente = models.ForeignKey('Frente', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    nombre = models.CharField(max_length=255, blank=True)
+    categoria = models.CharField(max_length=20, choices=CATEGORIAS)
+    fecha = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-fecha", "-id"], name="biblioteca_fecha_idx"),
+            models.Index(fields=["proyecto", "-fecha", "-id"], name="biblioteca_proyecto_idx"),
+            models.Index(fields=["frente", "-fecha", "-id"], name="biblioteca_frente_idx"),
+            models.Index(fields=["categoria", "-fecha", "-id"], name="biblioteca_categoria_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["documento", "reunion"], name="biblioteca_documento_reunion"),
+        ]
+
+    def __str__(self):
+        return self.nombre
+
+
+def marcar_modificados(intervencion_id=None, reunion_ids=()):
+    """
+    Propaga updated_at hacia arriba: intervención → reunión → proyecto, para
+    que los validadores HTTP de sus páginas y descargas (condicional.py)
+    cambien. Un UPDATE por nivel, sin save() ni señales.
+    """
+    ahora = timezone.now()
+    if intervencion_id is not None:
+        Intervencion.objects.filter(pk=intervencion_id).update(updated_at=ahora)
+        reuniones = Reunion.objects.filter(intervenciones=intervencion_id)
+    else:
+        reuniones = Reunion.objects.filter(pk__in=reunion_ids)
+    reuniones.update(updated_at=ahora)
+    Proyecto.objects.filter(reuniones__in=reuniones.values("pk")).update(updated_at=ahora)
+
+
 class GraphMailConfig(models.Model):
     nombre = models.CharField(
         max_length=100,
@@ -237,6 +751,29 @@ class GraphMailConfig(models.Model):
         verbose_name = "Configuración Graph Mail"
         verbose_name_plural = "Configuraciones Graph Mail"
 
+class EnvioResumenVencimientos(models.Model):
+    """
+    Marca de idempotencia del resumen diario de vencimientos (comando
+    enviar_resumen_vencimientos): una fila por usuario y día. `lote` y
+    `reclamado` indican que una ejecución lo está enviando; `enviado`, que
+    Graph lo aceptó y no debe volver a enviarse.
+    """
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="resumenes_vencimientos"
+    )
+    fecha = models.DateField()
+    lote = models.UUIDField(null=True, blank=True)
+    reclamado = models.DateTimeField(null=True, blank=True)
+    enviado = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["usuario", "fecha"], name="resumen_vencimientos_unico"),
+        ]
+
+    def __str__(self):
+        return f"Resumen {self.fecha} → {self.usuario_id}"
+
 class KeycloakProfile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="kc_profile")
     keycloak_id = models.CharField("Keycloak ID (sub)", max_length=255, unique=True, db_index=True)
@@ -0,0 +1,119 @@
+# mi_aplicacion/paginacion.py
+# Paginación por cursor (keyset): en lugar de OFFSET/COUNT se continúa desde
+# el último registro mostrado, así el costo de cada página no crece con el
+# número de páginas ni con el tamaño de la tabla.
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections, models
+from django.db.models import F, Q
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.functional import cached_property
+
+
+def codificar_cursor(valor, pk):
+    datos = json.dumps([valor.isoformat() if hasattr(valor, "isoformat") else valor, pk])
+    return base64.urlsafe_b64encode(datos.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor, campo=None):
+    """
+    Devuelve (valor, pk) o None si el cursor no es válido. Con `campo` (el
+    campo del modelo por el que se pagina) el valor se convierte a su tipo y
+    un valor que no lo es invalida el cursor (?despues= manipulado).
+    """
+    if not cursor:
+        return None
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if not isinstance(datos, list):
+            return None
+        valor, pk = datos
+        pk = int(pk)
+        if campo is not None and valor is not None:
+            valor = _valor_de_campo(campo, valor)
+            if valor is None:
+                return None
+    except (ValueError, TypeError, ValidationError):
+        return None
+    return valor, pk
+
+
+def _valor_de_campo(campo, valor):
+    if not isinstance(valor, str):
+        return None
+    if isinstance(campo, models.DateTimeField):
+        return parse_datetime(valor)
+    if isinstance(campo, models.DateField):
+        return parse_date(valor)
+    return campo.to_python(valor)
+
+
+def pagina_por_cursor(queryset, cursor, tamano, campo="fecha"):
+    """
+    Página de `tamano` objetos ordenados por `campo` descendente (nulos al
+    final) y pk descendente, continuando después de `cursor`.
+
+    Devuelve (objetos, siguiente_cursor); siguiente_cursor es None en la
+    última página.
+    """
+    queryset = queryset.order_by(F(campo).desc(nulls_last=True), "-pk")
+
+    # Un cursor inválido lleva a la primera página
+    posicion = decodificar_cursor(cursor, queryset.model._meta.get_field(campo))
+    if posicion:
+        valor, pk = posicion
+        if valor is None:
+            queryset = queryset.filter(**{f"{campo}__isnull": True, "pk__lt": pk})
+        else:
+            queryset = queryset.filter(
+                Q(**{f"{campo}__lt": valor})
+                | Q(**{campo: valor, "pk__lt": pk})
+                | Q(**{f"{campo}__isnull": True})
+            )
+
+    # Se pide un objeto de más para saber si hay otra página sin usar COUNT
+    objetos = list(queryset[:tamano + 1])
+    siguiente = None
+    if len(objetos) > tamano:
+        objetos = objetos[:tamano]
+        ultimo = objetos[-1]
+        siguiente = codificar_cursor(getattr(ultimo, campo), ultimo.pk)
+    return objetos, siguiente
+
+
+class ConteoEstimadoPaginator(Paginator):
+    """
+    Paginator para listados sin filtrar de tablas grandes (changelists del
+    admin): en PostgreSQL toma el número de filas de las estadísticas del
+    planificador (pg_class.reltuples) en vez de hacer COUNT(*) sobre toda la
+    tabla. Con filtros, o si la estimación es pequeña, cuenta normalmente.
+    """
+
+    # Por debajo de este tamaño el COUNT(*) es barato y exacto
+    MINIMO_ESTIMADO = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is not None and not query.has_filters():
+            estimado = self._estimar(self.object_list)
+            if estimado is not None and estimado >= self.MINIMO_ESTIMADO:
+                return estimado
+        return super().count
+
+    @staticmethod
+    def _estimar(queryset):
+        conexion = connections[queryset.db]
+        if conexion.vendor != "postgresql":
+            return None
+        with conexion.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                [queryset.model._meta.db_table],
+            )
+            fila = cursor.fetchone()
+        return fila[0] if fila and fila[0] and fila[0] > 0 else None
@@ -0,0 +1,174 @@
+# mi_aplicacion/reportes/actas_zip.py
+# Exportación de todas las actas de un proyecto en un ZIP. Las actas se
+# renderizan en paralelo en un pool de procesos y el ZIP se va enviando a
+# medida que cada una termina. Cada PDF se guarda en una caché direccionada
+# por el hash de su contenido, así las actas sin cambios no se vuelven a generar.
+#
+# El pool es uno por proceso web y lo comparten todas las descargas: con
+# varias exportaciones a la vez se encolan las actas, no los procesos.
+import hashlib
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.db.models import Prefetch
+
+from ..models import Comentario, Intervencion
+from .trabajador import inicializar_proceso, renderizar_acta_en_cache
+
+# Cambiar al modificar el diseño del acta para invalidar la caché
+VERSION_ACTA = "1"
+
+TAMANO_BLOQUE = 64 * 1024
+
+# Reuniones leídas por consulta (con sus intervenciones y comentarios)
+TAMANO_LOTE = 100
+
+_pool = None
+_cerrojo_pool = threading.Lock()
+
+
+def _pool_render(roto=None):
+    """Pool compartido; se crea al primer uso y se rehace si `roto` es el actual."""
+    global _pool
+    with _cerrojo_pool:
+        if _pool is None or _pool is roto:
+            _pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, "ACTAS_ZIP_PROCESOS", 2),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=inicializar_proceso,
+            )
+        return _pool
+
+
+def _encargar(*args):
+    pool = _pool_render()
+    try:
+        return pool.submit(renderizar_acta_en_cache, *args)
+    except BrokenProcessPool:
+        # Un proceso murió (p. ej. sin memoria): el pool ya no acepta trabajo
+        return _pool_render(roto=pool).submit(renderizar_acta_en_cache, *args)
+
+
+def directorio_cache():
+    return getattr(settings, "ACTAS_PDF_CACHE_DIR", os.path.join(settings.BASE_DIR, "cache", "actas"))
+
+
+def con_contenido_acta(reuniones):
+    """Carga con `reuniones` lo que lee firma_acta, en vez de dos consultas por reunión."""
+    return reuniones.select_related("proyecto", "frente").prefetch_related(
+        Prefetch("intervenciones", queryset=Intervencion.objects.select_related("autor").order_by("pk")),
+        Prefetch("intervenciones__comentarios", queryset=Comentario.objects.select_related("autor").order_by("pk")),
+    )
+
+
+def firma_acta(reunion):
+    """
+    Hash del contenido que aparece en el acta de la reunión. Lee las
+    intervenciones y comentarios precargados (con_contenido_acta).
+    """
+    h = hashlib.sha256()
+
+    def agregar(*valores):
+        h.update(repr(valores).encode("utf-8"))
+
+    agregar(
+        VERSION_ACTA,
+        reunion.pk,
+        reunion.titulo,
+        reunion.fecha,
+        reunion.proyecto.nombre if reunion.proyecto else "",
+        reunion.frente.nombre if reunion.frente else "",
+        reunion.estado,
+        reunion.descripcion,
+    )
+    intervenciones = reunion.intervenciones.all()
+    for i in intervenciones:
+        agregar("i", i.pk, i.contenido, i.autor.first_name, i.autor.last_name)
+    for i in intervenciones:
+        for c in i.comentarios.all():
+            agregar("c", i.pk, c.pk, c.contenido, c.autor.first_name, c.autor.last_name)
+    return h.hexdigest()
+
+
+def ruta_en_cache(firma):
+    return os.path.join(directorio_cache(), firma[:2], f"{firma}.pdf")
+
+
+class _BufferSalida:
+    """Destino de escritura del ZIP que se vacía tras cada bloque enviado."""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def reuniones_del_proyecto(proyecto, params=None, desde=None, hasta=None, usuario=None):
+    """
+    Reuniones del proyecto con los filtros de los listados y el rango de
+    fechas y, con `usuario`, solo las que puede ver (accesibles_para).
+    """
+    reuniones = proyecto.reuniones.select_related("proyecto", "frente").order_by("fecha", "pk")
+    if usuario is not None:
+        reuniones = reuniones.accesibles_para(usuario)
+    if params:
+        reuniones = reuniones.filtrar(params)
+    if desde:
+        reuniones = reuniones.filter(fecha__date__gte=desde)
+    if hasta:
+        reuniones = reuniones.filter(fecha__date__lte=hasta)
+    return reuniones
+
+
+def generar_zip_actas(reuniones):
+    """
+    Genera el ZIP por bloques de bytes. Las actas en caché se envían de
+    inmediato y el resto a medida que el pool las termina.
+    """
+    salida = _BufferSalida()
+    pendientes = {}
+
+    with zipfile.ZipFile(salida, mode="w", compression=zipfile.ZIP_STORED) as zf:
+
+        def agregar(nombre, ruta):
+            # Los PDF ya van comprimidos, se guardan tal cual
+            with open(ruta, "rb") as origen, zf.open(nombre, mode="w", force_zip64=True) as destino:
+                while True:
+                    bloque = origen.read(TAMANO_BLOQUE)
+                    if not bloque:
+                        break
+                    destino.write(bloque)
+                    yield salida.vaciar()
+
+        try:
+            for reunion in con_contenido_acta(reuniones).iterator(chunk_size=TAMANO_LOTE):
+                nombre = f"Informe_{reunion.id}.pdf"
+                ruta = ruta_en_cache(firma_acta(reunion))
+                if os.path.exists(ruta):
+                    yield from agregar(nombre, ruta)
+                    continue
+                pendientes[_encargar(reunion.id, ruta)] = nombre
+
+            for futuro in as_completed(pendientes):
+                yield from agregar(pendientes[futuro], futuro.result())
+        finally:
+            # Si el cliente corta la descarga no se siguen renderizando sus actas
+            for futuro in pendientes:
+                futuro.cancel()
+
+    yield salida.vaciar()
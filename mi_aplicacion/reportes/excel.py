@@ -0,0 +1,59 @@
+# mi_aplicacion/reportes/excel.py
+# Se importa solo desde las vistas de exportación para no cargar openpyxl
+# en cada worker al arrancar.
+from datetime import date
+
+import openpyxl
+
+
+def generar_reuniones_excel(reuniones, destino):
+    """Escribe en `destino` el libro .xlsx con las reuniones recibidas."""
+    # Crear libro y hoja
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Actividades"
+
+    # Encabezados
+    ws.append([
+        "ID", "Título", "Proyecto", "Frente", "Grupo",
+        "Fecha Inicio", "Fecha Finalización", "Estado",
+        "Etiquetas", "Descripción", "Vencido", "Tiempo Restante"
+    ])
+
+    # Filas con datos
+    for r in reuniones:
+        etiquetas_texto = ", ".join(str(e) for e in r.etiquetas.all())
+
+        # Valores por defecto
+        vencido = "N/A"
+        tiempo_texto = ""
+
+        if r.fecha_finalizacion:
+            dias_restantes = (r.fecha_finalizacion.date() - date.today()).days
+
+            if dias_restantes < 0:
+                vencido = "Sí"
+                tiempo_texto = f"Vencido hace {abs(dias_restantes)} días"
+            elif dias_restantes == 0:
+                vencido = "No"
+                tiempo_texto = "Vence hoy"
+            else:
+                vencido = "No"
+                tiempo_texto = f"Faltan {dias_restantes} días"
+
+        ws.append([
+            r.id,
+            r.titulo,
+            r.proyecto.nombre if r.proyecto else "",
+            r.frente.nombre if r.frente else "",
+            r.grupo_trabajo.nombre if r.grupo_trabajo else "",
+            r.fecha.strftime("%d/%m/%Y") if r.fecha else "",
+            r.fecha_finalizacion.strftime("%d/%m/%Y") if r.fecha_finalizacion else "",
+            r.estado,
+            etiquetas_texto,
+            r.descripcion or "",
+            vencido,
+            tiempo_texto,
+        ])
+
+    wb.save(destino)
@@ -0,0 +1,235 @@
+# mi_aplicacion/reportes/flujos.py
+# Exportaciones masivas en CSV y JSON Lines para procesos de BI. Las filas se
+# leen con un cursor del lado del servidor (iterator) y se envían a medida que
+# se generan, opcionalmente comprimidas con gzip; la memoria no depende del
+# número de filas. Bajo ASGI se usan las variantes asíncronas (a*, en_hilo).
+import asyncio
+import csv
+import json
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from django.db import connections
+
+from ..models import Comentario, Intervencion, Reunion
+
+# Filas por lote leídas del cursor del servidor
+TAMANO_LOTE = 2000
+
+# Filas agrupadas en cada bloque enviado al cliente
+FILAS_POR_BLOQUE = 500
+
+# Columnas exportadas (nombre en el archivo, lookup del ORM) y prefijo para
+# llegar a la reunión desde cada modelo al aplicar los filtros.
+EXPORTABLES = {
+    "reuniones": {
+        "modelo": Reunion,
+        "prefijo_reunion": "",
+        "columnas": [
+            ("id", "id"),
+            ("titulo", "titulo"),
+            ("proyecto_id", "proyecto_id"),
+            ("proyecto", "proyecto__nombre"),
+            ("frente_id", "frente_id"),
+            ("frente", "frente__nombre"),
+            ("grupo_trabajo", "grupo_trabajo__nombre"),
+            ("parent_id", "parent_id"),
+            ("estado", "estado"),
+            ("fecha", "fecha"),
+            ("fecha_finalizacion", "fecha_finalizacion"),
+            ("descripcion", "descripcion"),
+        ],
+    },
+    "intervenciones": {
+        "modelo": Intervencion,
+        "prefijo_reunion": "reunion__",
+        "columnas": [
+            ("id", "id"),
+            ("reunion_id", "reunion_id"),
+            ("reunion", "reunion__titulo"),
+            ("autor_id", "autor_id"),
+            ("autor", "autor__username"),
+            ("fecha_creacion", "fecha_creacion"),
+            ("contenido", "contenido"),
+        ],
+    },
+    "comentarios": {
+        "modelo": Comentario,
+        "prefijo_reunion": "intervencion__reunion__",
+        "columnas": [
+            ("id", "id"),
+            ("intervencion_id", "intervencion_id"),
+            ("reunion_id", "intervencion__reunion_id"),
+            ("autor_id", "autor_id"),
+            ("autor", "autor__username"),
+            ("fecha_creacion", "fecha_creacion"),
+            ("contenido", "contenido"),
+        ],
+    },
+}
+
+FORMATOS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def filtrar_por_reunion(queryset, params, prefijo="", usuario=None):
+    """
+    Aplica los filtros de las vistas (ver ReunionQuerySet.filtrar) y, con
+    `usuario`, se queda con lo de las reuniones a las que tiene acceso
+    (ReunionQuerySet.accesibles_para). Para intervenciones y comentarios se
+    filtra por las reuniones que cumplen, con una subconsulta, sin
+    multiplicar filas por responsable o etiqueta.
+    """
+    if not prefijo:
+        if usuario is not None:
+            queryset = queryset.accesibles_para(usuario)
+        return queryset.filtrar(params)
+    reuniones = Reunion.objects.all()
+    if usuario is not None:
+        reuniones = reuniones.accesibles_para(usuario)
+    reuniones = reuniones.filtrar(params)
+    if reuniones.query.has_filters():
+        queryset = queryset.filter(**{f"{prefijo}in": reuniones.values("pk")})
+    return queryset
+
+
+def _queryset(nombre, params, usuario=None):
+    definicion = EXPORTABLES[nombre]
+    queryset = filtrar_por_reunion(
+        definicion["modelo"].objects.all(), params, definicion["prefijo_reunion"], usuario
+    )
+    return queryset.order_by("pk")
+
+
+def _lookups(nombre):
+    return [lookup for _, lookup in EXPORTABLES[nombre]["columnas"]]
+
+
+def filas(nombre, params, usuario=None):
+    """Tuplas con los valores de las columnas, leídas por lotes."""
+    return _queryset(nombre, params, usuario).values_list(*_lookups(nombre)).iterator(chunk_size=TAMANO_LOTE)
+
+
+async def afilas(nombre, params, usuario=None):
+    """Como filas(), con el ORM asíncrono (para servir bajo ASGI)."""
+    lookups = _lookups(nombre)
+    # values() y no values_list(): en Django 4.2 values_list().aiterator()
+    # abre el cursor desde el event loop y falla (SynchronousOnlyOperation)
+    async for fila in _queryset(nombre, params, usuario).values(*lookups).aiterator(chunk_size=TAMANO_LOTE):
+        yield tuple(fila[lookup] for lookup in lookups)
+
+
+def _valor(valor):
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return valor
+
+
+class _Eco:
+    """Pseudo-archivo para csv.writer: devuelve lo escrito en vez de guardarlo."""
+
+    def write(self, valor):
+        return valor
+
+
+def _formato(nombre, formato):
+    """(cabecera, linea): líneas iniciales del archivo y conversión de cada fila."""
+    columnas = [columna for columna, _ in EXPORTABLES[nombre]["columnas"]]
+    if formato == "csv":
+        escritor = csv.writer(_Eco())
+        return [escritor.writerow(columnas)], lambda fila: escritor.writerow([_valor(v) for v in fila])
+    return [], lambda fila: json.dumps(dict(zip(columnas, map(_valor, fila))), ensure_ascii=False) + "\n"
+
+
+class _Salida:
+    """
+    Agrupa las líneas en bloques de FILAS_POR_BLOQUE y, con gzip, los
+    comprime al vuelo. agregar() y cerrar() devuelven los bytes a enviar
+    (vacío si aún no hay un bloque completo).
+    """
+
+    def __init__(self, gzip=False):
+        self._lineas = []
+        self._compresor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+
+    def agregar(self, linea):
+        self._lineas.append(linea)
+        if len(self._lineas) >= FILAS_POR_BLOQUE:
+            return self._vaciar()
+        return b""
+
+    def cerrar(self):
+        datos = self._vaciar()
+        if self._compresor is not None:
+            datos += self._compresor.flush()
+        return datos
+
+    def _vaciar(self):
+        bloque = "".join(self._lineas).encode("utf-8")
+        self._lineas = []
+        if self._compresor is not None:
+            return self._compresor.compress(bloque)
+        return bloque
+
+
+def generar_exportacion(nombre, formato, params, gzip=False, usuario=None):
+    cabecera, linea = _formato(nombre, formato)
+    salida = _Salida(gzip)
+    for texto in cabecera:
+        salida.agregar(texto)
+    for fila in filas(nombre, params, usuario):
+        datos = salida.agregar(linea(fila))
+        if datos:
+            yield datos
+    yield salida.cerrar()
+
+
+async def agenerar_exportacion(nombre, formato, params, gzip=False, usuario=None):
+    """
+    generar_exportacion() para ASGI: Django 4.2 convierte en lista los
+    iteradores síncronos de StreamingHttpResponse antes de enviarlos bajo
+    ASGI, así que allí hace falta un generador asíncrono para enviar por bloques.
+    """
+    cabecera, linea = _formato(nombre, formato)
+    salida = _Salida(gzip)
+    for texto in cabecera:
+        salida.agregar(texto)
+    async for fila in afilas(nombre, params, usuario):
+        datos = salida.agregar(linea(fila))
+        if datos:
+            yield datos
+    yield salida.cerrar()
+
+
+_FIN = object()
+
+
+async def en_hilo(iterable):
+    """
+    Recorre un iterable síncrono (que consulta la base de datos o renderiza)
+    en un hilo propio y entrega sus elementos al event loop a medida que se
+    generan. Todo el recorrido usa el mismo hilo, y por tanto la misma
+    conexión, que se cierra al terminar.
+    """
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=1) as hilo:
+        iterador = await loop.run_in_executor(hilo, iter, iterable)
+        try:
+            while True:
+                elemento = await loop.run_in_executor(hilo, next, iterador, _FIN)
+                if elemento is _FIN:
+                    break
+                yield elemento
+        finally:
+            await loop.run_in_executor(hilo, _cerrar, iterador)
+
+
+def _cerrar(iterador):
+    try:
+        if hasattr(iterador, "close"):
+            iterador.close()
+    finally:
+        connections.close_all()
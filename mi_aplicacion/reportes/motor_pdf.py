@@ -0,0 +1,248 @@
+# mi_aplicacion/reportes/motor_pdf.py
+# Motor común de los informes PDF: estilos, imágenes de encabezado/pie y
+# plantillas de página se preparan una sola vez por proceso; cada informe
+# solo aporta sus flowables.
+import tempfile
+from functools import lru_cache
+from itertools import islice
+
+from django.contrib.staticfiles import finders
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, TableStyle
+
+MARGEN_IZQUIERDO = 2 * cm
+MARGEN_DERECHO = 2 * cm
+MARGEN_SUPERIOR = 5 * cm
+MARGEN_INFERIOR = 3 * cm
+
+FORMA_ENCABEZADO_PIE = "encabezado_pie"
+
+# Flowables que se mantienen cargados por delante de lo que platypus consume
+VENTANA_FLOWABLES = 200
+
+
+@lru_cache(maxsize=None)
+def estilos():
+    """Estilos de párrafo compartidos por todos los informes."""
+    base = getSampleStyleSheet()
+    return {
+        "Title": base["Title"],
+        "Normal": base["Normal"],
+        "Heading2": base["Heading2"],
+        "Titulo": ParagraphStyle(
+            name="Titulo",
+            fontSize=16,
+            leading=18,
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            fontName="Helvetica-Bold"
+        ),
+        "Subtitulo": ParagraphStyle(
+            name="Subtitulo",
+            fontSize=12,
+            leading=14,
+            spaceAfter=6,
+            alignment=TA_LEFT,
+            fontName="Helvetica-Bold"
+        ),
+        "Texto": ParagraphStyle(
+            name="Texto",
+            fontSize=10,
+            leading=12,
+            spaceAfter=4,
+            alignment=TA_JUSTIFY
+        ),
+        "Intervencion": ParagraphStyle(
+            name="Intervencion",
+            fontSize=10,
+            leading=14,
+            spaceAfter=6,
+            alignment=TA_JUSTIFY
+        ),
+        # Comentario dentro del acta de una reunión
+        "ComentarioActa": ParagraphStyle(
+            name="ComentarioActa",
+            fontSize=10,
+            leading=12,
+            leftIndent=1 * cm,
+            spaceAfter=4,
+            alignment=TA_JUSTIFY,
+            fontName="Helvetica-Oblique"
+        ),
+        # Comentario dentro del informe de proyecto
+        "Comentario": ParagraphStyle(
+            name="Comentario",
+            fontSize=9,
+            leading=12,
+            leftIndent=2 * cm,   # Más indentado respecto a intervención
+            spaceAfter=4,
+            textColor=colors.HexColor("#228B22"),  # Verde
+            fontName="Helvetica-Oblique"
+        ),
+        "Actividad": ParagraphStyle(
+            name="Actividad",
+            fontSize=13,
+            leading=16,
+            spaceBefore=12,
+            spaceAfter=8,
+            alignment=TA_LEFT,
+            textColor=colors.HexColor("#1F4E79"),  # Azul oscuro
+            fontName="Helvetica-Bold"
+        ),
+        "Tarea": ParagraphStyle(
+            name="Tarea",
+            fontSize=11,
+            leading=14,
+            leftIndent=1 * cm,   # Indentado respecto a actividad
+            spaceBefore=6,
+            spaceAfter=4,
+            textColor=colors.HexColor("#2E75B6"),  # Azul más claro
+            fontName="Helvetica-Bold"
+        ),
+    }
+
+
+@lru_cache(maxsize=None)
+def estilos_tabla():
+    """Estilos de tabla (cajas de tarea, intervención y comentario)."""
+    def caja(borde, color_borde, fondo, relleno_h, relleno_v):
+        return TableStyle([
+            ("BOX", (0, 0), (-1, -1), borde, color_borde),
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor(fondo)),
+            ("LEFTPADDING", (0, 0), (-1, -1), relleno_h),
+            ("RIGHTPADDING", (0, 0), (-1, -1), relleno_h),
+            ("TOPPADDING", (0, 0), (-1, -1), relleno_v),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), relleno_v),
+        ])
+
+    return {
+        "Tarea": caja(0.8, colors.grey, "#E9F2FB", 6, 4),               # Encabezado azul claro
+        "Intervencion": caja(0.5, colors.lightgrey, "#FFF2CC", 5, 3),   # Fondo amarillo claro en autor
+        "Comentario": caja(0.5, colors.lightgrey, "#EBF7E3", 5, 3),     # Verde muy suave
+    }
+
+
+@lru_cache(maxsize=None)
+def recursos():
+    """Banner y pie decodificados una sola vez (None si no existen)."""
+    def cargar(ruta_estatica):
+        ruta = finders.find(ruta_estatica)
+        return ImageReader(ruta) if ruta else None
+
+    return {
+        "banner": cargar("img/banner.png"),
+        "footer": cargar("img/footer.png"),
+    }
+
+
+def encabezado_pie(canvas, doc):
+    """
+    Dibuja banner y pie. Las imágenes se definen una vez por documento como
+    form XObject y en cada página solo se referencian.
+    """
+    if not getattr(canvas, "_forma_encabezado_pie", False):
+        imagenes = recursos()
+        canvas.beginForm(FORMA_ENCABEZADO_PIE)
+        if imagenes["banner"]:
+            canvas.drawImage(imagenes["banner"], x=0, y=A4[1] - 4 * cm, width=A4[0], height=3 * cm)
+        if imagenes["footer"]:
+            canvas.drawImage(imagenes["footer"], x=0, y=0, width=A4[0], height=2 * cm)
+        canvas.endForm()
+        canvas._forma_encabezado_pie = True
+    canvas.doForm(FORMA_ENCABEZADO_PIE)
+
+
+def plantillas_pagina():
+    """
+    Plantillas de página de los informes. Frame y PageTemplate guardan estado
+    mientras se construye un documento, por eso se crean por documento; lo
+    costoso (estilos e imágenes) ya está cacheado.
+    """
+    marco = Frame(
+        MARGEN_IZQUIERDO,
+        MARGEN_INFERIOR,
+        A4[0] - MARGEN_IZQUIERDO - MARGEN_DERECHO,
+        A4[1] - MARGEN_SUPERIOR - MARGEN_INFERIOR,
+        id="contenido",
+    )
+    return [PageTemplate(id="informe", frames=[marco], onPage=encabezado_pie, pagesize=A4)]
+
+
+def crear_documento(destino, **kwargs):
+    return BaseDocTemplate(
+        destino,
+        pagesize=A4,
+        rightMargin=MARGEN_DERECHO,
+        leftMargin=MARGEN_IZQUIERDO,
+        topMargin=MARGEN_SUPERIOR,
+        bottomMargin=MARGEN_INFERIOR,
+        pageTemplates=plantillas_pagina(),
+        **kwargs
+    )
+
+
+class FlujoPerezoso(list):
+    """
+    Lista de flowables que se llena desde un iterable a medida que platypus
+    la consume (build() solo mira el frente de la lista), de modo que nunca
+    hay más de VENTANA_FLOWABLES elementos pendientes en memoria.
+    """
+
+    def __init__(self, iterable, ventana=VENTANA_FLOWABLES):
+        super().__init__()
+        self._fuente = iter(iterable)
+        self._ventana = ventana
+
+    def _rellenar(self, minimo=0):
+        # Se rellena por tandas, cuando queda menos de media ventana
+        pendientes = list.__len__(self)
+        if self._fuente is None or (pendientes > minimo and pendientes >= self._ventana // 2):
+            return
+        faltan = max(minimo, self._ventana) - pendientes
+        nuevos = list(islice(self._fuente, faltan))
+        if len(nuevos) < faltan:
+            self._fuente = None
+        self.extend(nuevos)
+
+    def __len__(self):
+        self._rellenar()
+        return list.__len__(self)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, indice):
+        if isinstance(indice, int) and indice >= 0:
+            self._rellenar(indice + 1)
+        return list.__getitem__(self, indice)
+
+
+def renderizar(destino, elementos, **kwargs):
+    """
+    Construye el PDF en `destino` a partir de los flowables recibidos. Si
+    `elementos` es un generador se consume de forma perezosa.
+    """
+    if not isinstance(elementos, list):
+        elementos = FlujoPerezoso(elementos)
+    crear_documento(destino, **kwargs).build(elementos)
+
+
+def renderizar_temporal(elementos, **kwargs):
+    """
+    Renderiza en un archivo temporal (se borra al cerrarse) posicionado al
+    inicio, listo para enviarse con FileResponse sin cargarlo en memoria.
+    """
+    archivo = tempfile.TemporaryFile(suffix=".pdf")
+    try:
+        renderizar(archivo, elementos, **kwargs)
+    except Exception:
+        archivo.close()
+        raise
+    archivo.seek(0)
+    return archivo
@@ -0,0 +1,225 @@
+# mi_aplicacion/reportes/pdf.py
+# Se importa solo desde las vistas de PDF para no cargar reportlab
+# en cada worker al arrancar.
+#
+# Los informes se describen como generadores de flowables que leen la base
+# de datos por lotes; motor_pdf los consume de forma perezosa, así la memoria
+# no crece con el historial del proyecto.
+from django.db.models import Prefetch
+
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.platypus import HRFlowable, Paragraph, Spacer, Table
+
+from ..models import Comentario, Reunion
+from .motor_pdf import estilos, estilos_tabla, renderizar, renderizar_temporal
+
+# Filas leídas por consulta al recorrer actividades, tareas e intervenciones
+TAMANO_LOTE = 500
+
+
+def _intervenciones(reunion):
+    """Intervenciones de la reunión (con autor y comentarios) leídas por lotes."""
+    return (
+        reunion.intervenciones
+        .select_related("autor")
+        .prefetch_related(
+            Prefetch("comentarios", queryset=Comentario.objects.select_related("autor").order_by("pk"))
+        )
+        .order_by("pk")
+        .iterator(chunk_size=TAMANO_LOTE)
+    )
+
+
+def elementos_acta(reunion):
+    """Flowables del acta (informe de actividad) de una reunión."""
+    styles = estilos()
+
+    # Encabezado del contenido
+    yield Spacer(1, 12)
+    yield Paragraph("<b>Informe de actividad</b>", styles["Title"])
+    yield Spacer(1, 12)
+
+    # Datos generales
+    yield Paragraph(f"<b>Título:</b> {reunion.titulo}", styles["Normal"])
+    fecha_str = reunion.fecha.strftime('%d/%m/%Y') if reunion.fecha else "Sin fecha"
+    yield Paragraph(f"<b>Fecha:</b> {fecha_str}", styles["Normal"])
+    yield Paragraph(f"<b>Proyecto:</b> {reunion.proyecto.nombre if reunion.proyecto else ''}", styles["Normal"])
+    yield Paragraph(f"<b>Frente:</b> {reunion.frente.nombre if reunion.frente else ''}", styles["Normal"])
+    yield Paragraph(f"<b>Estado:</b> {reunion.estado}", styles["Normal"])
+    yield Paragraph(f"<b>Descripción:</b> {reunion.descripcion or ''}", styles["Normal"])
+    yield Spacer(1, 12)
+
+    # Intervenciones y comentarios
+    yield Paragraph("<b>Intervenciones y Comentarios</b>", styles["Heading2"])
+    yield Spacer(1, 6)
+
+    for intervencion in _intervenciones(reunion):
+        # Intervención con autor en rojo
+        contenido_intervencion = f'<font color="red">{intervencion.autor.get_full_name()}</font>: {intervencion.contenido}'
+        yield Paragraph(contenido_intervencion, styles["Intervencion"])
+
+        # Comentarios de la intervención con autor en rojo
+        for comentario in intervencion.comentarios.all():
+            contenido_comentario = f'<font color="green">{comentario.autor.get_full_name()}</font>: {comentario.contenido}'
+            yield Paragraph(contenido_comentario, styles["ComentarioActa"])
+
+        yield Spacer(1, 6)
+
+
+def _elementos_tarea(tarea):
+    styles = estilos()
+    tablas = estilos_tabla()
+    fecha_tarea = tarea.fecha.strftime('%d/%m/%Y') if tarea.fecha else "Sin fecha"
+
+    # 🔹 Tabla principal de la tarea
+    titulo_tarea = Paragraph(f"— {tarea.titulo} ({fecha_tarea})", styles["Tarea"])
+    contenido_tarea = [
+        [titulo_tarea],
+        [Paragraph(f"<b>Estado:</b> {tarea.estado}", styles["Texto"])],
+        [Paragraph(f"<b>Descripción:</b> {tarea.descripcion or ''}", styles["Texto"])]
+    ]
+
+    tabla_tarea = Table(contenido_tarea, colWidths=[16*cm])
+    tabla_tarea.setStyle(tablas["Tarea"])
+
+    yield tabla_tarea
+    yield Spacer(1, 6)
+
+    # 🔹 Intervenciones dentro de la tarea como tablas
+    for i, intervencion in enumerate(_intervenciones(tarea)):
+        if i == 0:
+            yield Paragraph("<b>Intervenciones</b>", styles["Texto"])
+
+        contenido_intervencion = [
+            [Paragraph(f'<font color="red">{intervencion.autor.get_full_name()}</font>', styles["Intervencion"])],
+            [Paragraph(intervencion.contenido, styles["Texto"])]
+        ]
+
+        tabla_intervencion = Table(contenido_intervencion, colWidths=[15*cm])
+        tabla_intervencion.setStyle(tablas["Intervencion"])
+
+        yield tabla_intervencion
+        yield Spacer(1, 4)
+
+        # 🔹 Comentarios como tablas anidadas
+        for comentario in intervencion.comentarios.all():
+            contenido_comentario = [
+                [Paragraph(f'<font color="green">{comentario.autor.get_full_name()}</font>', styles["Comentario"])],
+                [Paragraph(comentario.contenido, styles["Texto"])]
+            ]
+
+            tabla_comentario = Table(contenido_comentario, colWidths=[14*cm])
+            tabla_comentario.setStyle(tablas["Comentario"])
+
+            yield tabla_comentario
+            yield Spacer(1, 3)
+
+    # Separador después de cada tarea
+    yield Spacer(1, 8)
+    yield HRFlowable(width="90%", thickness=0.7, color=colors.grey)
+    yield Spacer(1, 8)
+
+
+def _elementos_actividad(proyecto, actividad):
+    styles = estilos()
+    fecha_str = actividad.fecha.strftime('%d/%m/%Y') if actividad.fecha else "Sin fecha"
+    yield Paragraph(f"Actividad: {actividad.titulo} ({fecha_str})", styles["Actividad"])
+    yield Paragraph(f"<b>Frente:</b> {actividad.frente.nombre}", styles["Texto"])
+    yield Paragraph(f"<b>Estado:</b> {actividad.estado}", styles["Texto"])
+    if actividad.tareas_total:
+        yield Paragraph(
+            f"<b>Avance de tareas:</b> {actividad.avance_tareas:.0f} % "
+            f"({actividad.tareas_cerrada} de {actividad.tareas_total} cerradas, "
+            f"{actividad.tareas_vencidas} vencidas)",
+            styles["Texto"],
+        )
+    yield Paragraph(f"<b>Descripción:</b> {actividad.descripcion or ''}", styles["Texto"])
+    yield Spacer(1, 6)
+
+    # Intervenciones de la actividad
+    for i, intervencion in enumerate(_intervenciones(actividad)):
+        if i == 0:
+            yield Paragraph("<b>Intervenciones</b>", styles["Texto"])
+        contenido_intervencion = f'<font color="red">{intervencion.autor.get_full_name()}</font>: {intervencion.contenido}'
+        yield Paragraph(contenido_intervencion, styles["Intervencion"])
+
+        for comentario in intervencion.comentarios.all():
+            contenido_comentario = f'{comentario.autor.get_full_name()}: {comentario.contenido}'
+            yield Paragraph(contenido_comentario, styles["Comentario"])
+
+    # 🔹 Reuniones hijas (tareas) asociadas
+    tareas = (
+        Reunion.objects
+        .filter(proyecto=proyecto, parent=actividad, frente__tipo="tarea")
+        .order_by("pk")
+        .iterator(chunk_size=TAMANO_LOTE)
+    )
+    for i, tarea in enumerate(tareas):
+        if i == 0:
+            yield Spacer(1, 4)
+            yield Paragraph("<b>Tareas asociadas</b>", styles["Tarea"])
+        yield from _elementos_tarea(tarea)
+
+
+def elementos_proyecto(proyecto):
+    """Flowables del informe completo de un proyecto."""
+    styles = estilos()
+
+    # ===== Datos del proyecto =====
+    yield Paragraph(f"Proyecto: {proyecto.nombre}", styles["Titulo"])
+    yield Spacer(1, 12)
+
+    yield Paragraph("<b>Datos generales del proyecto</b>", styles["Subtitulo"])
+    yield Paragraph(f"<b>Nombre:</b> {proyecto.nombre}", styles["Texto"])
+    yield Paragraph(f"<b>Descripción:</b> {proyecto.descripcion or '---'}", styles["Texto"])
+    yield Paragraph(f"<b>Fecha de inicio:</b> {proyecto.fecha_inicio.strftime('%d/%m/%Y') if proyecto.fecha_inicio else '---'}", styles["Texto"])
+    yield Paragraph(f"<b>Fecha de fin:</b> {proyecto.fecha_fin.strftime('%d/%m/%Y') if proyecto.fecha_fin else '---'}", styles["Texto"])
+    yield Paragraph(f"<b>Avance calculado:</b> {proyecto.avance_calculado} %", styles["Texto"])
+    yield Paragraph(f"<b>Total de intervenciones:</b> {proyecto.intervencion_total}", styles["Texto"])
+    yield Paragraph(f"<b>Intervenciones RMBC:</b> {proyecto.intervencion_rmbc}", styles["Texto"])
+    yield Paragraph(f"<b>Ejecución del proyecto:</b> {proyecto.ejecucion_proyecto} %", styles["Texto"])
+    yield Paragraph(f"<b>Ejecución financiera:</b> {proyecto.ejecucion_financiera} millones", styles["Texto"])
+    yield Spacer(1, 12)
+
+    # ===== Reuniones agrupadas por frente Actividad =====
+    actividades = (
+        proyecto.reuniones
+        .filter(frente__tipo="actividad")
+        .select_related("frente")
+        .con_avance()
+        .order_by("pk")
+        .iterator(chunk_size=TAMANO_LOTE)
+    )
+
+    hay_actividades = False
+    for actividad in actividades:
+        if not hay_actividades:
+            hay_actividades = True
+            yield Paragraph("<b>Reuniones por Actividad</b>", styles["Subtitulo"])
+            yield HRFlowable(width="100%", thickness=1, color=colors.grey)
+            yield Spacer(1, 6)
+        yield from _elementos_actividad(proyecto, actividad)
+
+    if not hay_actividades:
+        yield Paragraph("Este proyecto no tiene reuniones de tipo Actividad.", styles["Texto"])
+
+
+def generar_acta_pdf(reunion, destino):
+    """Escribe en `destino` el acta (informe de actividad) de una reunión."""
+    renderizar(destino, elementos_acta(reunion))
+
+
+def generar_proyecto_pdf(proyecto, destino):
+    """Escribe en `destino` el informe completo de un proyecto."""
+    renderizar(destino, elementos_proyecto(proyecto))
+
+
+def acta_pdf_temporal(reunion):
+    """Acta de la reunión renderizada en un archivo temporal."""
+    return renderizar_temporal(elementos_acta(reunion))
+
+
+def proyecto_pdf_temporal(proyecto):
+    """Informe del proyecto renderizado en un archivo temporal."""
+    return renderizar_temporal(elementos_proyecto(proyecto))
@@ -0,0 +1,28 @@
+# mi_aplicacion/reportes/trabajador.py
+# Funciones que ejecutan los procesos del pool de render. Los procesos se
+# lanzan con "spawn" (no heredan las conexiones a la base de datos del worker
+# web), así que este módulo no importa nada de Django al cargarse: los
+# modelos solo pueden importarse después de django.setup().
+import os
+
+
+def inicializar_proceso():
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def renderizar_acta_en_cache(reunion_id, ruta):
+    """Renderiza el acta de la reunión en `ruta` (escritura atómica)."""
+    from ..models import Reunion
+    from .pdf import generar_acta_pdf
+
+    reunion = Reunion.objects.select_related("proyecto", "frente").get(pk=reunion_id)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        generar_acta_pdf(reunion, archivo)
+    os.replace(temporal, ruta)
+    return ruta
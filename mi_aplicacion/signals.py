@@ -0,0 +1,209 @@
+# mi_aplicacion/signals.py
+# Se conectan en MiAplicacionConfig.ready()
+import os
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import biblioteca, filtros, tiempo_real, vistas_previas
+from .almacenamiento import es_blob
+from .models import (
+    CLAVE_FRENTE_DEFECTO,
+    ArchivoCompartido,
+    Comentario,
+    Documento,
+    Frente,
+    Intervencion,
+    IntervencionDocumento,
+    Proyecto,
+    Reunion,
+    marcar_modificados,
+)
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Proyecto)
+def invalidar_filtro_proyectos(sender, **kwargs):
+    filtros.invalidar(filtros.CLAVE_PROYECTOS)
+
+
+@receiver([post_save, post_delete], sender=Frente)
+def invalidar_filtro_frentes(sender, **kwargs):
+    # El frente por defecto de Reunion puede haber cambiado o desaparecido
+    filtros.invalidar(filtros.CLAVE_FRENTES, CLAVE_FRENTE_DEFECTO)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidar_filtro_usuarios(sender, update_fields=None, **kwargs):
+    # El login solo actualiza last_login, que no afecta al filtro
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    filtros.invalidar(filtros.CLAVE_RESPONSABLES)
+
+
+@receiver(m2m_changed, sender=Reunion.responsables.through)
+def invalidar_filtro_responsables(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        filtros.invalidar(filtros.CLAVE_RESPONSABLES)
+
+
+@receiver(post_delete, sender=Reunion)
+def invalidar_responsables_reunion(sender, **kwargs):
+    # Al borrar una reunión sus responsables se eliminan sin m2m_changed
+    filtros.invalidar(filtros.CLAVE_RESPONSABLES)
+
+
+@receiver([post_save, post_delete], sender=Reunion)
+def invalidar_actividades_proyecto(sender, instance, **kwargs):
+    # Si cambió de proyecto, la lista anterior caduca con FILTROS_CACHE_TIMEOUT
+    if instance.proyecto_id:
+        filtros.invalidar(filtros.CLAVE_ACTIVIDADES.format(instance.proyecto_id))
+
+
+@receiver(post_save, sender=Intervencion)
+def publicar_intervencion(sender, instance, created, **kwargs):
+    if created:
+        evento = {"reunion": instance.reunion_id, "tipo": "intervencion", "id": instance.pk}
+        transaction.on_commit(lambda: tiempo_real.publicar(evento))
+
+
+@receiver(post_save, sender=Comentario)
+def publicar_comentario(sender, instance, created, **kwargs):
+    if created:
+        evento = {"reunion": instance.intervencion.reunion_id, "tipo": "comentario", "id": instance.pk}
+        transaction.on_commit(lambda: tiempo_real.publicar(evento))
+
+
+# --- updated_at de los padres (GET condicional, ver condicional.py) ---
+
+def _en_cascada(origin, modelo):
+    # Al borrar un padre, el post_delete de cada hijo sobra: ya marca el padre
+    return (origin.model if isinstance(origin, QuerySet) else type(origin)) is not modelo
+
+
+@receiver([post_save, post_delete], sender=Comentario)
+@receiver([post_save, post_delete], sender=IntervencionDocumento)
+def marcar_intervencion(sender, instance, origin=None, **kwargs):
+    if origin is None or not _en_cascada(origin, sender):
+        marcar_modificados(intervencion_id=instance.intervencion_id)
+
+
+@receiver([post_save, post_delete], sender=Intervencion)
+def marcar_reunion(sender, instance, origin=None, **kwargs):
+    if origin is None or not _en_cascada(origin, sender):
+        marcar_modificados(reunion_ids=[instance.reunion_id])
+
+
+@receiver(pre_save, sender=Reunion)
+def marcar_proyectos(sender, instance, **kwargs):
+    # Antes de guardar: si cambia de proyecto, se marcan el anterior y el nuevo
+    proyectos = Q(pk=instance.proyecto_id) if instance.proyecto_id else Q(pk__in=[])
+    if instance.pk:
+        proyectos |= Q(reuniones=instance.pk)
+    Proyecto.objects.filter(proyectos).update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Reunion)
+def marcar_proyecto_reunion_borrada(sender, instance, origin=None, **kwargs):
+    if instance.proyecto_id and not _en_cascada(origin, sender):
+        Proyecto.objects.filter(pk=instance.proyecto_id).update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=Reunion.etiquetas.through)
+@receiver(m2m_changed, sender=Reunion.documentos.through)
+@receiver(m2m_changed, sender=Reunion.responsables.through)
+def marcar_reunion_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        marcar_modificados(reunion_ids=[instance.pk])
+    elif pk_set:
+        marcar_modificados(reunion_ids=pk_set)
+
+
+# --- Archivos subidos: referencias a los blobs y metadatos (vistas_previas.py) ---
+
+@receiver(pre_save, sender=Documento)
+@receiver(pre_save, sender=IntervencionDocumento)
+def recordar_archivo(sender, instance, **kwargs):
+    if instance.archivo and not instance.archivo._committed:
+        # Todavía con el nombre de la subida; al guardarse pasa a ser el hash
+        instance.nombre_archivo = os.path.basename(instance.archivo.name)[:255]
+    anterior = ""
+    if instance.pk:
+        anterior = sender.objects.filter(pk=instance.pk).values_list("archivo", flat=True).first() or ""
+    instance._archivo_anterior = anterior
+
+
+@receiver(post_save, sender=Documento)
+@receiver(post_save, sender=IntervencionDocumento)
+def contar_referencia(sender, instance, **kwargs):
+    anterior = getattr(instance, "_archivo_anterior", "")
+    actual = instance.archivo.name or ""
+    if actual == anterior:
+        return
+    if actual:
+        metadatos = vistas_previas.metadatos_subida(instance.archivo, instance.nombre_archivo)
+    else:
+        metadatos = {"tamano": None, "tipo_mime": "", "checksum": "", "paginas": None,
+                     "vista_previa": False, "metadatos_pendientes": False}
+    sender.objects.filter(pk=instance.pk).update(**metadatos)
+    for campo, valor in metadatos.items():
+        setattr(instance, campo, valor)
+
+    if es_blob(actual):
+        ArchivoCompartido.sumar(actual, instance.tamano)
+    if es_blob(anterior):
+        ArchivoCompartido.liberar(anterior)
+    instance._archivo_anterior = actual
+
+
+@receiver(post_delete, sender=Documento)
+@receiver(post_delete, sender=IntervencionDocumento)
+def liberar_referencia(sender, instance, **kwargs):
+    if es_blob(instance.archivo.name):
+        ArchivoCompartido.liberar(instance.archivo.name)
+
+
+# --- Índice de la biblioteca de documentos (biblioteca.py) ---
+
+@receiver(post_save, sender=Documento)
+def indexar_documento(sender, instance, created, **kwargs):
+    # Un Documento nuevo entra en la biblioteca al adjuntarlo a una reunión
+    if not created:
+        biblioteca.actualizar_documento(instance)
+
+
+@receiver(post_save, sender=IntervencionDocumento)
+def indexar_documento_intervencion(sender, instance, **kwargs):
+    biblioteca.indexar_documento_intervencion(instance)
+
+
+@receiver(m2m_changed, sender=Reunion.documentos.through)
+def indexar_adjuntos_reunion(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "post_add" and pk_set:
+        if reverse:
+            biblioteca.adjuntar_documentos(pk_set, [instance.pk])
+        else:
+            biblioteca.adjuntar_documentos([instance.pk], pk_set)
+    elif action == "post_remove" and pk_set:
+        if reverse:
+            biblioteca.quitar_documentos(reunion_ids=pk_set, documento_ids=[instance.pk])
+        else:
+            biblioteca.quitar_documentos(reunion_ids=[instance.pk], documento_ids=pk_set)
+    elif action == "post_clear":
+        if reverse:
+            biblioteca.quitar_documentos(documento_ids=[instance.pk])
+        else:
+            biblioteca.quitar_documentos(reunion_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Reunion)
+def indexar_reunion(sender, instance, created, **kwargs):
+    if not created:
+        biblioteca.actualizar_reunion(instance)
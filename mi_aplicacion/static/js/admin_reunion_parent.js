@@ -0,0 +1,31 @@
+// mi_aplicacion/static/js/admin_reunion_parent.js
+// Admin de Reunion: el autocompletado del campo "parent" (ActividadAutocompleteSelect)
+// solo ofrece actividades del proyecto elegido en el formulario.
+'use strict';
+{
+  const $ = django.jQuery;
+
+  function acotarPadre(limpiar) {
+    const padre = $('#id_parent');
+    const proyecto = document.getElementById('id_proyecto');
+    if (!padre.length || !padre.attr('data-ajax--url')) return;
+
+    const base = padre.attr('data-ajax--url').split('?')[0];
+    const url = proyecto && proyecto.value
+      ? base + '?proyecto=' + encodeURIComponent(proyecto.value)
+      : base;
+    padre.attr('data-ajax--url', url);
+    if (limpiar) padre.val(null);
+
+    // select2 lee la URL al iniciarse: se vuelve a crear con la nueva
+    if (padre.data('select2')) padre.select2('destroy');
+    padre.djangoAdminSelect2();
+    if (limpiar) padre.trigger('change');
+  }
+
+  // "load" llega después de la inicialización de admin/js/autocomplete.js
+  window.addEventListener('load', function () {
+    acotarPadre(false);
+    $('#id_proyecto').on('change', function () { acotarPadre(true); });
+  });
+}
@@ -0,0 +1,137 @@
+// mi_aplicacion/static/js/autocompletar.js
+// Autocompletado para campos que antes eran un <select> con toda la tabla.
+//
+// Uso:
+//   <input type="hidden" name="responsable" id="responsable" value="...">
+//   <input type="search" list="responsable-opciones"
+//          data-autocompletar="/responsables/buscar/"
+//          data-destino="responsable" data-enviar>
+//   <datalist id="responsable-opciones"></datalist>
+//
+// El endpoint recibe ?q=texto (y los parámetros extra de data-parametros,
+// p. ej. "proyecto=3") y responde {"resultados": [{"id", "texto"}], "mas": bool}.
+//
+// Variantes (ver widgets.Autocompletar):
+//   data-multiple="<id contenedor>"  cada opción elegida se añade como una
+//                                    etiqueta con su <input type="hidden">.
+//   data-depende="<campo>"           envía el valor de ese campo del mismo
+//                                    formulario y vacía la selección cuando cambia.
+(function () {
+  function debounce(fn, ms) {
+    let t;
+    return function () {
+      const args = arguments;
+      clearTimeout(t);
+      t = setTimeout(() => fn.apply(this, args), ms);
+    };
+  }
+
+  function agregarEtiqueta(contenedor, op) {
+    const nombre = contenedor.dataset.nombre;
+    const repetido = Array.from(contenedor.querySelectorAll('input[type=hidden]'))
+      .some((el) => el.value === String(op.id));
+    if (repetido) return;
+
+    const etiqueta = document.createElement('span');
+    etiqueta.className = 'badge bg-secondary';
+    etiqueta.textContent = op.texto + ' ';
+    const oculto = document.createElement('input');
+    oculto.type = 'hidden';
+    oculto.name = nombre;
+    oculto.value = op.id;
+    const quitar = document.createElement('button');
+    quitar.type = 'button';
+    quitar.className = 'btn-close btn-close-white ms-1';
+    quitar.style.fontSize = '.6em';
+    quitar.setAttribute('aria-label', 'Quitar');
+    etiqueta.appendChild(oculto);
+    etiqueta.appendChild(quitar);
+    contenedor.appendChild(etiqueta);
+  }
+
+  function iniciar(input) {
+    if (input.dataset.autocompletarIniciado) return;
+    const lista = document.getElementById(input.getAttribute('list'));
+    const destino = document.getElementById(input.dataset.destino);
+    const contenedor = document.getElementById(input.dataset.multiple);
+    if (!lista || !(destino || contenedor)) return;
+    input.dataset.autocompletarIniciado = '1';
+
+    const depende = input.dataset.depende;
+    let opciones = [];
+
+    const buscar = debounce(function () {
+      const params = new URLSearchParams(input.dataset.parametros || '');
+      params.set('q', input.value);
+      if (depende && input.form && input.form.elements[depende]) {
+        params.set(depende, input.form.elements[depende].value);
+      }
+      fetch(input.dataset.autocompletar + '?' + params.toString(), {
+        headers: { 'X-Requested-With': 'XMLHttpRequest' },
+        credentials: 'same-origin',
+      })
+        .then((r) => r.json())
+        .then((datos) => {
+          opciones = datos.resultados || [];
+          lista.innerHTML = '';
+          opciones.forEach((op) => {
+            const el = document.createElement('option');
+            el.value = op.texto;
+            lista.appendChild(el);
+          });
+        })
+        .catch(() => {});
+    }, 250);
+
+    input.addEventListener('input', function () {
+      const elegido = opciones.find((op) => op.texto === input.value);
+      if (elegido && contenedor) {
+        agregarEtiqueta(contenedor, elegido);
+        input.value = '';
+        return;
+      }
+      if (elegido) {
+        destino.value = elegido.id;
+        destino.dispatchEvent(new Event('change', { bubbles: true }));
+        if ('enviar' in input.dataset && input.form) input.form.submit();
+        return;
+      }
+      if (destino && input.value === '' && destino.value !== '') {
+        destino.value = '';
+        destino.dispatchEvent(new Event('change', { bubbles: true }));
+        if ('enviar' in input.dataset && input.form) input.form.submit();
+        return;
+      }
+      buscar();
+    });
+
+    input.addEventListener('focus', function () {
+      if (!opciones.length) buscar();
+    });
+
+    if (contenedor) {
+      contenedor.addEventListener('click', function (e) {
+        if (e.target.classList.contains('btn-close')) e.target.parentElement.remove();
+      });
+    }
+
+    // Si cambia el campo del que depende, las opciones y la selección ya no valen
+    if (depende && input.form) {
+      input.form.addEventListener('change', function (e) {
+        if (e.target.name !== depende) return;
+        opciones = [];
+        lista.innerHTML = '';
+        input.value = '';
+        if (destino) destino.value = '';
+        if (contenedor) contenedor.innerHTML = '';
+      });
+    }
+  }
+
+  function iniciarTodos(raiz) {
+    (raiz || document).querySelectorAll('input[data-autocompletar]').forEach(iniciar);
+  }
+
+  window.iniciarAutocompletar = iniciarTodos;
+  document.addEventListener('DOMContentLoaded', function () { iniciarTodos(); });
+})();
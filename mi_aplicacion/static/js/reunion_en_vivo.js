@@ -0,0 +1,113 @@
+// mi_aplicacion/static/js/reunion_en_vivo.js
+// Hilo de la reunión en vivo: recibe por server-sent events las
+// intervenciones y comentarios nuevos (ReunionEventosView) y los añade a la
+// página sin recargarla.
+//
+// Mientras el flujo está conectado los formularios se envían con fetch y la
+// respuesta (204) no trae HTML: el fragmento llega por el propio flujo, igual
+// que a los demás usuarios. Sin flujo (WSGI, o desconectado) los formularios
+// funcionan como siempre, con recarga.
+(function () {
+  const hilo = document.getElementById('accordionIntervenciones');
+  if (!hilo || !hilo.dataset.eventos || !window.EventSource) return;
+
+  let conectado = false;
+
+  function fragmento(html) {
+    const plantilla = document.createElement('template');
+    plantilla.innerHTML = html.trim();
+    return plantilla.content;
+  }
+
+  function tokenCsrf() {
+    const campo = document.querySelector('input[name=csrfmiddlewaretoken]');
+    return campo ? campo.value : '';
+  }
+
+  // Los fragmentos se renderizan sin petición: falta el token CSRF
+  function completarCsrf(raiz) {
+    raiz.querySelectorAll('form[method=post]').forEach(function (form) {
+      if (form.querySelector('input[name=csrfmiddlewaretoken]')) return;
+      const campo = document.createElement('input');
+      campo.type = 'hidden';
+      campo.name = 'csrfmiddlewaretoken';
+      campo.value = tokenCsrf();
+      form.prepend(campo);
+    });
+  }
+
+  const eventos = new EventSource(hilo.dataset.eventos);
+
+  eventos.addEventListener('open', function () { conectado = true; });
+  eventos.addEventListener('error', function () { conectado = false; });
+
+  eventos.addEventListener('intervencion', function (e) {
+    const datos = JSON.parse(e.data);
+    if (document.getElementById('intervencion' + datos.id)) return;
+    const nuevo = fragmento(datos.html);
+    completarCsrf(nuevo);
+    hilo.appendChild(nuevo);
+  });
+
+  eventos.addEventListener('comentario', function (e) {
+    const datos = JSON.parse(e.data);
+    const lista = document.getElementById('comentarios' + datos.intervencion);
+    if (!lista || document.getElementById('comentario' + datos.id)) return;
+    const vacio = lista.querySelector('.sin-comentarios');
+    if (vacio) vacio.remove();
+    lista.appendChild(fragmento(datos.html));
+  });
+
+  // La conexión no pudo seguir el ritmo y se perdieron eventos
+  eventos.addEventListener('recargar', function () {
+    eventos.close();
+    window.location.reload();
+  });
+
+  // Errores del envío con fetch, dentro del formulario y sin tocar lo escrito
+  function mostrarErrores(form, errores) {
+    const anterior = form.querySelector('.errores-envio');
+    if (anterior) anterior.remove();
+    if (errores === null) return;
+    const mensajes = [];
+    Object.keys(errores || {}).forEach(function (campo) {
+      errores[campo].forEach(function (error) { mensajes.push(error.message); });
+    });
+    const aviso = document.createElement('div');
+    aviso.className = 'alert alert-danger errores-envio';
+    aviso.setAttribute('role', 'alert');
+    aviso.textContent = mensajes.length ? mensajes.join(' ') : 'No se pudo guardar. Inténtalo de nuevo.';
+    form.prepend(aviso);
+  }
+
+  document.addEventListener('submit', function (e) {
+    const form = e.target;
+    if (!conectado || !form.matches('form[method=post]')) return;
+    e.preventDefault();
+    const boton = form.querySelector('[type=submit]');
+    if (boton) boton.disabled = true;
+    fetch(window.location.href, {
+      method: 'POST',
+      body: new FormData(form),
+      headers: { 'X-Requested-With': 'XMLHttpRequest' },
+      credentials: 'same-origin',
+    })
+      .then(function (r) {
+        if (boton) boton.disabled = false;
+        if (r.ok) {
+          mostrarErrores(form, null);
+          form.reset();
+          const modal = form.closest('.modal');
+          if (modal && window.bootstrap) window.bootstrap.Modal.getOrCreateInstance(modal).hide();
+          return;
+        }
+        // Hubo respuesta: no se reenvía (podría duplicar lo ya guardado)
+        return r.json()
+          .then(function (datos) { mostrarErrores(form, datos.errores); })
+          .catch(function () { mostrarErrores(form, undefined); });
+      }, function () {
+        // Sin respuesta del servidor (red caída): envío normal, con recarga
+        form.submit();
+      });
+  });
+})();
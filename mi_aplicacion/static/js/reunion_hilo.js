@@ -0,0 +1,36 @@
+// mi_aplicacion/static/js/reunion_hilo.js
+// Carga bajo demanda del hilo de una reunión: la página trae solo las
+// últimas intervenciones y los comentarios cerrados. Cada botón
+// [data-cargar] pide un fragmento HTML (ReunionIntervencionesView,
+// IntervencionComentariosView) y su contenedor .cargar-mas se reemplaza por
+// él; el fragmento trae a su vez el botón de la página anterior, si la hay.
+(function () {
+  function fragmento(html) {
+    const plantilla = document.createElement('template');
+    plantilla.innerHTML = html.trim();
+    // Lo que ya llegó por los eventos en vivo no se repite
+    plantilla.content.querySelectorAll('[id]').forEach(function (el) {
+      if (document.getElementById(el.id)) el.remove();
+    });
+    return plantilla.content;
+  }
+
+  document.addEventListener('click', function (e) {
+    const boton = e.target.closest('[data-cargar]');
+    if (!boton) return;
+    const contenedor = boton.closest('.cargar-mas');
+    boton.disabled = true;
+    fetch(boton.dataset.cargar, {
+      headers: { 'X-Requested-With': 'XMLHttpRequest' },
+      credentials: 'same-origin',
+    })
+      .then(function (r) {
+        if (!r.ok) throw new Error(r.status);
+        return r.text();
+      })
+      .then(function (html) {
+        contenedor.replaceWith(fragmento(html));
+      })
+      .catch(function () { boton.disabled = false; });
+  });
+})();
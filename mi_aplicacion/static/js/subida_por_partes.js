@@ -0,0 +1,134 @@
+// mi_aplicacion/static/js/subida_por_partes.js
+// Documentos grandes de una intervención: en lugar de un solo POST
+// multipart, el archivo se envía por bloques de data-bloque bytes
+// (SubidaCrearView, SubidaView; ver subidas.py) y la intervención se crea con
+// el último. Si se corta la conexión se reintenta desde lo que el servidor ya
+// tiene; si se recarga la página, al volver a elegir el mismo archivo en la
+// misma reunión continúa la subida pendiente (localStorage).
+(function () {
+  const REINTENTOS = 6;
+
+  function huella(form, archivo) {
+    return 'subida:' + [form.dataset.reunion, archivo.name, archivo.size, archivo.lastModified].join(':');
+  }
+
+  function tokenCsrf(form) {
+    const campo = form.querySelector('input[name=csrfmiddlewaretoken]');
+    return campo ? campo.value : '';
+  }
+
+  function pedir(url, opciones) {
+    opciones.credentials = 'same-origin';
+    opciones.headers = Object.assign({ 'X-Requested-With': 'XMLHttpRequest' }, opciones.headers);
+    return fetch(url, opciones);
+  }
+
+  function esperar(ms) {
+    return new Promise(function (resolver) { setTimeout(resolver, ms); });
+  }
+
+  function mostrarProgreso(form, recibido, total) {
+    const barra = form.querySelector('.progress');
+    if (!barra) return;
+    barra.classList.remove('d-none');
+    barra.querySelector('.progress-bar').style.width = Math.floor(100 * recibido / total) + '%';
+  }
+
+  // La subida lleva los campos de la intervención (contenido, nombre), sin el archivo
+  async function iniciar(form, archivo) {
+    const datos = new FormData(form);
+    datos.delete('archivo');
+    datos.append('reunion', form.dataset.reunion);
+    datos.append('nombre_archivo', archivo.name);
+    datos.append('tamano', archivo.size);
+    const r = await pedir(form.dataset.subidas, {
+      method: 'POST', body: datos, headers: { 'X-CSRFToken': tokenCsrf(form) },
+    });
+    if (r.ok) return r.json();
+    const error = new Error(r.status);
+    // Errores de validación de la intervención
+    if (r.status === 400) {
+      const errores = (await r.json()).errores || {};
+      error.mensaje = Object.keys(errores).map(function (campo) {
+        return errores[campo].map(function (e) { return e.message; }).join(' ');
+      }).join(' ');
+    }
+    throw error;
+  }
+
+  async function subir(form, archivo) {
+    const clave = huella(form, archivo);
+    const pendiente = JSON.parse(localStorage.getItem(clave) || 'null');
+    let estado = null;
+    if (pendiente) {
+      const r = await pedir(pendiente.url, { method: 'GET' });
+      if (r.ok) estado = await r.json();
+      else localStorage.removeItem(clave);
+    }
+    if (!estado) {
+      estado = await iniciar(form, archivo);
+      localStorage.setItem(clave, JSON.stringify({ url: estado.url }));
+    }
+
+    let fallos = 0;
+    while (true) {
+      mostrarProgreso(form, estado.recibido, archivo.size);
+      const fin = Math.min(estado.recibido + estado.bloque, archivo.size);
+      let r = null;
+      try {
+        r = await pedir(estado.url, {
+          method: 'PATCH',
+          body: archivo.slice(estado.recibido, fin),
+          headers: {
+            'Content-Type': 'application/offset+octet-stream',
+            'Upload-Offset': String(estado.recibido),
+            'X-CSRFToken': tokenCsrf(form),
+          },
+        });
+      } catch (error) {
+        r = null;
+      }
+
+      // 201: intervención y documento creados. 404: ya se completó (se perdió la respuesta) o se canceló
+      if (r && (r.status === 201 || r.status === 404)) break;
+      if (r && (r.ok || r.status === 409)) {
+        estado = await r.json();
+        fallos = 0;
+        continue;
+      }
+      if (r && r.status < 500) throw new Error(r.status);
+
+      // Red o servidor caídos: se espera y se pregunta dónde continuar
+      if (++fallos > REINTENTOS) throw new Error('sin conexión');
+      await esperar(1000 * Math.pow(2, fallos));
+      try {
+        const consulta = await pedir(estado.url, { method: 'GET' });
+        if (consulta.status === 404) break;
+        if (consulta.ok) estado = await consulta.json();
+      } catch (error) {
+        // Se vuelve a intentar en la siguiente vuelta
+      }
+    }
+    localStorage.removeItem(clave);
+    mostrarProgreso(form, archivo.size, archivo.size);
+    window.location.reload();
+  }
+
+  // Fase de captura: antes que el envío con fetch de reunion_en_vivo.js
+  document.addEventListener('submit', function (e) {
+    const form = e.target;
+    if (!form.dataset || !form.dataset.subidas || !window.fetch) return;
+    const campo = form.querySelector('input[type=file][name=archivo]');
+    const archivo = campo && campo.files[0];
+    if (!archivo || archivo.size <= Number(form.dataset.bloque)) return;
+
+    e.preventDefault();
+    e.stopPropagation();
+    const boton = form.querySelector('[type=submit]');
+    if (boton) boton.disabled = true;
+    subir(form, archivo).catch(function (error) {
+      if (boton) boton.disabled = false;
+      window.alert(error.mensaje || 'No se pudo subir el documento. Vuelve a enviarlo para continuar donde quedó.');
+    });
+  }, true);
+})();
@@ -0,0 +1,142 @@
+# mi_aplicacion/subidas.py
+# Subidas por partes y reanudables de los documentos de una intervención
+# (grabaciones, actas escaneadas). El cliente (static/js/subida_por_partes.js):
+#   1. POST /subidas/ con reunion, contenido, nombre_archivo, tamano [, nombre]
+#      → 201 {"id", "url", "recibido": 0}
+#   2. PATCH <url> con un bloque de bytes y la cabecera Upload-Offset
+#      (= recibido); se repite hasta completar. Si se corta la conexión,
+#      HEAD/GET <url> devuelve el desplazamiento desde el que seguir.
+#   3. Con el último bloque se crean la Intervencion y su
+#      IntervencionDocumento → 201. Hasta entonces no hay intervención: si la
+#      subida se cancela o caduca (borrar_caducadas) no queda nada a medias.
+#
+# Cada petición lee como mucho SUBIDAS_TAMANO_BLOQUE bytes, por trozos de
+# TAMANO_LECTURA: la memoria y el tiempo de un worker no dependen del
+# tamaño del archivo. Los temporales están en SUBIDAS_TEMP_DIR.
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Intervencion, IntervencionDocumento, SubidaParcial
+
+TAMANO_LECTURA = 64 * 1024
+
+
+class DesplazamientoIncorrecto(Exception):
+    """El bloque no empieza donde termina lo ya recibido (otra pestaña, reintento)."""
+
+    def __init__(self, recibido):
+        super().__init__(f"Se esperaba el desplazamiento {recibido}")
+        self.recibido = recibido
+
+
+def directorio_temporal():
+    return getattr(settings, "SUBIDAS_TEMP_DIR", os.path.join(settings.BASE_DIR, "cache", "subidas"))
+
+
+def tamano_maximo():
+    return getattr(settings, "SUBIDAS_TAMANO_MAXIMO", 4 * 1024 ** 3)
+
+
+def tamano_bloque():
+    return getattr(settings, "SUBIDAS_TAMANO_BLOQUE", 8 * 1024 ** 2)
+
+
+def ruta_temporal(subida_id):
+    return os.path.join(directorio_temporal(), f"{subida_id}.part")
+
+
+def escribir_bloque(subida, desplazamiento, flujo, longitud):
+    """
+    Escribe en el temporal los `longitud` bytes de `flujo` a partir de
+    `desplazamiento` y devuelve el nuevo total recibido. Si la conexión se
+    corta a mitad, cuenta lo que llegó.
+    """
+    if desplazamiento != subida.recibido:
+        raise DesplazamientoIncorrecto(subida.recibido)
+    longitud = min(longitud, subida.tamano - desplazamiento)
+
+    os.makedirs(directorio_temporal(), exist_ok=True)
+    escritos = 0
+    descriptor = os.open(ruta_temporal(subida.pk), os.O_WRONLY | os.O_CREAT, 0o600)
+    with os.fdopen(descriptor, "wb") as destino:
+        destino.seek(desplazamiento)
+        while escritos < longitud:
+            try:
+                datos = flujo.read(min(TAMANO_LECTURA, longitud - escritos))
+            except OSError:
+                break
+            if not datos:
+                break
+            destino.write(datos)
+            escritos += len(datos)
+
+    # Solo avanza si nadie escribió el mismo tramo a la vez; si lo hizo, lo
+    # escrito aquí queda por detrás de `recibido` o se sobrescribe después
+    nuevo = desplazamiento + escritos
+    avanzada = SubidaParcial.objects.filter(pk=subida.pk, recibido=desplazamiento).update(
+        recibido=nuevo, actualizada=timezone.now()
+    )
+    if not avanzada:
+        raise DesplazamientoIncorrecto(
+            SubidaParcial.objects.filter(pk=subida.pk).values_list("recibido", flat=True).first() or 0
+        )
+    subida.recibido = nuevo
+    return nuevo
+
+
+def completar(subida):
+    """
+    Convierte la subida terminada en la intervención con su
+    IntervencionDocumento. El archivo se copia por bloques al almacenamiento
+    de documentos, que calcula su hash al escribirlo (almacenamiento.py).
+    """
+    ruta = ruta_temporal(subida.pk)
+    with transaction.atomic():
+        # Solo una petición se queda la subida (dos últimos bloques a la vez)
+        if not SubidaParcial.objects.filter(pk=subida.pk).delete()[0]:
+            return None
+        with open(ruta, "r+b") as temporal:
+            # Restos de un intento anterior más allá del final
+            temporal.truncate(subida.tamano)
+            intervencion = Intervencion.objects.create(
+                reunion_id=subida.reunion_id,
+                autor_id=subida.usuario_id,
+                contenido=subida.contenido,
+            )
+            documento = IntervencionDocumento(
+                intervencion=intervencion,
+                nombre=subida.nombre,
+                archivo=File(temporal, name=subida.nombre_archivo),
+            )
+            documento.save()
+    os.unlink(ruta)
+    return documento
+
+
+def borrar_caducadas(horas):
+    """Subidas sin actividad en `horas` y temporales sin subida. Devuelve cuántas."""
+    limite = timezone.now() - timedelta(hours=horas)
+    caducadas = list(SubidaParcial.objects.filter(actualizada__lt=limite).values_list("pk", flat=True))
+    SubidaParcial.objects.filter(pk__in=caducadas).delete()
+
+    borradas = 0
+    directorio = directorio_temporal()
+    if not os.path.isdir(directorio):
+        return borradas
+    vigentes = {str(pk) for pk in SubidaParcial.objects.values_list("pk", flat=True).iterator()}
+    with os.scandir(directorio) as entradas:
+        for entrada in entradas:
+            subida_id, extension = os.path.splitext(entrada.name)
+            if extension != ".part" or subida_id in vigentes:
+                continue
+            # Una subida recién creada puede no estar aún en `vigentes`
+            if entrada.stat().st_mtime >= limite.timestamp():
+                continue
+            os.unlink(entrada.path)
+            borradas += 1
+    return borradas
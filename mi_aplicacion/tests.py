@@ -1,3 +1,280 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.db.models import F
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .almacenamiento import almacenamiento_documentos
+from .descargas import _rango
+from .management.commands.enviar_resumen_vencimientos import Command as EnviarResumenCommand
+from .management.commands.enviar_resumen_vencimientos import resumenes
+from .models import (
+    ArchivoCompartido,
+    Documento,
+    EnvioResumenVencimientos,
+    Frente,
+    GrupoTrabajo,
+    Reunion,
+)
+from .paginacion import codificar_cursor, pagina_por_cursor
+from .reportes.pdf import generar_acta_pdf
+from .utils.graph_mail import GraphError
+
+
+class ActaPDFTests(TestCase):
+    def test_reunion_sin_fecha(self):
+        grupo = GrupoTrabajo.objects.create(nombre="Grupo")
+        reunion = Reunion.objects.create(titulo="Reunión sin fecha", fecha=None, grupo_trabajo=grupo)
+        destino = io.BytesIO()
+        generar_acta_pdf(reunion, destino)
+        self.assertTrue(destino.getvalue().startswith(b"%PDF"))
+
+
+class MediaTemporalMixin:
+    """MEDIA_ROOT y caché de miniaturas en un directorio temporal por prueba."""
+
+    def setUp(self):
+        super().setUp()
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio, ignore_errors=True)
+        ajustes = override_settings(
+            MEDIA_ROOT=directorio, VISTAS_PREVIAS_CACHE_DIR=os.path.join(directorio, "cache"),
+        )
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+
+class RangoTests(TestCase):
+    ETAG = '"a-1"'
+    MODIFICADO = 1_700_000_000
+
+    def rango(self, tamano=100, **cabeceras):
+        request = RequestFactory().get("/", headers=cabeceras)
+        return _rango(request, tamano, self.ETAG, self.MODIFICADO)
+
+    def test_rangos(self):
+        self.assertEqual(self.rango(Range="bytes=10-19"), (10, 19))
+        self.assertEqual(self.rango(Range="bytes=90-"), (90, 99))
+        self.assertEqual(self.rango(Range="bytes=90-500"), (90, 99))
+
+    def test_rango_sufijo(self):
+        self.assertEqual(self.rango(Range="bytes=-10"), (90, 99))
+        # Un sufijo mayor que el archivo es el archivo entero
+        self.assertEqual(self.rango(Range="bytes=-500"), (0, 99))
+
+    def test_sin_rango_valido(self):
+        self.assertIsNone(self.rango())
+        self.assertIsNone(self.rango(Range="bytes=-"))
+        self.assertIsNone(self.rango(Range="bytes=20-10"))
+        self.assertIsNone(self.rango(Range="bytes=0-1,5-6"))
+        self.assertIsNone(self.rango(Range="lineas=0-1"))
+
+    def test_fuera_del_archivo(self):
+        inicio, _ = self.rango(Range="bytes=100-")
+        self.assertGreaterEqual(inicio, 100)
+
+    def test_if_range(self):
+        self.assertEqual(self.rango(Range="bytes=0-9", **{"If-Range": self.ETAG}), (0, 9))
+        self.assertEqual(
+            self.rango(Range="bytes=0-9", **{"If-Range": "Wed, 15 Nov 2023 00:00:00 GMT"}), (0, 9)
+        )
+        # Otra versión del archivo: se envía completo
+        self.assertIsNone(self.rango(Range="bytes=0-9", **{"If-Range": '"otro"'}))
+        self.assertIsNone(self.rango(Range="bytes=0-9", **{"If-Range": "Mon, 01 Jan 2001 00:00:00 GMT"}))
+
+
+class DescargaProtegidaTests(MediaTemporalMixin, TestCase):
+    CONTENIDO = b"0123456789" * 10
+
+    def setUp(self):
+        super().setUp()
+        self.grupo = GrupoTrabajo.objects.create(nombre="Grupo")
+        self.reunion = Reunion.objects.create(titulo="Reunión", grupo_trabajo=self.grupo)
+        self.documento = Documento.objects.create(archivo=ContentFile(self.CONTENIDO, name="acta.txt"))
+        self.reunion.documentos.add(self.documento)
+        self.url = reverse("mi_aplicacion:descargar_documento", args=[self.documento.pk])
+
+    def descargar(self, usuario, **cabeceras):
+        self.client.force_login(usuario)
+        respuesta = self.client.get(self.url, headers=cabeceras)
+        self.addCleanup(respuesta.close)
+        return respuesta
+
+    def test_accesibles_para(self):
+        miembro = User.objects.create_user("miembro")
+        self.grupo.usuarios.add(miembro)
+        responsable = User.objects.create_user("responsable")
+        self.reunion.responsables.add(responsable)
+        personal = User.objects.create_user("personal", is_staff=True)
+        ajeno = User.objects.create_user("ajeno")
+
+        for usuario in (miembro, responsable, personal):
+            self.assertQuerySetEqual(Reunion.objects.accesibles_para(usuario), [self.reunion])
+        self.assertFalse(Reunion.objects.accesibles_para(ajeno).exists())
+
+    def test_descarga_segun_acceso(self):
+        miembro = User.objects.create_user("miembro")
+        self.grupo.usuarios.add(miembro)
+        respuesta = self.descargar(miembro)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(b"".join(respuesta.streaming_content), self.CONTENIDO)
+
+        self.assertEqual(self.descargar(User.objects.create_user("ajeno")).status_code, 404)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_descarga_parcial(self):
+        personal = User.objects.create_user("personal", is_staff=True)
+        respuesta = self.descargar(personal, Range="bytes=-5")
+        self.assertEqual(respuesta.status_code, 206)
+        self.assertEqual(respuesta["Content-Range"], "bytes 95-99/100")
+        self.assertEqual(b"".join(respuesta.streaming_content), self.CONTENIDO[-5:])
+
+        respuesta = self.descargar(personal, Range="bytes=100-")
+        self.assertEqual(respuesta.status_code, 416)
+        self.assertEqual(respuesta["Content-Range"], "bytes */100")
+
+
+class PaginacionCursorTests(TestCase):
+    def test_fechas_nulas_entre_paginas(self):
+        grupo = GrupoTrabajo.objects.create(nombre="Grupo")
+        ahora = timezone.now()
+        for fecha in (ahora, None, ahora - timedelta(days=1), None, ahora - timedelta(days=1), None):
+            Reunion.objects.create(titulo="R", fecha=fecha, grupo_trabajo=grupo)
+        esperado = list(
+            Reunion.objects.order_by(F("fecha").desc(nulls_last=True), "-pk").values_list("pk", flat=True)
+        )
+
+        for tamano in (1, 2, 3, 4):
+            with self.subTest(tamano=tamano):
+                vistos, cursor = [], None
+                while True:
+                    objetos, cursor = pagina_por_cursor(Reunion.objects.all(), cursor, tamano)
+                    vistos += [r.pk for r in objetos]
+                    if cursor is None or len(vistos) > len(esperado):
+                        break
+                self.assertEqual(vistos, esperado)
+
+    def test_cursor_invalido(self):
+        grupo = GrupoTrabajo.objects.create(nombre="Grupo")
+        Reunion.objects.create(titulo="R", fecha=timezone.now(), grupo_trabajo=grupo)
+        for cursor in ("no-es-base64", codificar_cursor("ayer", 1), codificar_cursor(timezone.now(), "x")):
+            objetos, _ = pagina_por_cursor(Reunion.objects.all(), cursor, 10)
+            self.assertEqual(len(objetos), 1)
+
+
+class AlmacenamientoDeduplicadoTests(MediaTemporalMixin, TestCase):
+    def referencias(self, nombre):
+        return ArchivoCompartido.objects.get(nombre=nombre).referencias
+
+    def test_mismo_contenido_mismo_blob(self):
+        almacenamiento = almacenamiento_documentos()
+        primero = almacenamiento.save("informe.PDF", ContentFile(b"contenido"))
+        segundo = almacenamiento.save("otro.pdf", ContentFile(b"contenido"))
+        self.assertEqual(primero, segundo)
+        self.assertTrue(primero.startswith("blobs/") and primero.endswith(".pdf"))
+        self.assertNotEqual(primero, almacenamiento.save("informe.pdf", ContentFile(b"distinto")))
+        self.assertEqual(os.listdir(almacenamiento.path("blobs/tmp")), [])
+
+    def test_referencias(self):
+        uno = Documento.objects.create(archivo=ContentFile(b"compartido", name="a.txt"))
+        dos = Documento.objects.create(archivo=ContentFile(b"compartido", name="b.txt"))
+        compartido = uno.archivo.name
+        self.assertEqual(dos.archivo.name, compartido)
+        self.assertEqual(uno.nombre_archivo, "a.txt")
+        self.assertEqual(self.referencias(compartido), 2)
+
+        # Reemplazar el archivo libera el blob anterior
+        uno.archivo = ContentFile(b"nuevo", name="a.txt")
+        uno.save()
+        self.assertEqual(self.referencias(compartido), 1)
+        self.assertEqual(self.referencias(uno.archivo.name), 1)
+
+        dos.delete()
+        blob = ArchivoCompartido.objects.get(nombre=compartido)
+        self.assertEqual(blob.referencias, 0)
+        self.assertIsNotNone(blob.liberado)
+        # El archivo queda en disco hasta deduplicar_documentos --purgar
+        self.assertTrue(almacenamiento_documentos().exists(compartido))
+
+
+class RutaReunionTests(TestCase):
+    def test_mover_subarbol(self):
+        grupo = GrupoTrabajo.objects.create(nombre="Grupo")
+        frente = Frente.objects.create(nombre="Actividades", tipo="actividad")
+
+        def crear(parent=None):
+            return Reunion.objects.create(titulo="R", grupo_trabajo=grupo, frente=frente, parent=parent)
+
+        raiz = crear()
+        actividad = crear(raiz)
+        tarea = crear(actividad)
+        otra_raiz = crear()
+        self.assertEqual(tarea.ruta, f"/{raiz.pk}/{actividad.pk}/{tarea.pk}/")
+
+        actividad.parent = otra_raiz
+        actividad.save()
+        tarea.refresh_from_db()
+        self.assertEqual(actividad.ruta, f"/{otra_raiz.pk}/{actividad.pk}/")
+        self.assertEqual(tarea.ruta, f"/{otra_raiz.pk}/{actividad.pk}/{tarea.pk}/")
+        self.assertFalse(Reunion.objects.descendientes(raiz).exists())
+        self.assertQuerySetEqual(
+            Reunion.objects.descendientes(otra_raiz).order_by("pk"), [actividad, tarea]
+        )
+
+
+class ResumenVencimientosTests(TestCase):
+    def setUp(self):
+        usuario = User.objects.create_user("responsable", email="responsable@example.org")
+        grupo = GrupoTrabajo.objects.create(nombre="Grupo")
+        reunion = Reunion.objects.create(
+            titulo="Vencida", grupo_trabajo=grupo, fecha_finalizacion=timezone.now() - timedelta(days=1),
+        )
+        reunion.responsables.add(usuario)
+        self.hoy = timezone.localdate()
+        self.lote = list(resumenes(self.hoy, 3))
+
+    def comando(self):
+        comando = EnviarResumenCommand(stdout=io.StringIO(), stderr=io.StringIO())
+        comando.hoy = self.hoy
+        comando.enviados = comando.fallidos = 0
+        return comando
+
+    def registrar(self, comando, resultado):
+        futuro = Future()
+        if isinstance(resultado, Exception):
+            futuro.set_exception(resultado)
+        else:
+            futuro.set_result(resultado)
+        comando._registrar(futuro, self.lote)
+
+    def test_reclamo_y_liberacion(self):
+        self.assertEqual(len(self.lote), 1)
+        primero, segundo = self.comando(), self.comando()
+        self.assertEqual(primero._reclamar(self.lote), self.lote)
+        # Otra ejecución simultánea no se lleva el mismo resumen
+        self.assertEqual(segundo._reclamar(self.lote), [])
+
+        # Un envío fallido libera el reclamo para reintentarlo
+        self.registrar(primero, GraphError("sin conexión"))
+        self.assertEqual(primero.fallidos, 1)
+        self.assertEqual(segundo._reclamar(self.lote), self.lote)
+
+        self.registrar(segundo, [202])
+        self.assertEqual(segundo.enviados, 1)
+        self.assertEqual(primero._reclamar(self.lote), [])
+        self.assertEqual(list(resumenes(self.hoy, 3)), [])
+
+    def test_reclamo_caducado(self):
+        self.comando()._reclamar(self.lote)
+        EnvioResumenVencimientos.objects.update(reclamado=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.comando()._reclamar(self.lote), self.lote)
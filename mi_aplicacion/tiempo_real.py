@@ -0,0 +1,242 @@
+# mi_aplicacion/tiempo_real.py
+# Actualizaciones en vivo del hilo de una reunión por server-sent events
+# (ver ReunionEventosView, solo bajo ASGI).
+#
+# Las señales publican un evento pequeño ({"reunion", "tipo", "id"}) cuando
+# se confirma la transacción. El backend lo hace llegar a cada proceso:
+#   - BackendLocal: solo al propio proceso (un único worker ASGI).
+#   - BackendPostgres: a todos los procesos, con LISTEN/NOTIFY.
+# En cada proceso el Difusor renderiza el fragmento HTML una sola vez y lo
+# reparte entre las conexiones abiertas de esa reunión. Cada conexión tiene
+# una cola acotada: si el cliente no la vacía se descarta y se le pide
+# recargar, así un cliente lento no hace crecer la memoria.
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.template.loader import render_to_string
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Segundos entre comentarios de keep-alive (mantienen abiertos los proxies)
+INTERVALO_PING = 25
+# Duración máxima de una conexión: EventSource reconecta solo, y así no
+# quedan flujos huérfanos si el servidor no avisa de la desconexión
+DURACION_MAXIMA = 10 * 60
+
+# Marca en la cola de una conexión que se desbordó
+DESBORDADA = object()
+
+
+def _tamano_cola():
+    return getattr(settings, "TIEMPO_REAL_COLA", 50)
+
+
+class Suscripcion:
+    """Una conexión SSE abierta: su cola y el event loop que la consume."""
+
+    __slots__ = ("reunion_id", "cola", "loop", "desbordada")
+
+    def __init__(self, reunion_id):
+        self.reunion_id = reunion_id
+        self.cola = asyncio.Queue(maxsize=_tamano_cola())
+        self.loop = asyncio.get_running_loop()
+        self.desbordada = False
+
+    def entregar(self, mensaje):
+        # Se ejecuta en el loop de la conexión (call_soon_threadsafe)
+        if self.desbordada:
+            return
+        try:
+            self.cola.put_nowait(mensaje)
+        except asyncio.QueueFull:
+            self.desbordada = True
+            while not self.cola.empty():
+                self.cola.get_nowait()
+            self.cola.put_nowait(DESBORDADA)
+
+
+class Difusor:
+    """Reparte los eventos entre las conexiones abiertas de este proceso."""
+
+    def __init__(self):
+        self._suscripciones = {}
+        self._lock = threading.Lock()
+
+    def suscribir(self, reunion_id):
+        suscripcion = Suscripcion(reunion_id)
+        with self._lock:
+            self._suscripciones.setdefault(reunion_id, set()).add(suscripcion)
+        return suscripcion
+
+    def cancelar(self, suscripcion):
+        with self._lock:
+            conjunto = self._suscripciones.get(suscripcion.reunion_id)
+            if conjunto is not None:
+                conjunto.discard(suscripcion)
+                if not conjunto:
+                    del self._suscripciones[suscripcion.reunion_id]
+
+    def conexiones(self, reunion_id=None):
+        with self._lock:
+            if reunion_id is None:
+                return sum(len(c) for c in self._suscripciones.values())
+            return len(self._suscripciones.get(reunion_id, ()))
+
+    def recibir(self, evento):
+        """Llamado por el backend (desde cualquier hilo) con cada evento publicado."""
+        with self._lock:
+            destinos = list(self._suscripciones.get(evento["reunion"], ()))
+        if not destinos:
+            return
+        mensaje = renderizar_evento(evento)
+        if mensaje is None:
+            return
+        for suscripcion in destinos:
+            try:
+                suscripcion.loop.call_soon_threadsafe(suscripcion.entregar, mensaje)
+            except RuntimeError:
+                # Loop cerrado: la conexión ya terminó
+                self.cancelar(suscripcion)
+
+
+def renderizar_evento(evento):
+    """Mensaje SSE (texto) con el fragmento HTML de la intervención o el comentario."""
+    from .forms import ComentarioForm
+    from .models import Comentario, Intervencion
+
+    if evento["tipo"] == "intervencion":
+        intervencion = (
+            Intervencion.objects
+            .select_related("autor")
+            .prefetch_related("documentos")
+            .filter(pk=evento["id"])
+            .first()
+        )
+        if intervencion is None:
+            return None
+        datos = {
+            "id": intervencion.pk,
+            "html": render_to_string("mi_aplicacion/parciales/intervencion.html", {
+                "intervencion": intervencion,
+                "comentario_form": ComentarioForm(prefix=str(intervencion.pk)),
+                "en_vivo": True,
+            }),
+        }
+    else:
+        comentario = Comentario.objects.select_related("autor").filter(pk=evento["id"]).first()
+        if comentario is None:
+            return None
+        datos = {
+            "id": comentario.pk,
+            "intervencion": comentario.intervencion_id,
+            "html": render_to_string("mi_aplicacion/parciales/comentario.html", {"comentario": comentario}),
+        }
+    return f"event: {evento['tipo']}\ndata: {json.dumps(datos)}\n\n"
+
+
+class BackendLocal:
+    """Entrega directa al Difusor del propio proceso."""
+
+    def __init__(self, difusor):
+        self.difusor = difusor
+
+    def iniciar(self):
+        pass
+
+    def publicar(self, evento):
+        self.difusor.recibir(evento)
+
+
+class BackendPostgres:
+    """
+    NOTIFY al publicar y un hilo por proceso con LISTEN que entrega al
+    Difusor local: funciona con varios workers ASGI sin otro servicio.
+    """
+
+    CANAL = "reuniones_tiempo_real"
+
+    def __init__(self, difusor):
+        self.difusor = difusor
+        self._hilo = None
+        self._lock = threading.Lock()
+
+    def iniciar(self):
+        with self._lock:
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._escuchar, name="tiempo-real", daemon=True)
+                self._hilo.start()
+
+    def publicar(self, evento):
+        with connections["default"].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.CANAL, json.dumps(evento)])
+
+    def _escuchar(self):
+        import psycopg2
+        import psycopg2.extensions
+
+        while True:
+            try:
+                conexion = psycopg2.connect(**connections["default"].get_connection_params())
+                conexion.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conexion.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.CANAL}")
+                while True:
+                    if select.select([conexion], [], [], 60) == ([], [], []):
+                        continue
+                    conexion.poll()
+                    while conexion.notifies:
+                        aviso = conexion.notifies.pop(0)
+                        close_old_connections()
+                        self.difusor.recibir(json.loads(aviso.payload))
+            except Exception:
+                logger.exception("Escucha de eventos en vivo interrumpida; se reintenta")
+                time.sleep(5)
+
+
+difusor = Difusor()
+_backend = None
+
+
+def backend():
+    global _backend
+    if _backend is None:
+        ruta = getattr(settings, "TIEMPO_REAL_BACKEND", "mi_aplicacion.tiempo_real.BackendLocal")
+        _backend = import_string(ruta)(difusor)
+    return _backend
+
+
+def publicar(evento):
+    """Publica un evento; un fallo aquí nunca debe romper la petición que lo originó."""
+    try:
+        backend().publicar(evento)
+    except Exception:
+        logger.exception("No se pudo publicar el evento %s", evento)
+
+
+async def flujo_eventos(reunion_id):
+    """Generador asíncrono del cuerpo SSE de una conexión."""
+    backend().iniciar()
+    suscripcion = difusor.suscribir(reunion_id)
+    loop = asyncio.get_running_loop()
+    fin = loop.time() + DURACION_MAXIMA
+    try:
+        yield "retry: 5000\n\n"
+        while loop.time() < fin:
+            try:
+                mensaje = await asyncio.wait_for(suscripcion.cola.get(), INTERVALO_PING)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if mensaje is DESBORDADA:
+                yield "event: recargar\ndata: {}\n\n"
+                return
+            yield mensaje
+    finally:
+        difusor.cancelar(suscripcion)
@@ -7,7 +7,13 @@ from .views import (
     GraficoReunionesView, ExportarReunionesExcelView,
     SitioConstruccionView, ActaReunionPDFView,
     DocumentosView, ActasPorProyectoView,HomeView,ExportarProyectoPDF, ProyectoListView,
-    ProyectoDetailView, ProyectoCreateView, ProyectoUpdateView, ProyectoDeleteView,OIDCLogoutView, ReunionCreateView
+    ProyectoDetailView, ProyectoCreateView, ProyectoUpdateView, ProyectoDeleteView,OIDCLogoutView, ReunionCreateView,
+    ExportarActasProyectoZipView, ExportarDatosView, BuscarResponsablesView,
+    BuscarProyectosView, BuscarFrentesView, BuscarActividadesView, BuscarUsuariosView,
+    BuscarGruposView, BuscarEtiquetasView, BuscarDocumentosView, ReunionEventosView,
+    ReunionIntervencionesView, IntervencionComentariosView,
+    DescargarDocumentoView, DescargarDocumentoIntervencionView,
+    VistaPreviaDocumentoView, VistaPreviaDocumentoIntervencionView, SubidaCrearView, SubidaView,
 )
 
 app_name = 'mi_aplicacion'
@@ -15,15 +21,38 @@ app_name = 'mi_aplicacion'
 urlpatterns = [
     path('reuniones/', ReunionListView.as_view(), name='reunion_list'),
     path('reuniones/<int:pk>/', ReunionDetailView.as_view(), name='reunion_detail'),
+    path('reuniones/<int:pk>/eventos/', ReunionEventosView.as_view(), name='reunion_eventos'),
+    path('reuniones/<int:pk>/intervenciones/', ReunionIntervencionesView.as_view(), name='reunion_intervenciones'),
+    path('intervenciones/<int:pk>/comentarios/', IntervencionComentariosView.as_view(), name='intervencion_comentarios'),
+    path('documentos/<int:pk>/descargar/', DescargarDocumentoView.as_view(), name='descargar_documento'),
+    path('intervenciones/documentos/<int:pk>/descargar/', DescargarDocumentoIntervencionView.as_view(),
+         name='descargar_documento_intervencion'),
+    path('documentos/<int:pk>/vista-previa/', VistaPreviaDocumentoView.as_view(), name='vista_previa_documento'),
+    path('intervenciones/documentos/<int:pk>/vista-previa/', VistaPreviaDocumentoIntervencionView.as_view(),
+         name='vista_previa_documento_intervencion'),
+    # Subidas por partes de documentos de intervenciones (subidas.py)
+    path('subidas/', SubidaCrearView.as_view(), name='subidas'),
+    path('subidas/<uuid:pk>/', SubidaView.as_view(), name='subida'),
     path("reuniones/informe/", ListaReunionesView.as_view(), name="lista_reuniones_info"),
     path('reuniones/grafico/', GraficoReunionesView.as_view(), name='grafico_reuniones'),
+    path('responsables/buscar/', BuscarResponsablesView.as_view(), name='buscar_responsables'),
+    # Autocompletado del formulario de reuniones
+    path('proyectos/buscar/', BuscarProyectosView.as_view(), name='buscar_proyectos'),
+    path('frentes/buscar/', BuscarFrentesView.as_view(), name='buscar_frentes'),
+    path('actividades/buscar/', BuscarActividadesView.as_view(), name='buscar_actividades'),
+    path('usuarios/buscar/', BuscarUsuariosView.as_view(), name='buscar_usuarios'),
+    path('grupos/buscar/', BuscarGruposView.as_view(), name='buscar_grupos'),
+    path('etiquetas/buscar/', BuscarEtiquetasView.as_view(), name='buscar_etiquetas'),
+    path('documentos/buscar/', BuscarDocumentosView.as_view(), name='buscar_documentos'),
     path("exportar_excel/", ExportarReunionesExcelView.as_view(), name="exportar_excel"),
+    path("exportar/<str:modelo>.<str:formato>", ExportarDatosView.as_view(), name="exportar_datos"),
     path('construccion/', SitioConstruccionView.as_view(), name='sitio_construccion'),
     path('acta/<int:pk>/pdf/', ActaReunionPDFView.as_view(), name='acta_pdf'),
     path('documentos/', DocumentosView.as_view(), name='documentos'),
     path('actas/', ActasPorProyectoView.as_view(), name='actas_por_proyecto'),
     path('', HomeView.as_view(), name='home'),
     path('proyecto/<int:pk>/exportar_pdf/', ExportarProyectoPDF.as_view(), name='exportar_proyecto_pdf'),
+    path('proyecto/<int:pk>/actas_zip/', ExportarActasProyectoZipView.as_view(), name='exportar_actas_zip'),
     # path(
     #     "accounts/login/",
     #     auth_views.LoginView.as_view(template_name="mi_aplicacion/login.html"),
@@ -1,9 +1,17 @@
+import time
+
 import requests
 from django.core.exceptions import ObjectDoesNotExist
 from mi_aplicacion.models import GraphMailConfig
 
 TOKEN_URL = "https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
 GRAPH_SEND_URL = "https://graph.microsoft.com/v1.0/users/{user_email}/sendMail"
+GRAPH_BATCH_URL = "https://graph.microsoft.com/v1.0/$batch"
+
+# Máximo de peticiones por llamada a $batch (límite de Graph)
+MAX_LOTE = 20
+# Espera máxima ante un 429 (Retry-After) antes de reintentar un lote
+MAX_ESPERA_REINTENTO = 30
 
 
 class GraphError(Exception):
@@ -34,20 +42,26 @@ def get_graph_token(config):
     return resp.json().get("access_token")
 
 
-def send_mail_graph(subject, body, content_type="Text"):
-    config = get_active_config()
-    token = get_graph_token(config)
-    url = GRAPH_SEND_URL.format(user_email=config.email_send)
-
-    message = {
+def build_message(subject, body, to, content_type="Text"):
+    """Cuerpo de sendMail para la lista de direcciones `to`."""
+    return {
         "message": {
             "subject": subject,
             "body": {"contentType": content_type, "content": body},
-            "toRecipients": [{"emailAddress": {"address": config.email_receive}}],
+            "toRecipients": [{"emailAddress": {"address": address}} for address in to],
         },
         "saveToSentItems": True,
     }
 
+
+def send_mail_graph(subject, body, content_type="Text", to=None):
+    """Envía un correo; sin `to` va a config.email_receive."""
+    config = get_active_config()
+    token = get_graph_token(config)
+    url = GRAPH_SEND_URL.format(user_email=config.email_send)
+
+    message = build_message(subject, body, to or [config.email_receive], content_type)
+
     headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json",
@@ -58,3 +72,46 @@ def send_mail_graph(subject, body, content_type="Text"):
         raise GraphError(f"sendMail falló: {r.status_code} - {r.text}")
 
     return {"status": "ok", "code": r.status_code}
+
+
+def send_mail_batch_graph(messages, config, token, session=None):
+    """
+    Envía hasta MAX_LOTE mensajes (cuerpos de build_message) en una sola
+    llamada a $batch. Devuelve el código HTTP de cada mensaje, en orden.
+    Los que Graph rechaza por límite de peticiones (429) se reintentan una
+    vez tras el Retry-After indicado.
+    """
+    if len(messages) > MAX_LOTE:
+        raise ValueError(f"Un lote admite como máximo {MAX_LOTE} mensajes.")
+
+    http = session or requests
+    url = f"/users/{config.email_send}/sendMail"
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    codes = {}
+    pending = dict(enumerate(messages))
+
+    for attempt in range(2):
+        payload = {
+            "requests": [
+                {"id": str(i), "method": "POST", "url": url, "body": message,
+                 "headers": {"Content-Type": "application/json"}}
+                for i, message in pending.items()
+            ]
+        }
+        r = http.post(GRAPH_BATCH_URL, headers=headers, json=payload, timeout=30)
+        if r.status_code != 200:
+            raise GraphError(f"$batch falló: {r.status_code} - {r.text}")
+
+        wait = 0
+        for response in r.json().get("responses", []):
+            i = int(response["id"])
+            codes[i] = response["status"]
+            if response["status"] == 429:
+                retry_after = (response.get("headers") or {}).get("Retry-After", 1)
+                wait = max(wait, int(float(retry_after)))
+        pending = {i: m for i, m in pending.items() if codes.get(i) == 429}
+        if not pending or attempt:
+            break
+        time.sleep(min(wait, MAX_ESPERA_REINTENTO))
+
+    return [codes.get(i, 0) for i in range(len(messages))]
@@ -6,18 +6,22 @@ from itertools import groupby
 from operator import attrgetter
 
 # Django
+from asgiref.sync import sync_to_async
 from django import forms
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model, logout
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.contrib.staticfiles import finders
-from django.db.models import Count, Prefetch, Q
-from django.http import Http404, HttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import InvalidPage
+from django.db.models import Count, Exists, F, IntegerField, Max, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
 from django.utils.dateparse import parse_date
+from django.utils.http import urlencode
 from django.views import View
 from django.views.generic import (
     CreateView,
@@ -30,36 +34,33 @@ from django.views.generic import (
 from django.views.generic.edit import FormView
 from django.core.exceptions import PermissionDenied
 
-# third-party
-import openpyxl
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.units import cm, inch
-from reportlab.pdfgen import canvas
-from reportlab.platypus import (
-    HRFlowable,
-    Image,
-    ListFlowable,
-    ListItem,
-    PageBreak,
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-    Table,
-    TableStyle,
-)
-
 # local (web)
+from . import biblioteca, filtros, subidas, tiempo_real
+from .condicional import GetCondicionalMixin
+from .descargas import responder_archivo, responder_cache
 from .forms import (
     ComentarioForm,
     IntervencionDocumentoForm,
     IntervencionForm,
     ReunionForm,
 )
-from .models import Comentario, Frente, Intervencion, Proyecto, Reunion
+from .models import (
+    Comentario,
+    Documento,
+    DocumentoBiblioteca,
+    Etiqueta,
+    Frente,
+    GrupoTrabajo,
+    Intervencion,
+    IntervencionDocumento,
+    Proyecto,
+    Reunion,
+    SubidaParcial,
+)
+from .paginacion import pagina_por_cursor
+from .reportes.flujos import EXPORTABLES, FORMATOS, agenerar_exportacion, en_hilo, generar_exportacion
 from .utils.graph_mail import send_mail_graph, GraphError
+from .vistas_previas import ruta_vista_previa
 
 
 
@@ -79,47 +80,43 @@ class ReunionListView(ListView):
             '-fecha'
         )
 
-        # Filtro por proyecto
-        proyecto_pk = self.request.GET.get('proyecto')
-        if proyecto_pk:
-            try:
-                qs = qs.filter(proyecto_id=int(proyecto_pk))
-            except (ValueError, TypeError):
-                pass
-
-        # Filtro por frente
-        frente_pk = self.request.GET.get('frente')
-        if frente_pk:
-            try:
-                qs = qs.filter(frente_id=int(frente_pk))
-            except (ValueError, TypeError):
-                pass
-
-        # 🔹 Filtro por responsable
-        responsable_pk = self.request.GET.get('responsable')
-        if responsable_pk:
-            try:
-                qs = qs.filter(responsables__id=int(responsable_pk))
-            except (ValueError, TypeError):
-                pass
-
-        return qs
+        # Filtros por proyecto, frente, responsables, etiquetas y grupo
+        # (EXISTS: sin filas duplicadas al filtrar por varios responsables)
+        return qs.filtrar(self.request.GET)
+
+    async def get(self, request, *args, **kwargs):
+        # El conteo y las filas de la página se leen con el ORM asíncrono; el
+        # resto del contexto y la plantilla no consultan la base de datos
+        self.object_list = self.get_queryset()
+        paginator = self.get_paginator(self.object_list, self.paginate_by)
+        paginator.count = await self.object_list.acount()
+        try:
+            pagina = paginator.page(request.GET.get(self.page_kwarg) or 1)
+        except InvalidPage:
+            raise Http404("Página no válida")
+        pagina.object_list = [reunion async for reunion in pagina.object_list]
+        self.pagina = pagina
+
+        context = await sync_to_async(self.get_context_data)()
+        response = self.render_to_response(context)
+        await sync_to_async(response.render)()
+        return response
+
+    def paginate_queryset(self, queryset, page_size):
+        # Página ya resuelta en get()
+        return self.pagina.paginator, self.pagina, self.pagina.object_list, self.pagina.has_other_pages()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         # Proyectos para el filtro
-        context['proyectos'] = Proyecto.objects.order_by('nombre')
+        context['proyectos'] = filtros.proyectos()
         context['proyecto_actual'] = self.request.GET.get('proyecto', '')
         context['frente_actual'] = self.request.GET.get('frente', '')
 
-        # 🔹 Responsables para el filtro
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        context['responsables'] = User.objects.filter(
-            reuniones_responsables__isnull=False
-        ).distinct().order_by('first_name', 'last_name')
+        # 🔹 Responsable seleccionado (el resto se busca con autocompletado)
         context['responsable_actual'] = self.request.GET.get('responsable', '')
+        context['responsable_nombre'] = filtros.nombre_responsable(context['responsable_actual'])
 
         # Agrupar reuniones de la página actual por frente
         page_qs = context.get('page_obj').object_list if context.get('page_obj') else list(context.get('reuniones', []))
@@ -151,7 +148,52 @@ class ReunionListView(ListView):
         context['grouped_reuniones'] = grouped
 
         return context
-class ReunionDetailView(LoginRequiredMixin,DetailView):
+# El hilo de una reunión se muestra por páginas: la de detalle trae solo las
+# últimas intervenciones y los comentarios se cargan al abrirlos
+INTERVENCIONES_POR_PAGINA = 20
+COMENTARIOS_POR_PAGINA = 50
+
+
+def _conteo_comentarios():
+    comentarios = (
+        Comentario.objects
+        .filter(intervencion=OuterRef("pk"))
+        .order_by()
+        .values("intervencion")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return Coalesce(Subquery(comentarios, output_field=IntegerField()), 0)
+
+
+def pagina_intervenciones(reunion_id, cursor=None):
+    """
+    Contexto de parciales/intervenciones.html: las intervenciones anteriores
+    a `cursor` (las últimas si no hay), en orden cronológico.
+    """
+    queryset = (
+        Intervencion.objects
+        .filter(reunion_id=reunion_id)
+        .select_related("autor")
+        .prefetch_related("documentos")
+        .annotate(num_comentarios=_conteo_comentarios())
+    )
+    intervenciones, siguiente = pagina_por_cursor(
+        queryset, cursor, INTERVENCIONES_POR_PAGINA, campo="fecha_creacion"
+    )
+    intervenciones.reverse()
+    return {
+        "reunion_id": reunion_id,
+        "intervenciones": intervenciones,
+        "siguiente_cursor": siguiente,
+        "comentario_forms": {
+            intervencion.pk: ComentarioForm(prefix=str(intervencion.pk))
+            for intervencion in intervenciones
+        },
+    }
+
+
+class ReunionDetailView(LoginRequiredMixin, DetailView):
     model = Reunion
     template_name = 'mi_aplicacion/reunion_detail.html'
     context_object_name = 'reunion'
@@ -170,28 +212,32 @@ class ReunionDetailView(LoginRequiredMixin,DetailView):
             reunion.dias_restantes = None
             reunion.estado_vencida = False
 
+        # 🔹 Últimas intervenciones (las anteriores se piden con ReunionIntervencionesView)
+        context.update(pagina_intervenciones(reunion.pk))
+
         # 🔹 Formularios
         context['form_intervencion'] = IntervencionForm()
         context['form_documento'] = IntervencionDocumentoForm()
-        context['comentario_forms'] = {
-            intervencion.pk: ComentarioForm(prefix=str(intervencion.pk))
-            for intervencion in reunion.intervenciones.all()
-        }
+        context['subida_bloque'] = subidas.tamano_bloque()
         return context
 
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
 
-        # 1️⃣ Manejar comentarios
-        for intervencion in self.object.intervenciones.all():
-            prefix = str(intervencion.pk)
-            form = ComentarioForm(request.POST, prefix=prefix)
+        # 1️⃣ Manejar comentarios (el modal indica a qué intervención responde)
+        intervencion_id = request.POST.get('intervencion', '')
+        intervencion = (
+            self.object.intervenciones.filter(pk=intervencion_id).first()
+            if intervencion_id.isdigit() else None
+        )
+        if intervencion is not None:
+            form = ComentarioForm(request.POST, prefix=str(intervencion.pk))
             if form.is_valid():
                 comentario = form.save(commit=False)
                 comentario.intervencion = intervencion
                 comentario.autor = request.user
                 comentario.save()
-                return redirect('mi_aplicacion:reunion_detail', pk=self.object.pk)
+                return self._respuesta_guardado()
 
         # 2️⃣ Manejar intervención nueva con documento
         form_intervencion = IntervencionForm(request.POST)
@@ -208,13 +254,75 @@ class ReunionDetailView(LoginRequiredMixin,DetailView):
                 doc.intervencion = intervencion
                 doc.save()
 
-            return redirect('mi_aplicacion:reunion_detail', pk=self.object.pk)
+            return self._respuesta_guardado()
 
-        # 3️⃣ Si algo falla, recargar la página con errores
+        # 3️⃣ Si algo falla, recargar la página con errores (reunion_en_vivo.js
+        # los muestra en el formulario sin volver a enviarlo)
+        if _es_ajax(request):
+            errores = form if intervencion is not None else form_intervencion
+            return JsonResponse({'errores': errores.errors.get_json_data()}, status=400)
         context = self.get_context_data()
         context['form_intervencion'] = form_intervencion
         context['form_documento'] = form_documento
-        return self.render_to_response(context) 
+        return self.render_to_response(context)
+
+    def _respuesta_guardado(self):
+        # Con la página en vivo el fragmento nuevo llega por ReunionEventosView
+        if _es_ajax(self.request):
+            return HttpResponse(status=204)
+        return redirect('mi_aplicacion:reunion_detail', pk=self.object.pk)
+
+
+def _es_ajax(request):
+    return request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+
+
+class ReunionIntervencionesView(LoginRequiredMixin, View):
+    """Fragmento HTML con las intervenciones anteriores a ?despues=<cursor>."""
+
+    def get(self, request, pk):
+        contexto = pagina_intervenciones(pk, request.GET.get('despues'))
+        return render(request, 'mi_aplicacion/parciales/intervenciones.html', contexto)
+
+
+class IntervencionComentariosView(LoginRequiredMixin, View):
+    """Fragmento HTML con los comentarios de una intervención, por páginas."""
+
+    def get(self, request, pk):
+        queryset = Comentario.objects.filter(intervencion_id=pk).select_related('autor')
+        comentarios, siguiente = pagina_por_cursor(
+            queryset, request.GET.get('despues'), COMENTARIOS_POR_PAGINA, campo='fecha_creacion'
+        )
+        comentarios.reverse()
+        return render(request, 'mi_aplicacion/parciales/comentarios.html', {
+            'intervencion_id': pk,
+            'comentarios': comentarios,
+            'siguiente_cursor': siguiente,
+        })
+
+
+class ReunionEventosView(View):
+    """
+    Server-sent events con las intervenciones y comentarios nuevos de una
+    reunión (ver tiempo_real.py). Solo bajo ASGI: con WSGI cada conexión
+    ocuparía un worker, así que se responde 204 y EventSource no reintenta.
+    """
+
+    async def get(self, request, pk):
+        if not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+        autenticado = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not autenticado:
+            return HttpResponse(status=403)
+        if not await Reunion.objects.filter(pk=pk).aexists():
+            raise Http404
+
+        response = StreamingHttpResponse(tiempo_real.flujo_eventos(pk), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # nginx: no acumular el flujo
+        return response
+
+
 class ListaReunionesView(ListView):
     model = Reunion
     template_name = "mi_aplicacion/lista_reuniones_info.html"
@@ -223,20 +331,8 @@ class ListaReunionesView(ListView):
     def get_queryset(self):
         queryset = super().get_queryset().select_related("proyecto", "frente", "grupo_trabajo").prefetch_related("responsables")
 
-        # Capturar filtros del request
-        estado = self.request.GET.get("estado")
-        proyecto = self.request.GET.get("proyecto")
-        frente = self.request.GET.get("frente")
-        responsable = self.request.GET.get("responsable")
-
-        if estado:
-            queryset = queryset.filter(estado=estado)
-        if proyecto:
-            queryset = queryset.filter(proyecto_id=proyecto)
-        if frente:
-            queryset = queryset.filter(frente_id=frente)
-        if responsable:
-            queryset = queryset.filter(responsables__id=responsable)
+        # Filtros del request (estado, proyecto, frente, responsables, etiquetas, grupo)
+        queryset = queryset.filtrar(self.request.GET)
 
         # Calcular días restantes o vencido
         hoy = date.today()
@@ -256,529 +352,568 @@ class ListaReunionesView(ListView):
 
         # Valores disponibles para los select
         context["estados_disponibles"] = [e[0] for e in Reunion.ESTADOS]  # ejemplo: ["pendiente", "en_progreso", "cerrada"]
-        context["proyectos_disponibles"] = Proyecto.objects.all()
-        context["frentes_disponibles"] = Frente.objects.all()
-        User = get_user_model()
-        context["responsables_disponibles"] = User.objects.all()
+        context["proyectos_disponibles"] = filtros.proyectos()
+        context["frentes_disponibles"] = filtros.frentes()
 
         # Mantener selección actual
         context["estado_actual"] = self.request.GET.get("estado", "")
         context["proyecto_actual"] = self.request.GET.get("proyecto", "")
         context["frente_actual"] = self.request.GET.get("frente", "")
         context["responsable_actual"] = self.request.GET.get("responsable", "")
+        context["responsable_nombre"] = filtros.nombre_responsable(context["responsable_actual"])
 
         return context
     
-class ExportarReunionesExcelView(View):
+class ExportarReunionesExcelView(GetCondicionalMixin, View):
+    def version_recurso(self):
+        # El número de filas cambia si se borra alguna (el máximo puede no
+        # cambiar); el del proyecto, si se renombra alguno
+        resumen = Reunion.objects.filtrar(self.request.GET).aggregate(
+            ultima=Max('updated_at'), proyecto=Max('proyecto__updated_at'), total=Count('id')
+        )
+        fechas = [f for f in (resumen['ultima'], resumen['proyecto']) if f]
+        return (max(fechas) if fechas else None), resumen['total']
+
     def get(self, request, *args, **kwargs):
-        # Filtrar por estado, proyecto y frente si vienen en la URL
-        estado = request.GET.get("estado")
-        proyecto_id = request.GET.get("proyecto")
-        frente_id = request.GET.get("frente")
+        # openpyxl se carga bajo demanda, solo cuando se exporta
+        from .reportes.excel import generar_reuniones_excel
 
-        reuniones = Reunion.objects.all()
-
-        if estado:
-            reuniones = reuniones.filter(estado=estado)
-        if proyecto_id:
-            reuniones = reuniones.filter(proyecto_id=proyecto_id)
-        if frente_id:
-            reuniones = reuniones.filter(frente_id=frente_id)
-
-        # Crear libro y hoja
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Actividades"
-
-        # Encabezados
-        ws.append([
-            "ID", "Título", "Proyecto", "Frente", "Grupo",
-            "Fecha Inicio", "Fecha Finalización", "Estado",
-            "Etiquetas", "Descripción", "Vencido", "Tiempo Restante"
-        ])
-
-        # Filas con datos
-        for r in reuniones:
-            etiquetas_texto = ", ".join(str(e) for e in r.etiquetas.all())
-
-            # Valores por defecto
-            vencido = "N/A"
-            tiempo_texto = ""
-
-            if r.fecha_finalizacion:
-                dias_restantes = (r.fecha_finalizacion.date() - date.today()).days
-
-                if dias_restantes < 0:
-                    vencido = "Sí"
-                    tiempo_texto = f"Vencido hace {abs(dias_restantes)} días"
-                elif dias_restantes == 0:
-                    vencido = "No"
-                    tiempo_texto = "Vence hoy"
-                else:
-                    vencido = "No"
-                    tiempo_texto = f"Faltan {dias_restantes} días"
-
-            ws.append([
-                r.id,
-                r.titulo,
-                r.proyecto.nombre if r.proyecto else "",
-                r.frente.nombre if r.frente else "",
-                r.grupo_trabajo.nombre if r.grupo_trabajo else "",
-                r.fecha.strftime("%d/%m/%Y") if r.fecha else "",
-                r.fecha_finalizacion.strftime("%d/%m/%Y") if r.fecha_finalizacion else "",
-                r.estado,
-                etiquetas_texto,
-                r.descripcion or "",
-                vencido,
-                tiempo_texto,
-            ])
+        # Mismos filtros que el listado
+        reuniones = Reunion.objects.filtrar(request.GET)
 
         # Preparar respuesta HTTP
         response = HttpResponse(
             content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
         response["Content-Disposition"] = 'attachment; filename="Actividades.xlsx"'
-        wb.save(response)
+        generar_reuniones_excel(reuniones, response)
         return response
     
+class ExportarDatosView(LoginRequiredMixin, View):
+    """
+    Exportación masiva en CSV o JSON Lines (reuniones, intervenciones o
+    comentarios) con los mismos filtros que los listados, limitada a las
+    reuniones a las que tiene acceso el usuario. Se envía por bloques y con
+    ?gzip=1 se descarga comprimida.
+    """
+
+    def get(self, request, modelo, formato, *args, **kwargs):
+        if modelo not in EXPORTABLES or formato not in FORMATOS:
+            raise Http404("Exportación no disponible")
+
+        comprimir = request.GET.get("gzip") in ("1", "true", "si")
+        nombre_archivo = f"{modelo}.{formato}"
+        content_type = FORMATOS[formato]
+        if comprimir:
+            nombre_archivo += ".gz"
+            content_type = "application/gzip"
+
+        # Bajo ASGI las filas se leen con el ORM asíncrono
+        generador = agenerar_exportacion if isinstance(request, ASGIRequest) else generar_exportacion
+        response = StreamingHttpResponse(
+            generador(modelo, formato, request.GET, gzip=comprimir, usuario=request.user),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="{nombre_archivo}"'
+        return response
+
+class BuscarOpcionesView(View):
+    """
+    Base de los endpoints de autocompletado (static/js/autocompletar.js):
+    ?q=texto&pagina=N → {"resultados": [{"id", "texto"}], "mas": bool}.
+    """
+
+    def buscar(self, q, pagina):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        try:
+            pagina = int(request.GET.get("pagina", 1))
+        except (TypeError, ValueError):
+            pagina = 1
+        resultados, hay_mas = self.buscar(request.GET.get("q", ""), pagina)
+        return JsonResponse({"resultados": resultados, "mas": hay_mas})
+
+
+class BuscarResponsablesView(LoginRequiredMixin, BuscarOpcionesView):
+    """Autocompletado de responsables para los filtros."""
+
+    def buscar(self, q, pagina):
+        return filtros.buscar_responsables(q, pagina)
+
+
+class BuscarProyectosView(LoginRequiredMixin, BuscarOpcionesView):
+    def buscar(self, q, pagina):
+        resultados, hay_mas = filtros.paginar(filtros.proyectos(), q, pagina, texto="nombre")
+        return [{"id": p["id"], "texto": p["nombre"]} for p in resultados], hay_mas
+
+
+class BuscarFrentesView(LoginRequiredMixin, BuscarOpcionesView):
+    # Los frentes no dependen del proyecto (Frente no tiene proyecto): lista global en caché
+    def buscar(self, q, pagina):
+        resultados, hay_mas = filtros.paginar(filtros.frentes(), q, pagina, texto="nombre")
+        return [{"id": f["id"], "texto": f["nombre"]} for f in resultados], hay_mas
+
+
+class BuscarActividadesView(LoginRequiredMixin, BuscarOpcionesView):
+    """Actividades del proyecto (?proyecto=ID) que pueden ser padre de una tarea."""
+
+    def buscar(self, q, pagina):
+        try:
+            proyecto_id = int(self.request.GET.get("proyecto", ""))
+        except ValueError:
+            return [], False
+        return filtros.paginar(filtros.actividades(proyecto_id), q, pagina)
+
+
+class BuscarUsuariosView(LoginRequiredMixin, BuscarOpcionesView):
+    def buscar(self, q, pagina):
+        usuarios = get_user_model().objects.filter(is_active=True)
+        if q:
+            usuarios = usuarios.filter(
+                Q(username__icontains=q) | Q(first_name__icontains=q) | Q(last_name__icontains=q)
+            )
+        inicio = (max(pagina, 1) - 1) * filtros.RESULTADOS_POR_PAGINA
+        filas = list(
+            usuarios.order_by("first_name", "last_name", "username")
+            .values_list("pk", "first_name", "last_name", "username")[inicio:inicio + filtros.RESULTADOS_POR_PAGINA + 1]
+        )
+        resultados = [
+            {"id": pk, "texto": f"{nombre} {apellido}".strip() or usuario}
+            for pk, nombre, apellido, usuario in filas[:filtros.RESULTADOS_POR_PAGINA]
+        ]
+        return resultados, len(filas) > filtros.RESULTADOS_POR_PAGINA
+
+
+class BuscarGruposView(LoginRequiredMixin, BuscarOpcionesView):
+    def buscar(self, q, pagina):
+        return filtros.buscar_en_bd(GrupoTrabajo.objects.all(), "nombre", q, pagina)
+
+
+class BuscarEtiquetasView(LoginRequiredMixin, BuscarOpcionesView):
+    def buscar(self, q, pagina):
+        return filtros.buscar_en_bd(Etiqueta.objects.all(), "nombre", q, pagina)
+
+
+class BuscarDocumentosView(LoginRequiredMixin, BuscarOpcionesView):
+    def buscar(self, q, pagina):
+        return filtros.buscar_en_bd(Documento.objects.all(), "nombre", q, pagina)
+
 class SitioConstruccionView(View):
     template_name = "mi_aplicacion/construccion.html"
 
     def get(self, request, *args, **kwargs):
         return render(request, self.template_name)
     
-class ActaReunionPDFView(View):
+class ActaReunionPDFView(GetCondicionalMixin, View):
+    def version_recurso(self):
+        # El acta muestra también el nombre del proyecto
+        fila = Reunion.objects.filter(pk=self.kwargs['pk']).values_list('updated_at', 'proyecto__updated_at').first()
+        if fila is None:
+            return None
+        return (max(f for f in fila if f),)
+
     def get(self, request, pk, *args, **kwargs):
+        # reportlab se carga bajo demanda, solo cuando se genera un PDF
+        from .reportes.pdf import acta_pdf_temporal
+
         try:
-            reunion = Reunion.objects.get(pk=pk)
+            reunion = Reunion.objects.select_related('proyecto', 'frente').get(pk=pk)
         except Reunion.DoesNotExist:
             raise Http404("La reunión no existe")
 
-        # Configuración del PDF
-        response = HttpResponse(content_type='application/pdf')
+        # El PDF se genera en un temporal y se envía por bloques
+        response = FileResponse(acta_pdf_temporal(reunion), content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="Informe_{reunion.id}.pdf"'
+        return response
 
-        doc = SimpleDocTemplate(response, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=5*cm, bottomMargin=3*cm)
-        styles = getSampleStyleSheet()
-        elementos = []
-
-        # Estilos personalizados
-        estilo_intervencion = ParagraphStyle(
-            name="Intervencion",
-            fontSize=10,
-            leading=14,
-            spaceAfter=6,
-            alignment=TA_JUSTIFY
-        )
+class ExportarActasProyectoZipView(LoginRequiredMixin, View):
+    """
+    Descarga en un ZIP las actas de las reuniones de un proyecto a las que
+    tiene acceso el usuario, con filtros opcionales por frente, estado y
+    rango de fechas.
+    """
+
+    def get(self, request, pk, *args, **kwargs):
+        # reportlab solo se carga en los procesos que renderizan
+        from .reportes.actas_zip import generar_zip_actas, reuniones_del_proyecto
+
+        try:
+            proyecto = Proyecto.objects.get(pk=pk)
+        except Proyecto.DoesNotExist:
+            raise Http404("El proyecto no existe")
 
-        estilo_comentario = ParagraphStyle(
-            name="Comentario",
-            fontSize=10,
-            leading=12,
-            leftIndent=1*cm,
-            spaceAfter=4,
-            alignment=TA_JUSTIFY,
-            fontName="Helvetica-Oblique"
+        reuniones = reuniones_del_proyecto(
+            proyecto,
+            request.GET,
+            desde=parse_date(request.GET.get("desde") or ""),
+            hasta=parse_date(request.GET.get("hasta") or ""),
+            usuario=request.user,
         )
 
-        # Función para header y footer
-        def header_footer(canvas, doc):
-            banner_path = finders.find('img/banner.png')
-            if banner_path:
-                canvas.drawImage(banner_path, x=0, y=A4[1]-4*cm, width=A4[0], height=3*cm)
-            footer_path = finders.find('img/footer.png')
-            if footer_path:
-                canvas.drawImage(footer_path, x=0, y=0, width=A4[0], height=2*cm)
-
-        # Encabezado del contenido
-        elementos.append(Spacer(1, 12))
-        elementos.append(Paragraph("<b>Informe de actividad</b>", styles["Title"]))
-        elementos.append(Spacer(1, 12))
-
-        # Datos generales
-        elementos.append(Paragraph(f"<b>Título:</b> {reunion.titulo}", styles["Normal"]))
-        elementos.append(Paragraph(f"<b>Fecha:</b> {reunion.fecha.strftime('%d/%m/%Y')}", styles["Normal"]))
-        elementos.append(Paragraph(f"<b>Proyecto:</b> {reunion.proyecto.nombre if reunion.proyecto else ''}", styles["Normal"]))
-        elementos.append(Paragraph(f"<b>Frente:</b> {reunion.frente.nombre if reunion.frente else ''}", styles["Normal"]))
-        elementos.append(Paragraph(f"<b>Estado:</b> {reunion.estado}", styles["Normal"]))
-        elementos.append(Paragraph(f"<b>Descripción:</b> {reunion.descripcion or ''}", styles["Normal"]))
-        elementos.append(Spacer(1, 12))
-
-        # Intervenciones y comentarios
-        elementos.append(Paragraph("<b>Intervenciones y Comentarios</b>", styles["Heading2"]))
-        elementos.append(Spacer(1, 6))
-
-        for intervencion in reunion.intervenciones.all():
-            # Intervención con autor en rojo
-            contenido_intervencion = f'<font color="red">{intervencion.autor.get_full_name()}</font>: {intervencion.contenido}'
-            elementos.append(Paragraph(contenido_intervencion, estilo_intervencion))
-
-            # Comentarios de la intervención con autor en rojo
-            for comentario in intervencion.comentarios.all():
-                contenido_comentario = f'<font color="green">{comentario.autor.get_full_name()}</font>: {comentario.contenido}'
-                elementos.append(Paragraph(contenido_comentario, estilo_comentario))
-
-            elementos.append(Spacer(1, 6))
-
-        # Generar PDF
-        doc.build(elementos, onFirstPage=header_footer, onLaterPages=header_footer)
+        contenido = generar_zip_actas(reuniones)
+        if isinstance(request, ASGIRequest):
+            # Se genera en un hilo aparte y se envía por bloques, sin bloquear el event loop
+            contenido = en_hilo(contenido)
+        response = StreamingHttpResponse(contenido, content_type="application/zip")
+        response["Content-Disposition"] = f'attachment; filename="Actas_Proyecto_{proyecto.nombre}.zip"'
         return response
 
-class DocumentosView(TemplateView):
+class DescargaProtegidaView(LoginRequiredMixin, View):
+    """
+    Descarga de un archivo subido: el acceso se comprueba con una consulta y
+    el envío lo hace el proxy (X-Accel-Redirect / X-Sendfile) o, sin proxy,
+    FileResponse con Range y validadores (ver descargas.py).
+    """
+
+    def documentos(self):
+        """Queryset de los documentos que puede descargar el usuario."""
+        raise NotImplementedError
+
+    def get(self, request, pk, *args, **kwargs):
+        documento = self.documentos().filter(pk=pk).first()
+        if documento is None or not documento.archivo:
+            raise Http404("El documento no existe")
+        return self.responder(request, documento)
+
+    def responder(self, request, documento):
+        return responder_archivo(
+            request, documento.archivo, nombre=documento.nombre_archivo or None, adjunto='descargar' in request.GET,
+        )
+
+
+class VistaPreviaMixin:
+    """Miniatura del documento (vistas_previas.py) en lugar del archivo."""
+
+    def responder(self, request, documento):
+        if not documento.vista_previa or not documento.checksum:
+            raise Http404("El documento no tiene vista previa")
+        return responder_cache(request, ruta_vista_previa(documento.checksum), f"{documento.checksum}.jpg")
+
+
+class DescargarDocumentoView(DescargaProtegidaView):
+    def documentos(self):
+        # Adjunto a alguna reunión a la que el usuario tiene acceso
+        reuniones = Reunion.objects.accesibles_para(self.request.user).filter(documentos=OuterRef('pk'))
+        return Documento.objects.filter(Exists(reuniones))
+
+
+class DescargarDocumentoIntervencionView(DescargaProtegidaView):
+    def documentos(self):
+        reuniones = Reunion.objects.accesibles_para(self.request.user).filter(pk=OuterRef('intervencion__reunion_id'))
+        return IntervencionDocumento.objects.filter(Exists(reuniones))
+
+
+class VistaPreviaDocumentoView(VistaPreviaMixin, DescargarDocumentoView):
+    pass
+
+
+class VistaPreviaDocumentoIntervencionView(VistaPreviaMixin, DescargarDocumentoIntervencionView):
+    pass
+
+
+class SubidaCrearView(LoginRequiredMixin, View):
+    """
+    Inicia una subida por partes para el documento de una intervención
+    nueva; la intervención se crea al completarse la subida (subidas.py).
+    """
+
+    def post(self, request):
+        reunion_id = request.POST.get('reunion', '')
+        nombre_archivo = os.path.basename(request.POST.get('nombre_archivo', '').replace('\\', '/')).strip()
+        try:
+            tamano = int(request.POST.get('tamano', ''))
+        except ValueError:
+            tamano = 0
+        if not reunion_id.isdigit() or not nombre_archivo or tamano < 1:
+            return JsonResponse({'error': 'Faltan reunion, nombre_archivo o tamano.'}, status=400)
+        if tamano > subidas.tamano_maximo():
+            return JsonResponse({'error': 'El archivo supera el tamaño máximo.'}, status=413)
+        form_intervencion = IntervencionForm(request.POST)
+        if not form_intervencion.is_valid():
+            return JsonResponse({'errores': form_intervencion.errors.get_json_data()}, status=400)
+        if not Reunion.objects.filter(pk=reunion_id).exists():
+            raise Http404("La reunión no existe")
+
+        subida = SubidaParcial.objects.create(
+            reunion_id=reunion_id,
+            usuario=request.user,
+            contenido=form_intervencion.cleaned_data['contenido'],
+            nombre_archivo=nombre_archivo[:255],
+            nombre=request.POST.get('nombre', '')[:255],
+            tamano=tamano,
+        )
+        return JsonResponse(self.estado(subida), status=201)
+
+    @staticmethod
+    def estado(subida):
+        return {
+            'id': str(subida.pk),
+            'url': reverse('mi_aplicacion:subida', args=[subida.pk]),
+            'recibido': subida.recibido,
+            'tamano': subida.tamano,
+            'bloque': subidas.tamano_bloque(),
+        }
+
+
+class SubidaView(LoginRequiredMixin, View):
+    """
+    Estado (GET/HEAD), siguiente bloque (PATCH con Upload-Offset) o
+    cancelación (DELETE) de una subida por partes.
+    """
+
+    def subida(self, pk):
+        subida = SubidaParcial.objects.filter(pk=pk, usuario=self.request.user).first()
+        if subida is None:
+            raise Http404("La subida no existe o ya terminó")
+        return subida
+
+    def responder_estado(self, subida, status=200):
+        respuesta = JsonResponse(SubidaCrearView.estado(subida), status=status)
+        respuesta['Upload-Offset'] = str(subida.recibido)
+        respuesta['Cache-Control'] = 'no-store'
+        return respuesta
+
+    def get(self, request, pk):
+        return self.responder_estado(self.subida(pk))
+
+    def patch(self, request, pk):
+        subida = self.subida(pk)
+        try:
+            desplazamiento = int(request.headers['Upload-Offset'])
+            longitud = int(request.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return JsonResponse({'error': 'Faltan Upload-Offset o Content-Length.'}, status=400)
+        if longitud > subidas.tamano_bloque():
+            return JsonResponse({'error': 'Bloque demasiado grande.', 'bloque': subidas.tamano_bloque()}, status=413)
+
+        try:
+            recibido = subidas.escribir_bloque(subida, desplazamiento, request, longitud)
+        except subidas.DesplazamientoIncorrecto as e:
+            subida.recibido = e.recibido
+            return self.responder_estado(subida, status=409)
+
+        if recibido < subida.tamano:
+            return self.responder_estado(subida)
+        documento = subidas.completar(subida)
+        if documento is None:
+            raise Http404("La subida ya terminó")
+        return JsonResponse({
+            'documento': documento.pk,
+            'url': reverse('mi_aplicacion:descargar_documento_intervencion', args=[documento.pk]),
+        }, status=201)
+
+    def delete(self, request, pk):
+        subida = self.subida(pk)
+        subida.delete()
+        try:
+            os.unlink(subidas.ruta_temporal(subida.pk))
+        except FileNotFoundError:
+            pass
+        return HttpResponse(status=204)
+
+
+class DocumentosView(LoginRequiredMixin, TemplateView):
+    """
+    Biblioteca de documentos de reuniones e intervenciones (biblioteca.py),
+    filtrable por proyecto, frente, tipo, origen y fechas y paginada por
+    cursor (?despues=...).
+    """
     template_name = 'mi_aplicacion/documentos.html'
+    tamano_pagina = 30
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Aquí puedes pasar listas de documentos, filtradas por tipo
-        context['actas'] = []         # Lista de actas
-        context['compromisos'] = []   # Lista de compromisos
-        context['acuerdos'] = []      # Lista de acuerdos
+        get = self.request.GET
+        categorias = dict(DocumentoBiblioteca.CATEGORIAS)
+        origenes = dict(DocumentoBiblioteca.ORIGENES)
+        seleccion = {
+            'proyecto': get.get('proyecto') if get.get('proyecto', '').isdigit() else '',
+            'frente': get.get('frente') if get.get('frente', '').isdigit() else '',
+            'tipo': get.get('tipo') if get.get('tipo') in categorias else '',
+            'origen': get.get('origen') if get.get('origen') in origenes else '',
+            'desde': get.get('desde', ''),
+            'hasta': get.get('hasta', ''),
+        }
+        entradas = biblioteca.consulta(
+            self.request.user,
+            proyecto=seleccion['proyecto'],
+            frente=seleccion['frente'],
+            categoria=seleccion['tipo'],
+            origen=seleccion['origen'],
+            desde=parse_date(seleccion['desde'] or ''),
+            hasta=parse_date(seleccion['hasta'] or ''),
+        )
+        context['entradas'], context['siguiente_cursor'] = pagina_por_cursor(
+            entradas, get.get('despues'), self.tamano_pagina, campo='fecha'
+        )
+
+        # Las opciones de los filtros salen de la caché de filtros.py
+        context['proyectos'] = filtros.proyectos()
+        context['frentes'] = filtros.frentes()
+        context['categorias'] = DocumentoBiblioteca.CATEGORIAS
+        context['origenes'] = DocumentoBiblioteca.ORIGENES
+        context['seleccion'] = seleccion
+        context['parametros'] = urlencode({k: v for k, v in seleccion.items() if v})
         return context
 
 class ActasPorProyectoView(ListView):
     model = Reunion
     template_name = "mi_aplicacion/actas.html"
     context_object_name = "reuniones"
+    # Tamaño de página; se pagina por cursor (?despues=...) y no por número de página
+    tamano_pagina = 25
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = Reunion.objects.select_related("proyecto", "frente")
+
         proyecto_id = self.request.GET.get("proyecto")
         if proyecto_id:
             queryset = queryset.filter(proyecto_id=proyecto_id)
-        return queryset
+
+        # Rango de fechas sobre el DateTimeField (sin __date, para usar el índice)
+        desde = parse_date(self.request.GET.get("desde") or "")
+        hasta = parse_date(self.request.GET.get("hasta") or "")
+        if desde:
+            queryset = queryset.filter(fecha__gte=timezone.make_aware(datetime.combine(desde, datetime.min.time())))
+        if hasta:
+            queryset = queryset.filter(fecha__lt=timezone.make_aware(datetime.combine(hasta + timedelta(days=1), datetime.min.time())))
+
+        # Paginación por cursor: más recientes primero
+        reuniones, self.siguiente_cursor = pagina_por_cursor(
+            queryset, self.request.GET.get("despues"), self.tamano_pagina, campo="fecha"
+        )
+        return reuniones
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["proyectos"] = Proyecto.objects.all()
+        context["proyectos"] = Proyecto.objects.only("id", "nombre")
         context["proyecto_seleccionado"] = self.request.GET.get("proyecto")
+        context["desde"] = self.request.GET.get("desde", "")
+        context["hasta"] = self.request.GET.get("hasta", "")
+        context["siguiente_cursor"] = self.siguiente_cursor
+
+        # Facetas (frentes usados en el proyecto) en una sola consulta por
+        # página, agrupadas por proyecto en vez de consultarlas fila a fila
+        proyecto_ids = {r.proyecto_id for r in context["reuniones"] if r.proyecto_id}
+        facetas = {}
+        filas = (
+            Reunion.objects
+            .filter(proyecto_id__in=proyecto_ids, frente__isnull=False)
+            .values_list("proyecto_id", "frente__nombre")
+            .distinct()
+            .order_by("proyecto_id", "frente__nombre")
+        )
+        for proyecto_id, nombre in filas:
+            facetas.setdefault(proyecto_id, []).append(nombre)
+        context["facetas_por_proyecto"] = facetas
         return context
     
 class HomeView(TemplateView):
     template_name = 'mi_aplicacion/home.html'
 
 
-class ExportarProyectoPDF(View):
+class ExportarProyectoPDF(GetCondicionalMixin, View):
+    def version_recurso(self):
+        return Proyecto.objects.filter(pk=self.kwargs['pk']).values_list('updated_at').first()
+
     def get(self, request, pk, *args, **kwargs):
+        # reportlab se carga bajo demanda, solo cuando se genera un PDF
+        from .reportes.pdf import proyecto_pdf_temporal
+
         try:
             proyecto = Proyecto.objects.get(pk=pk)
         except Proyecto.DoesNotExist:
             raise Http404("El proyecto no existe")
 
-        response = HttpResponse(content_type='application/pdf')
+        # Los flowables se generan por lotes y el PDF se escribe en un
+        # temporal que se envía por bloques, sin tenerlo entero en memoria
+        response = FileResponse(proyecto_pdf_temporal(proyecto), content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="Proyecto_{proyecto.nombre}.pdf"'
-
-        doc = SimpleDocTemplate(
-            response,
-            pagesize=A4,
-            rightMargin=2 * cm,
-            leftMargin=2 * cm,
-            topMargin=5 * cm,
-            bottomMargin=3 * cm
-        )
-        styles = getSampleStyleSheet()
-        elementos = []
-
-        # ===== Estilos =====
-        estilo_titulo = ParagraphStyle(
-            name="Titulo",
-            fontSize=16,
-            leading=18,
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            fontName="Helvetica-Bold"
-        )
-        estilo_subtitulo = ParagraphStyle(
-            name="Subtitulo",
-            fontSize=12,
-            leading=14,
-            spaceAfter=6,
-            alignment=TA_LEFT,
-            fontName="Helvetica-Bold"
-        )
-        estilo_texto = ParagraphStyle(
-            name="Texto",
-            fontSize=10,
-            leading=12,
-            spaceAfter=4,
-            alignment=TA_JUSTIFY
-        )
-        estilo_intervencion = ParagraphStyle(
-            name="Intervencion",
-            fontSize=10,
-            leading=14,
-            spaceAfter=6,
-            alignment=TA_JUSTIFY
-        )
-        estilo_comentario = ParagraphStyle(
-            name="Comentario",
-            fontSize=9,
-            leading=12,
-            leftIndent=1*cm,
-            spaceAfter=4,
-            alignment=TA_JUSTIFY,
-            fontName="Helvetica-Oblique"
-        )
-        estilo_actividad = ParagraphStyle(
-            name="Actividad",
-            fontSize=13,
-            leading=16,
-            spaceBefore=12,
-            spaceAfter=8,
-            alignment=TA_LEFT,
-            textColor=colors.HexColor("#1F4E79"),  # Azul oscuro
-            fontName="Helvetica-Bold"
-        )
-
-        estilo_tarea = ParagraphStyle(
-            name="Tarea",
-            fontSize=11,
-            leading=14,
-            leftIndent=1 * cm,   # Indentado respecto a actividad
-            spaceBefore=6,
-            spaceAfter=4,
-            textColor=colors.HexColor("#2E75B6"),  # Azul más claro
-            fontName="Helvetica-Bold"
-        )
-
-        estilo_comentario = ParagraphStyle(
-            name="Comentario",
-            fontSize=9,
-            leading=12,
-            leftIndent=2 * cm,   # Más indentado respecto a intervención
-            spaceAfter=4,
-            textColor=colors.HexColor("#228B22"),  # Verde
-            fontName="Helvetica-Oblique"
-        )
-        
-
-        # ===== Header / Footer =====
-        def header_footer(canvas, doc):
-            banner_path = finders.find('img/banner.png')
-            if banner_path:
-                canvas.drawImage(banner_path, x=0, y=A4[1] - 4 * cm, width=A4[0], height=3 * cm)
-            footer_path = finders.find('img/footer.png')
-            if footer_path:
-                canvas.drawImage(footer_path, x=0, y=0, width=A4[0], height=2 * cm)
-
-        # ===== Datos del proyecto =====
-        elementos.append(Paragraph(f"Proyecto: {proyecto.nombre}", estilo_titulo))
-        elementos.append(Spacer(1, 12))
-
-        elementos.append(Paragraph("<b>Datos generales del proyecto</b>", estilo_subtitulo))
-        elementos.append(Paragraph(f"<b>Nombre:</b> {proyecto.nombre}", estilo_texto))
-        elementos.append(Paragraph(f"<b>Descripción:</b> {proyecto.descripcion or '---'}", estilo_texto))
-        elementos.append(Paragraph(f"<b>Fecha de inicio:</b> {proyecto.fecha_inicio.strftime('%d/%m/%Y') if proyecto.fecha_inicio else '---'}", estilo_texto))
-        elementos.append(Paragraph(f"<b>Fecha de fin:</b> {proyecto.fecha_fin.strftime('%d/%m/%Y') if proyecto.fecha_fin else '---'}", estilo_texto))
-        elementos.append(Paragraph(f"<b>Avance calculado:</b> {proyecto.avance_calculado} %", estilo_texto))
-        elementos.append(Paragraph(f"<b>Total de intervenciones:</b> {proyecto.intervencion_total}", estilo_texto))
-        elementos.append(Paragraph(f"<b>Intervenciones RMBC:</b> {proyecto.intervencion_rmbc}", estilo_texto))
-        elementos.append(Paragraph(f"<b>Ejecución del proyecto:</b> {proyecto.ejecucion_proyecto} %", estilo_texto))
-        elementos.append(Paragraph(f"<b>Ejecución financiera:</b> {proyecto.ejecucion_financiera} millones", estilo_texto))
-        elementos.append(Spacer(1, 12))
-
-       # ===== Reuniones agrupadas por frente Actividad =====
-        reuniones = proyecto.reuniones.select_related("frente", "parent").all()
-        actividades = [r for r in reuniones if r.frente and r.frente.tipo == "actividad"]
-
-        if actividades:
-            elementos.append(Paragraph("<b>Reuniones por Actividad</b>", estilo_subtitulo))
-            elementos.append(HRFlowable(width="100%", thickness=1, color=colors.grey))
-            elementos.append(Spacer(1, 6))
-
-            for actividad in actividades:
-                fecha_str = actividad.fecha.strftime('%d/%m/%Y') if actividad.fecha else "Sin fecha"
-                elementos.append(Paragraph(f"Actividad: {actividad.titulo} ({fecha_str})", estilo_actividad))
-                elementos.append(Paragraph(f"<b>Frente:</b> {actividad.frente.nombre}", estilo_texto))
-                elementos.append(Paragraph(f"<b>Estado:</b> {actividad.estado}", estilo_texto))
-                elementos.append(Paragraph(f"<b>Descripción:</b> {actividad.descripcion or ''}", estilo_texto))
-                elementos.append(Spacer(1, 6))
-
-                # Intervenciones de la actividad
-                if actividad.intervenciones.exists():
-                    elementos.append(Paragraph("<b>Intervenciones</b>", estilo_texto))
-                    for intervencion in actividad.intervenciones.all():
-                        contenido_intervencion = f'<font color="red">{intervencion.autor.get_full_name()}</font>: {intervencion.contenido}'
-                        elementos.append(Paragraph(contenido_intervencion, estilo_intervencion))
-
-                        for comentario in intervencion.comentarios.all():
-                            contenido_comentario = f'{comentario.autor.get_full_name()}: {comentario.contenido}'
-                            elementos.append(Paragraph(contenido_comentario, estilo_comentario))
-
-                # 🔹 Reuniones hijas (tareas) asociadas
-                tareas = [r for r in reuniones if r.frente and r.frente.tipo == "tarea" and r.parent_id == actividad.id]
-
-                if tareas:
-                    elementos.append(Spacer(1, 4))
-                    elementos.append(Paragraph("<b>Tareas asociadas</b>", estilo_tarea))
-
-                    for tarea in tareas:
-                        fecha_tarea = tarea.fecha.strftime('%d/%m/%Y') if tarea.fecha else "Sin fecha"
-
-                        # 🔹 Tabla principal de la tarea
-                        titulo_tarea = Paragraph(f"— {tarea.titulo} ({fecha_tarea})", estilo_tarea)
-                        contenido_tarea = [
-                            [titulo_tarea],
-                            [Paragraph(f"<b>Estado:</b> {tarea.estado}", estilo_texto)],
-                            [Paragraph(f"<b>Descripción:</b> {tarea.descripcion or ''}", estilo_texto)]
-                        ]
-
-                        tabla_tarea = Table(contenido_tarea, colWidths=[16*cm])
-                        tabla_tarea.setStyle(TableStyle([
-                            ("BOX", (0,0), (-1,-1), 0.8, colors.grey),
-                            ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#E9F2FB")),  # Encabezado azul claro
-                            ("LEFTPADDING", (0,0), (-1,-1), 6),
-                            ("RIGHTPADDING", (0,0), (-1,-1), 6),
-                            ("TOPPADDING", (0,0), (-1,-1), 4),
-                            ("BOTTOMPADDING", (0,0), (-1,-1), 4),
-                        ]))
-
-                        elementos.append(tabla_tarea)
-                        elementos.append(Spacer(1, 6))
-
-                        # 🔹 Intervenciones dentro de la tarea como tablas
-                        if tarea.intervenciones.exists():
-                            elementos.append(Paragraph("<b>Intervenciones</b>", estilo_texto))
-
-                            for intervencion in tarea.intervenciones.all():
-                                contenido_intervencion = [
-                                    [Paragraph(f'<font color="red">{intervencion.autor.get_full_name()}</font>', estilo_intervencion)],
-                                    [Paragraph(intervencion.contenido, estilo_texto)]
-                                ]
-
-                                tabla_intervencion = Table(contenido_intervencion, colWidths=[15*cm])
-                                tabla_intervencion.setStyle(TableStyle([
-                                    ("BOX", (0,0), (-1,-1), 0.5, colors.lightgrey),
-                                    ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#FFF2CC")),  # Fondo amarillo claro en autor
-                                    ("LEFTPADDING", (0,0), (-1,-1), 5),
-                                    ("RIGHTPADDING", (0,0), (-1,-1), 5),
-                                    ("TOPPADDING", (0,0), (-1,-1), 3),
-                                    ("BOTTOMPADDING", (0,0), (-1,-1), 3),
-                                ]))
-
-                                elementos.append(tabla_intervencion)
-                                elementos.append(Spacer(1, 4))
-
-                                # 🔹 Comentarios como tablas anidadas
-                                for comentario in intervencion.comentarios.all():
-                                    contenido_comentario = [
-                                        [Paragraph(f'<font color="green">{comentario.autor.get_full_name()}</font>', estilo_comentario)],
-                                        [Paragraph(comentario.contenido, estilo_texto)]
-                                    ]
-
-                                    tabla_comentario = Table(contenido_comentario, colWidths=[14*cm])
-                                    tabla_comentario.setStyle(TableStyle([
-                                        ("BOX", (0,0), (-1,-1), 0.5, colors.lightgrey),
-                                        ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#EBF7E3")),  # Verde muy suave
-                                        ("LEFTPADDING", (0,0), (-1,-1), 5),
-                                        ("RIGHTPADDING", (0,0), (-1,-1), 5),
-                                        ("TOPPADDING", (0,0), (-1,-1), 3),
-                                        ("BOTTOMPADDING", (0,0), (-1,-1), 3),
-                                    ]))
-
-                                    elementos.append(tabla_comentario)
-                                    elementos.append(Spacer(1, 3))
-
-                        # Separador después de cada tarea
-                        elementos.append(Spacer(1, 8))
-                        elementos.append(HRFlowable(width="90%", thickness=0.7, color=colors.grey))
-                        elementos.append(Spacer(1, 8))
-        else:
-            elementos.append(Paragraph("Este proyecto no tiene reuniones de tipo Actividad.", estilo_texto))
-
-        # ===== Construcción =====
-        doc.build(elementos, onFirstPage=header_footer, onLaterPages=header_footer)
-
         return response
 
     
 class GraficoReunionesView(TemplateView):
     template_name = "mi_aplicacion/grafico_reuniones.html"
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-
-        # Capturar filtros
-        estado = self.request.GET.get("estado")
-        proyecto = self.request.GET.get("proyecto")
-        frente = self.request.GET.get("frente")
-
+    async def get(self, request, *args, **kwargs):
         # Query base (aplicar filtros si vienen)
-        reuniones = Reunion.objects.all()
-
-        if estado:
-            reuniones = reuniones.filter(estado=estado)
-        if proyecto:
-            reuniones = reuniones.filter(proyecto_id=proyecto)
-        if frente:
-            reuniones = reuniones.filter(frente_id=frente)
-
-        # Datos por estado (para los gráficos que ya tenías)
-        datos_estado = reuniones.values("estado").annotate(cantidad=Count("id")).order_by("estado")
-        estados = [d["estado"] for d in datos_estado]
-        cantidades = [d["cantidad"] for d in datos_estado]
-
-        # --- Nuevo: calcular vencidas / activas / sin fecha (para el proyecto o filtros aplicados) ---
-        today = timezone.localdate()
-        vencidas = 0
-        activas = 0
-        sin_fecha = 0
-
-        # Recorremos reuniones filtradas y clasificamos según fecha_finalizacion
-        for r in reuniones:
-            if r.fecha_finalizacion:
-                # `fecha_finalizacion` es DateTimeField; comparamos por fecha (date)
-                try:
-                    final_date = r.fecha_finalizacion.date()
-                except Exception:
-                    # por si fuera ya date
-                    final_date = r.fecha_finalizacion
-                if final_date < today:
-                    vencidas += 1
-                else:
-                    activas += 1
-            else:
-                sin_fecha += 1
-
-        vencido_labels = ["Activas", "Vencidas", "Sin fecha"]
-        vencido_counts = [activas, vencidas, sin_fecha]
-
-        # Pasar datos al template
-        context["estados"] = estados
-        context["cantidades"] = cantidades
-
-        context["vencido_labels"] = vencido_labels
-        context["vencido_counts"] = vencido_counts
-
-        # Para los selects del formulario
-        context["proyectos"] = Proyecto.objects.order_by("nombre")
-        context["frentes"] = Frente.objects.order_by("nombre")
-        context["estado_seleccionado"] = estado or ""
-        context["proyecto_seleccionado"] = proyecto or ""
-        context["frente_seleccionado"] = frente or ""
+        reuniones = Reunion.objects.filtrar(request.GET)
+
+        # Datos por estado
+        datos_estado = [
+            d async for d in reuniones.values("estado").annotate(cantidad=Count("id")).order_by("estado")
+        ]
+
+        # Vencidas / activas / sin fecha, contadas en la base de datos
+        inicio_hoy = timezone.make_aware(datetime.combine(timezone.localdate(), datetime.min.time()))
+        vencimiento = await reuniones.aaggregate(
+            activas=Count("id", filter=Q(fecha_finalizacion__gte=inicio_hoy)),
+            vencidas=Count("id", filter=Q(fecha_finalizacion__lt=inicio_hoy)),
+            sin_fecha=Count("id", filter=Q(fecha_finalizacion__isnull=True)),
+        )
 
-        return context
+        context = self.get_context_data(**kwargs)
+        context["estados"] = [d["estado"] for d in datos_estado]
+        context["cantidades"] = [d["cantidad"] for d in datos_estado]
+        context["vencido_labels"] = ["Activas", "Vencidas", "Sin fecha"]
+        context["vencido_counts"] = [vencimiento["activas"], vencimiento["vencidas"], vencimiento["sin_fecha"]]
+
+        # Para los selects del formulario (caché; la primera vez consultan la BD)
+        context["proyectos"] = await sync_to_async(filtros.proyectos)()
+        context["frentes"] = await sync_to_async(filtros.frentes)()
+        context["estado_seleccionado"] = request.GET.get("estado", "")
+        context["proyecto_seleccionado"] = request.GET.get("proyecto", "")
+        context["frente_seleccionado"] = request.GET.get("frente", "")
+
+        response = self.render_to_response(context)
+        await sync_to_async(response.render)()
+        return response
 
 # LoginRequiredMixin
 class ProyectoListView(ListView):
     model = Proyecto
     template_name = "mi_aplicacion/proyecto_list.html"
     context_object_name = "proyectos"
+    paginate_by = 12
+
+    # ?orden= admitidos (etiqueta para el select, orden del ORM)
+    ORDENES = {
+        "nombre": ("Nombre", ("nombre", "pk")),
+        "avance": ("Mayor avance programado", ("-avance_plan", "nombre", "pk")),
+        "avance_real": ("Mayor avance real", ("-avance_real", "nombre", "pk")),
+        "atraso": ("Más atrasados", ("atraso", "nombre", "pk")),
+        "fin": ("Fecha de fin", (F("fecha_fin").asc(nulls_last=True), "nombre", "pk")),
+    }
 
     def get_queryset(self):
-        qs = Proyecto.objects.all().order_by("nombre")
+        # Avance programado y real calculados en la base de datos
+        qs = Proyecto.objects.con_avance(real=True).annotate(atraso=F("avance_real") - F("avance_plan"))
         query = self.request.GET.get("q")
         if query:
             qs = qs.filter(
                 Q(nombre__icontains=query) | Q(descripcion__icontains=query)
             )
-        return qs
+        if self.request.GET.get("atrasados"):
+            qs = qs.atrasados()
+
+        orden = self.request.GET.get("orden")
+        _, campos = self.ORDENES.get(orden, self.ORDENES["nombre"])
+        return qs.order_by(*campos)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["q"] = self.request.GET.get("q", "") 
+        context["orden_actual"] = self.request.GET.get("orden", "nombre")
+        context["ordenes"] = [(clave, etiqueta) for clave, (etiqueta, _) in self.ORDENES.items()]
+        context["atrasados"] = bool(self.request.GET.get("atrasados"))
+        # Filtros actuales para los enlaces de paginación
+        params = self.request.GET.copy()
+        params.pop("page", None)
+        context["filtros_query"] = params.urlencode()
         return context 
     
-class ProyectoDetailView(LoginRequiredMixin,DetailView):
+class ProyectoDetailView(LoginRequiredMixin, DetailView):
     model = Proyecto
     template_name = 'mi_aplicacion/proyecto_detail.html'
     context_object_name = 'proyecto'
@@ -787,6 +922,8 @@ class ProyectoDetailView(LoginRequiredMixin,DetailView):
         context = super().get_context_data(**kwargs)
         # Ordenar las reuniones asociadas por fecha de inicio
         context["reuniones"] = self.object.reuniones.all().order_by("fecha")
+        # Tareas por estado, vencidas y % cerradas en una sola consulta
+        context["avance_tareas"] = self.object.avance_tareas()
         return context
     
 # Crear proyecto
@@ -0,0 +1,190 @@
+# mi_aplicacion/vistas_previas.py
+# Metadatos y vistas previas de los documentos subidos (Documento,
+# IntervencionDocumento). Al subir un archivo se guardan tamaño, tipo MIME y
+# checksum (señales); las páginas de los PDF y las miniaturas las calcula
+# después el worker `generar_vistas_previas`, para que la subida no espere.
+# Así los listados no abren ningún archivo: todo sale de las columnas.
+#
+# Las miniaturas (JPEG) se guardan en VISTAS_PREVIAS_CACHE_DIR con el
+# checksum del archivo como nombre: los documentos con el mismo contenido
+# comparten miniatura. Imágenes con Pillow; PDF (primera página) con
+# pdftoppm de poppler-utils.
+import hashlib
+import mimetypes
+import os
+import re
+import shutil
+import subprocess
+
+from django.conf import settings
+
+from .almacenamiento import es_blob
+
+LADO_MINIATURA = 320
+TAMANO_BLOQUE = 1024 * 1024
+
+# Tipos para los que se genera miniatura (y páginas, en el caso del PDF)
+TIPOS_CON_VISTA_PREVIA = ("application/pdf", "image/png", "image/jpeg", "image/gif", "image/webp", "image/bmp")
+
+# Firmas de los formatos más habituales: el tipo no depende solo de la extensión
+_FIRMAS = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+)
+
+_PAGINA_PDF = re.compile(rb"/Type\s*/Page(?![s\w])")
+_PAGINAS_PDFINFO = re.compile(r"^Pages:\s+(\d+)", re.MULTILINE)
+
+
+def directorio_cache():
+    return getattr(settings, "VISTAS_PREVIAS_CACHE_DIR", os.path.join(settings.BASE_DIR, "cache", "vistas_previas"))
+
+
+def ruta_vista_previa(checksum):
+    return os.path.join(directorio_cache(), checksum[:2], f"{checksum}.jpg")
+
+
+def tipo_mime(cabecera, nombre):
+    """Tipo MIME a partir de los primeros bytes del archivo y, si no, del nombre."""
+    for firma, tipo in _FIRMAS:
+        if cabecera.startswith(firma):
+            return tipo
+    if cabecera[:4] == b"RIFF" and cabecera[8:12] == b"WEBP":
+        return "image/webp"
+    return mimetypes.guess_type(nombre)[0] or "application/octet-stream"
+
+
+def checksum_de(nombre):
+    """SHA-256 del contenido, que en el almacenamiento deduplicado es el nombre del blob."""
+    if es_blob(nombre):
+        return os.path.splitext(os.path.basename(nombre))[0]
+    return ""
+
+
+def metadatos_subida(archivo, nombre_original):
+    """
+    Columnas que se rellenan al guardar un archivo nuevo. Solo lee el tamaño
+    y la cabecera: el checksum ya lo calculó el almacenamiento al escribirlo.
+    """
+    with archivo.storage.open(archivo.name, "rb") as f:
+        cabecera = f.read(16)
+    tipo = tipo_mime(cabecera, nombre_original or archivo.name)
+    return {
+        "tamano": archivo.storage.size(archivo.name),
+        "tipo_mime": tipo,
+        "checksum": checksum_de(archivo.name),
+        "paginas": None,
+        "vista_previa": False,
+        "metadatos_pendientes": tipo in TIPOS_CON_VISTA_PREVIA,
+    }
+
+
+def metadatos_completos(ruta, nombre_original, checksum=""):
+    """
+    Lo que calcula el worker: páginas y miniatura y, para los archivos
+    subidos antes del almacenamiento deduplicado, también tamaño, tipo y
+    checksum (hay que leerlos enteros).
+    """
+    with open(ruta, "rb") as f:
+        cabecera = f.read(16)
+    tipo = tipo_mime(cabecera, nombre_original or ruta)
+    if not checksum:
+        resumen = hashlib.sha256()
+        with open(ruta, "rb") as f:
+            for bloque in iter(lambda: f.read(TAMANO_BLOQUE), b""):
+                resumen.update(bloque)
+        checksum = resumen.hexdigest()
+
+    datos = {
+        "tamano": os.path.getsize(ruta),
+        "tipo_mime": tipo,
+        "checksum": checksum,
+        "paginas": contar_paginas(ruta) if tipo == "application/pdf" else None,
+        "vista_previa": False,
+        "metadatos_pendientes": False,
+    }
+    if tipo in TIPOS_CON_VISTA_PREVIA:
+        datos["vista_previa"] = generar_miniatura(ruta, tipo, ruta_vista_previa(checksum))
+    return datos
+
+
+def contar_paginas(ruta):
+    if shutil.which("pdfinfo"):
+        try:
+            salida = subprocess.run(
+                ["pdfinfo", ruta], capture_output=True, text=True, timeout=60, check=True,
+            ).stdout
+            coincidencia = _PAGINAS_PDFINFO.search(salida)
+            if coincidencia:
+                return int(coincidencia.group(1))
+        except (subprocess.SubprocessError, OSError):
+            pass
+    # Sin poppler: se cuentan los objetos /Type /Page (no vale para los PDF
+    # con flujos de objetos comprimidos, que devuelven None)
+    paginas = 0
+    resto = b""
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE), b""):
+            datos = resto + bloque
+            paginas += len(_PAGINA_PDF.findall(datos))
+            # Solape con el bloque siguiente; sin cortar una coincidencia ya contada
+            resto = datos[-32:]
+            paginas -= len(_PAGINA_PDF.findall(resto))
+    return paginas or None
+
+
+def generar_miniatura(origen, tipo, destino):
+    """Escribe la miniatura JPEG en `destino` (si no existe ya). True si la hay."""
+    if os.path.exists(destino):
+        return True
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporal = f"{destino}.{os.getpid()}.tmp"
+    try:
+        if tipo == "application/pdf":
+            correcto = _miniatura_pdf(origen, temporal)
+        else:
+            correcto = _miniatura_imagen(origen, temporal)
+        if correcto:
+            os.replace(temporal, destino)
+        return correcto
+    finally:
+        if os.path.exists(temporal):
+            os.unlink(temporal)
+
+
+def _miniatura_imagen(origen, destino):
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(origen) as imagen:
+            imagen.thumbnail((LADO_MINIATURA, LADO_MINIATURA))
+            if imagen.mode != "RGB":
+                fondo = Image.new("RGB", imagen.size, "white")
+                fondo.paste(imagen.convert("RGBA"), mask=imagen.convert("RGBA"))
+                imagen = fondo
+            imagen.save(destino, "JPEG", quality=80, optimize=True)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        return False
+    return True
+
+
+def _miniatura_pdf(origen, destino):
+    if not shutil.which("pdftoppm"):
+        return False
+    base = f"{destino}.pagina"
+    try:
+        subprocess.run(
+            ["pdftoppm", "-f", "1", "-l", "1", "-singlefile", "-jpeg", "-scale-to", str(LADO_MINIATURA), origen, base],
+            capture_output=True, timeout=120, check=True,
+        )
+        os.replace(f"{base}.jpg", destino)
+    except (subprocess.SubprocessError, OSError):
+        return False
+    finally:
+        if os.path.exists(f"{base}.jpg"):
+            os.unlink(f"{base}.jpg")
+    return True
@@ -0,0 +1,71 @@
+# mi_aplicacion/widgets.py
+# Widgets de formulario que no vuelcan tablas enteras en el HTML: solo se
+# renderizan los valores seleccionados y el resto se busca con
+# static/js/autocompletar.js contra un endpoint JSON.
+from django import forms
+from django.urls import reverse
+
+
+class Autocompletar(forms.Widget):
+    """
+    Sustituye a Select/SelectMultiple en campos ModelChoiceField y
+    ModelMultipleChoiceField.
+
+    `url` es el nombre de la URL del endpoint ({"resultados": [{id, texto}],
+    "mas": bool}); `depende` es el nombre de otro campo del formulario cuyo
+    valor se envía como parámetro (p. ej. el proyecto al buscar actividades).
+    """
+
+    template_name = "mi_aplicacion/widgets/autocompletar.html"
+
+    def __init__(self, url, multiple=False, depende=None, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+        self.multiple = multiple
+        self.depende = depende
+
+    @property
+    def allow_multiple_selected(self):
+        return self.multiple
+
+    def _seleccion(self, valores):
+        """[{'id', 'texto'}] solo de los valores elegidos (una consulta)."""
+        valores = [v for v in valores if v not in (None, "")]
+        if not valores:
+            return []
+        campo = getattr(self.choices, "field", None)
+        if campo is None:
+            return [{"id": v, "texto": v} for v in valores]
+        try:
+            objetos = campo.queryset.filter(pk__in=valores)
+            return [{"id": obj.pk, "texto": campo.label_from_instance(obj)} for obj in objetos]
+        except (ValueError, TypeError):
+            return []
+
+    def format_value(self, value):
+        if value is None:
+            return []
+        if not isinstance(value, (list, tuple)):
+            value = [value]
+        return [str(v) for v in value]
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        widget = context["widget"]
+        widget["url"] = reverse(self.url)
+        widget["multiple"] = self.multiple
+        widget["depende"] = self.depende or ""
+        widget["seleccion"] = self._seleccion(widget["value"])
+        return context
+
+    def value_from_datadict(self, data, files, name):
+        if self.multiple:
+            return data.getlist(name) if hasattr(data, "getlist") else data.get(name)
+        return data.get(name)
+
+    def value_omitted_from_data(self, data, files, name):
+        # Un multiple vacío no envía nada, igual que SelectMultiple
+        return False if self.multiple else name not in data
+
+    def id_for_label(self, id_):
+        return f"{id_}_buscar" if id_ else id_
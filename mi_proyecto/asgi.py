@@ -5,6 +5,11 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Los eventos en vivo de las reuniones (ReunionEventosView) solo funcionan
+servidos desde aquí, p. ej.:
+
+    uvicorn mi_proyecto.asgi:application --host 0.0.0.0 --port 8083
 """
 
 import os
@@ -129,9 +129,41 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Sin ruta pública: ver DescargaProtegidaView y DESCARGAS_SERVIDOR
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Descargas de documentos (ver mi_aplicacion/descargas.py): con
+# 'nginx' o 'sendfile' el proxy envía el archivo tras comprobar el acceso
+# en Django; vacío, lo envía Django (desarrollo).
+DESCARGAS_SERVIDOR = os.environ.get('DESCARGAS_SERVIDOR', '')
+DESCARGAS_PREFIJO_INTERNO = os.environ.get('DESCARGAS_PREFIJO_INTERNO', '/protegido/')
+
+# Caché de actas PDF (direccionada por contenido) y procesos del pool que
+# comparten todas las descargas del ZIP de actas en cada proceso web
+ACTAS_PDF_CACHE_DIR = os.environ.get('ACTAS_PDF_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'actas'))
+ACTAS_ZIP_PROCESOS = int(os.environ.get('ACTAS_ZIP_PROCESOS', 2))
+
+# Miniaturas de los documentos subidos, por checksum (manage.py generar_vistas_previas)
+VISTAS_PREVIAS_CACHE_DIR = os.environ.get('VISTAS_PREVIAS_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'vistas_previas'))
+
+# Subidas por partes (mi_aplicacion/subidas.py): temporales, tamaño máximo
+# del archivo y de cada bloque (lo que lee una petición), en bytes
+SUBIDAS_TEMP_DIR = os.environ.get('SUBIDAS_TEMP_DIR', os.path.join(BASE_DIR, 'cache', 'subidas'))
+SUBIDAS_TAMANO_MAXIMO = int(os.environ.get('SUBIDAS_TAMANO_MAXIMO', 4 * 1024 ** 3))
+SUBIDAS_TAMANO_BLOQUE = int(os.environ.get('SUBIDAS_TAMANO_BLOQUE', 8 * 1024 ** 2))
+
+# Segundos que se guardan en caché las opciones de los filtros (proyectos,
+# frentes, responsables); además se invalidan con señales al cambiar
+FILTROS_CACHE_TIMEOUT = int(os.environ.get('FILTROS_CACHE_TIMEOUT', 300))
+
+# Reuniones en vivo (server-sent events, requieren servir con ASGI).
+# BackendLocal sirve con un único proceso; con varios workers usar
+# 'mi_aplicacion.tiempo_real.BackendPostgres' (LISTEN/NOTIFY).
+# TIEMPO_REAL_COLA: eventos pendientes por conexión antes de descartarla.
+TIEMPO_REAL_BACKEND = os.environ.get('TIEMPO_REAL_BACKEND', 'mi_aplicacion.tiempo_real.BackendLocal')
+TIEMPO_REAL_COLA = int(os.environ.get('TIEMPO_REAL_COLA', 50))
+
 CSRF_TRUSTED_ORIGINS = [
     'https://seguimiento.rmbc.gov.co',
     'http://127.0.0.1:8083',
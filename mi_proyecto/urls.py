@@ -17,8 +17,6 @@ Including another URLconf
 # mi_proyecto_django/urls.py
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -27,7 +25,7 @@ urlpatterns = [
     path('oidc/', include('mozilla_django_oidc.urls')),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# MEDIA_ROOT no se publica (tampoco con DEBUG): los documentos solo se
+# descargan con las vistas que comprueban el acceso (DescargaProtegidaView)
 
 